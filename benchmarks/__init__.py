@@ -0,0 +1,5 @@
+"""Offline benchmark suite for coinaddress.
+
+Run from the repository root with ``python -m benchmarks``, see
+``python -m benchmarks --help`` for filtering, JSON output and baselines.
+"""
@@ -0,0 +1,52 @@
+"""Measure memory allocated per derived address.
+
+Run from the repository root with ``python -m benchmarks.bench_allocations``.
+"""
+import tracemalloc
+
+from coinaddress.networks import registry
+
+XPUB = (
+    'xpub6DS28deyJ4Ytx1MNsLY9ehvNo7XPRA8keE11XQJ7dJqNfE8zLcbyMq1CVL4iq2aDP'
+    'MPzZqr35JkQYKHHUvzKSPSBsqrBAXP28DwyePz7dh8'
+)
+NETWORKS = ('bitcoin', 'bitcoin_cash', 'ethereum', 'litecoin', 'ripple')
+
+
+def peak_per_address(network):
+    """Peak traced memory while deriving and encoding a single address."""
+    net = registry.get(network)
+    net.get_address(XPUB, '0/0')  # warm caches and tables
+    tracemalloc.start()
+    try:
+        net.get_address(XPUB, '0/1')
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def retained_per_node(count=1000):
+    """Memory kept alive by derived nodes, per node."""
+    node = registry.get('bitcoin').get_node(XPUB, '0')
+    tracemalloc.start()
+    try:
+        children = [node.get_child(i) for i in range(count)]
+        for child in children:
+            child.hex()
+        current, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return current // count
+
+
+def main():
+    for network in NETWORKS:
+        print('%-13s %6d bytes peak per address' % (
+            network, peak_per_address(network)
+        ))
+    print('%-13s %6d bytes retained per node' % ('node', retained_per_node()))
+
+
+if __name__ == '__main__':
+    main()
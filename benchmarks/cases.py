@@ -0,0 +1,213 @@
+"""Benchmark cases for every stage of the address pipeline and network."""
+import hashlib
+
+from coinaddress import backends, secp256k1
+from coinaddress.cache import node_cache
+from coinaddress.networks import registry
+
+from .runner import case
+
+XPUB = (
+    'xpub6DS28deyJ4Ytx1MNsLY9ehvNo7XPRA8keE11XQJ7dJqNfE8zLcbyMq1CVL4iq2aDP'
+    'MPzZqr35JkQYKHHUvzKSPSBsqrBAXP28DwyePz7dh8'
+)
+NETWORKS = ('bitcoin', 'bitcoin_cash', 'ethereum', 'litecoin', 'ripple')
+BULK_SIZE = 1000
+
+PUBKEY = bytes.fromhex(
+    '0279be667ef9dcbbac55a06295ce870b07029bfcdb2dce28d959f2815b16f81798'
+)
+PUBKEY_UNCOMPRESSED = bytes.fromhex(
+    '0479be667ef9dcbbac55a06295ce870b07029bfcdb2dce28d959f2815b16f81798'
+    '483ada7726a3c4655da4fbfc0e1108a8fd17b448a68554199c47d08ffb10d4b8'
+)
+HASH160 = hashlib.new('ripemd160', hashlib.sha256(PUBKEY).digest()).digest()
+
+
+@case('import.cli', 'interpreter startup and import of coinaddress.cli')
+def import_cli():
+    import subprocess
+    import sys
+    command = [sys.executable, '-c', 'import coinaddress.cli']
+    return lambda i: subprocess.check_call(command)
+
+
+@case('decode.xpub', 'base58check decode and point decompression of xpub')
+def decode_xpub():
+    net = registry.get('bitcoin')
+    return lambda i: net.deserialize_xpub(XPUB)
+
+
+@case('derive.generator.table', 'k * G with the fixed-base window table')
+def derive_generator_table():
+    secp256k1.generator_table()
+    return lambda i: secp256k1.to_affine(
+        secp256k1.multiply_generator(0x1234567890abcdef ** 4 + i)
+    )
+
+
+@case('derive.generator.ecdsa', 'k * G with generic ecdsa multiplication')
+def derive_generator_ecdsa():
+    from ecdsa.curves import SECP256k1
+    from ecdsa.ecdsa import Public_key as ECDSAPublicKey
+    g = SECP256k1.generator
+
+    def func(i):
+        point = ECDSAPublicKey(g, g * (0x1234567890abcdef ** 4 + i)).point
+        return point.x(), point.y()
+    return func
+
+
+def get_child_case(name):
+    def setup():
+        backend = backends.load_backend(name)
+        root = registry.get('bitcoin').deserialize_xpub(XPUB)
+        node = root.__class__(
+            chain_code=root.chain_code, backend=backend,
+            point=backend.from_coordinates(*root.affine),
+        )
+        return lambda i: node.get_child(i).compressed
+    return setup
+
+
+for _name in backends.BACKENDS:
+    case(
+        'derive.get_child.%s' % _name,
+        'child derivation and serialization with %s backend' % _name,
+    )(get_child_case(_name))
+
+
+@case('hash.hash160', 'ripemd160(sha256(compressed public key))')
+def hash_hash160():
+    def func(i):
+        return hashlib.new(
+            'ripemd160', hashlib.sha256(PUBKEY).digest()
+        ).digest()
+    return func
+
+
+@case('hash.keccak256', 'keccak256 of uncompressed public key')
+def hash_keccak256():
+    from sha3 import keccak_256
+    return lambda i: keccak_256(PUBKEY_UNCOMPRESSED[1:]).digest()
+
+
+@case('encode.base58check', 'base58check of version byte and hash160')
+def encode_base58check():
+    from coinaddress import base58
+    return lambda i: base58.bitcoin.encode_check(b'\x00' + HASH160)
+
+
+@case('encode.base58check.reference', 'base58check with base58 package')
+def encode_base58check_reference():
+    import base58
+    return lambda i: base58.b58encode_check(b'\x00' + HASH160)
+
+
+@case('decode.base58check', 'base58check decode of xpub')
+def decode_base58check():
+    from coinaddress import base58
+    return lambda i: base58.bitcoin.decode_check(XPUB)
+
+
+@case('encode.cashaddr', 'CashAddr encoding of hash160')
+def encode_cashaddr():
+    from coinaddress.networks import bitcoin_cash
+    return lambda i: bitcoin_cash.encode('bitcoincash', 0, HASH160)
+
+
+@case('encode.ripple', 'Ripple base58check of account id')
+def encode_ripple():
+    from coinaddress.networks.ripple import RippleBaseDecoder
+    return lambda i: RippleBaseDecoder.encode(HASH160)
+
+
+@case('encode.eip55', 'EIP-55 checksum of Ethereum address')
+def encode_eip55():
+    from coinaddress.networks.ethereum import to_checksum_address
+    address = '0x' + HASH160.hex()
+    return lambda i: to_checksum_address(address)
+
+
+def address_case(network):
+    def setup():
+        net = registry.get(network)
+        node_cache.clear()
+        net.get_address(XPUB, '0/0')
+        return lambda i: net.get_address(XPUB, '0/%d' % (i % 2 ** 31))
+    return setup
+
+
+def bulk_case(network):
+    def setup():
+        net = registry.get(network)
+        net.get_addresses(XPUB, '0', 0, 1)
+
+        def func(i):
+            return net.get_addresses(XPUB, '0', start=i * BULK_SIZE % 2 ** 31,
+                                     count=BULK_SIZE)
+        return func
+    return setup
+
+
+def encode_bulk_case(network):
+    def setup():
+        import os
+
+        net = registry.get(network)
+        payloads = os.urandom(20 * BULK_SIZE)
+        return lambda i: net.encode_payloads(payloads)
+    return setup
+
+
+def payloads_case(network):
+    def setup():
+        net = registry.get(network)
+        net.get_addresses(XPUB, '0', 0, 1)
+
+        def func(i):
+            start = i * BULK_SIZE % 2 ** 31
+            return b''.join(net.iter_payloads(XPUB, '0', start,
+                                              start + BULK_SIZE))
+        return func
+    return setup
+
+
+for _network in NETWORKS:
+    case(
+        'address.%s' % _network,
+        'end-to-end get_address for %s with warm cache' % _network,
+    )(address_case(_network))
+for _network in NETWORKS:
+    case(
+        'bulk.%s' % _network,
+        'get_addresses of %d %s addresses' % (BULK_SIZE, _network),
+    )(bulk_case(_network))
+for _network in NETWORKS:
+    case(
+        'encode.bulk.%s' % _network,
+        'encode_payloads of %d %s payloads buffer' % (BULK_SIZE, _network),
+    )(encode_bulk_case(_network))
+for _network in NETWORKS:
+    case(
+        'payloads.%s' % _network,
+        'raw payloads of %d %s addresses without encoding'
+        % (BULK_SIZE, _network),
+    )(payloads_case(_network))
+
+
+@case('lookup.index', 'reverse index lookup among %d addresses' % BULK_SIZE)
+def lookup_index():
+    import atexit
+    import os
+    import tempfile
+    from coinaddress.index import build_index
+
+    directory = tempfile.TemporaryDirectory()
+    atexit.register(directory.cleanup)
+    path = os.path.join(directory.name, 'bench.idx')
+    index = build_index(path, 'bitcoin', [XPUB], '0', count=BULK_SIZE)
+    # atexit runs handlers in reverse order, the mmap is closed first
+    atexit.register(index.close)
+    addresses = registry.get('bitcoin').get_addresses(XPUB, '0', 0, 100)
+    return lambda i: index.lookup('bitcoin', addresses[i % 100])
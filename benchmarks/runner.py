@@ -0,0 +1,167 @@
+"""Benchmark runner with JSON output and baseline comparison."""
+import argparse
+import fnmatch
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from collections import OrderedDict
+
+import coinaddress
+from coinaddress.backends import get_backend
+
+#: Registered cases, name to ``(setup, description)``. ``setup`` returns the
+#: callable to time, it gets an increasing iteration number.
+CASES = OrderedDict()
+
+DEFAULT_BASELINE_DIR = '.benchmarks'
+
+
+def case(name: str, description: str = ''):
+    def wrapper(setup):
+        CASES[name] = (setup, description or (setup.__doc__ or '').strip())
+        return setup
+    return wrapper
+
+
+def measure(func, min_time: float, repeat: int):
+    """Time ``func`` and return per call timings of every repeat in seconds.
+
+    Number of calls per repeat is calibrated so one repeat takes about
+    ``min_time`` seconds.
+    """
+    counter = iter(range(10 ** 12))
+    number = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(number):
+            func(next(counter))
+        elapsed = time.perf_counter() - started
+        if elapsed >= min_time / 4 or number >= 10 ** 7:
+            break
+        number *= 4
+    number = max(1, int(number * min_time / max(elapsed, 1e-9)))
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in range(number):
+            func(next(counter))
+        timings.append((time.perf_counter() - started) / number)
+    return number, timings
+
+
+def run(patterns=None, min_time=0.2, repeat=5, stream=None):
+    stream = stream or sys.stdout
+    # Cases register themselves on import
+    from . import cases  # noqa: F401
+
+    results = OrderedDict()
+    for name, (setup, description) in CASES.items():
+        if patterns and not any(fnmatch.fnmatch(name, p) for p in patterns):
+            continue
+        try:
+            func = setup()
+        except ImportError as e:
+            stream.write('%-40s skipped: %s\n' % (name, e))
+            continue
+        number, timings = measure(func, min_time, repeat)
+        results[name] = {
+            'description': description,
+            'number': number,
+            'repeat': repeat,
+            'best_us': min(timings) * 1e6,
+            'median_us': statistics.median(timings) * 1e6,
+        }
+        stream.write('%-40s %12.2f us/op  (median %.2f, %d x %d)\n' % (
+            name, results[name]['best_us'], results[name]['median_us'],
+            repeat, number
+        ))
+        stream.flush()
+    return {
+        'meta': {
+            'coinaddress': coinaddress.__version__,
+            'python': platform.python_version(),
+            'implementation': platform.python_implementation(),
+            'machine': platform.machine(),
+            'backend': get_backend().name,
+            'timestamp': time.time(),
+        },
+        'results': results,
+    }
+
+
+def compare(report, baseline, threshold, stream=None):
+    """Print per case change against baseline and return regressed names."""
+    stream = stream or sys.stdout
+    regressions = []
+    stream.write('\n%-40s %12s %12s %8s\n' % (
+        'case', 'baseline us', 'current us', 'change'
+    ))
+    for name, result in report['results'].items():
+        previous = baseline['results'].get(name)
+        if previous is None:
+            continue
+        change = result['best_us'] / previous['best_us'] - 1
+        mark = ''
+        if change > threshold:
+            mark = '  REGRESSION'
+            regressions.append(name)
+        stream.write('%-40s %12.2f %12.2f %+7.1f%%%s\n' % (
+            name, previous['best_us'], result['best_us'], change * 100, mark
+        ))
+    return regressions
+
+
+def baseline_path(name: str) -> str:
+    if os.sep in name or name.endswith('.json'):
+        return name
+    return os.path.join(DEFAULT_BASELINE_DIR, name + '.json')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m benchmarks',
+        description='Time every stage of address generation.',
+    )
+    parser.add_argument('patterns', nargs='*',
+                        help='run only cases matching these glob patterns')
+    parser.add_argument('--list', action='store_true',
+                        help='list cases and exit')
+    parser.add_argument('--min-time', type=float, default=0.2,
+                        help='seconds per repeat (default: %(default)s)')
+    parser.add_argument('--repeat', type=int, default=5,
+                        help='repeats per case (default: %(default)s)')
+    parser.add_argument('--json', metavar='FILE',
+                        help='write results as JSON to FILE')
+    parser.add_argument('--save', metavar='NAME',
+                        help='save results as baseline NAME (or file path)')
+    parser.add_argument('--compare', metavar='NAME',
+                        help='compare results with baseline NAME')
+    parser.add_argument('--threshold', type=float, default=0.10,
+                        help='slowdown ratio reported as regression '
+                             '(default: %(default)s)')
+    args = parser.parse_args(argv)
+
+    if args.list:
+        from . import cases  # noqa: F401
+        for name, (_, description) in CASES.items():
+            print('%-40s %s' % (name, description))
+        return 0
+
+    report = run(args.patterns, args.min_time, args.repeat)
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2)
+    if args.save:
+        path = baseline_path(args.save)
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump(report, f, indent=2)
+    if args.compare:
+        with open(baseline_path(args.compare)) as f:
+            baseline = json.load(f)
+        if compare(report, baseline, args.threshold):
+            return 1
+    return 0
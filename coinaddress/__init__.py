@@ -4,8 +4,18 @@ __author__ = """Roman Tolkachyov"""
 __email__ = 'roman@tolkachyov.name'
 __version__ = '0.1.1'
 
-from .coinaddress import address_from_xpub
+from .coinaddress import (
+    address_from_xpub,
+    addresses_from_xpub,
+    iter_addresses_from_xpub,
+    load_xpubs,
+    scan_xpub,
+)
 
 __all__ = [
-    'address_from_xpub'
+    'address_from_xpub',
+    'addresses_from_xpub',
+    'iter_addresses_from_xpub',
+    'load_xpubs',
+    'scan_xpub',
 ]
@@ -0,0 +1,251 @@
+"""asyncio API running derivation in an executor.
+
+Coroutines never derive on the event loop thread. Work goes to the executor
+of :class:`AsyncDeriver` (the loop default thread pool unless configured),
+which may also be a process pool.
+
+Concurrent requests of the same address or range share one computation.
+Single address requests under the same xpub and prefix arriving within
+``batch_delay`` seconds of each other are derived together as one bulk call.
+"""
+import asyncio
+from functools import partial
+from typing import AsyncIterator, List, Optional, Tuple, Union
+
+from .keys import DEFAULT_CHUNK_SIZE, HARDENED_INDEX
+from .networks import registry
+
+#: Seconds single address requests wait for others to join their batch.
+DEFAULT_BATCH_DELAY = 0.001
+#: Batch is derived right away once it has that many addresses.
+DEFAULT_MAX_BATCH = 256
+
+# Python < 3.7 has no get_running_loop, get_event_loop returns the running
+# loop when called from a coroutine.
+_running_loop = getattr(asyncio, 'get_running_loop', asyncio.get_event_loop)
+
+
+def _get_network(name):
+    net = registry.get(name)
+    if net is None:
+        raise ValueError("Unknown network %s" % name)
+    return net
+
+
+def _derive_addresses(network: str, xpub: str, prefix: str,
+                      indices: List[int]) -> List[Union[str, Exception]]:
+    """Addresses of sorted ``indices``, contiguous runs derived in bulk.
+
+    A failing run gives its exception in place of each of its addresses,
+    so other runs of the batch are still served.
+    """
+    net = _get_network(network)
+    addresses = []
+    run = 0
+    for position in range(1, len(indices) + 1):
+        if (position == len(indices) or
+                indices[position] != indices[position - 1] + 1):
+            count = position - run
+            try:
+                addresses.extend(net.get_addresses(
+                    xpub, prefix, indices[run], count
+                ))
+            except Exception as e:
+                addresses.extend([e] * count)
+            run = position
+    return addresses
+
+
+def _get_address(network: str, xpub: str, path: str) -> str:
+    return _get_network(network).get_address(xpub, path)
+
+
+def _get_addresses(network: str, xpub: str, prefix: str, start: int,
+                   count: int, chunk_size: int) -> List[str]:
+    return _get_network(network).get_addresses(
+        xpub, prefix, start, count, chunk_size
+    )
+
+
+class _Batch:
+    __slots__ = ('futures', 'handle')
+
+    def __init__(self):
+        self.futures = {}
+        self.handle = None
+
+
+class AsyncDeriver:
+    """Derives addresses in ``executor`` on behalf of coroutines.
+
+    ``executor`` is any :class:`concurrent.futures.Executor`, ``None`` means
+    the default executor of the event loop.
+    """
+
+    def __init__(self, executor=None, batch_delay: float = DEFAULT_BATCH_DELAY,
+                 max_batch: int = DEFAULT_MAX_BATCH):
+        if max_batch < 1:
+            raise ValueError("max_batch can't be less than 1")
+        self.executor = executor
+        self.batch_delay = batch_delay
+        self.max_batch = max_batch
+        self._inflight = {}
+        self._batches = {}
+
+    def _share(self, key, create) -> asyncio.Future:
+        future = self._inflight.get(key)
+        if future is None:
+            future = self._inflight[key] = create()
+            future.add_done_callback(
+                lambda _: self._inflight.pop(key, None)
+            )
+        return future
+
+    async def get_address(self, network: str, xpub: str,
+                          path: str = '0') -> str:
+        _get_network(network)
+        loop = _running_loop()
+        prefix, _, index = path.rpartition('/')
+        if not index.isdigit() or int(index) >= HARDENED_INDEX:
+            # Not batchable, let derivation raise the proper error
+            future = self._share(
+                (loop, 'address', network, xpub, path),
+                lambda: loop.run_in_executor(
+                    self.executor, _get_address, network, xpub, path
+                )
+            )
+            return await asyncio.shield(future)
+        index = int(index)
+        future = self._share(
+            (loop, 'address', network, xpub, '%s/%d' % (prefix, index)),
+            lambda: self._enqueue(loop, network, xpub, prefix, index)
+        )
+        return await asyncio.shield(future)
+
+    def _enqueue(self, loop, network, xpub, prefix, index):
+        key = (loop, network, xpub, prefix)
+        batch = self._batches.get(key)
+        if batch is None:
+            batch = self._batches[key] = _Batch()
+            batch.handle = loop.call_later(
+                self.batch_delay, self._flush, key
+            )
+        future = batch.futures[index] = loop.create_future()
+        if len(batch.futures) >= self.max_batch:
+            self._flush(key)
+        return future
+
+    def _flush(self, key):
+        batch = self._batches.pop(key, None)
+        if batch is None:
+            return
+        batch.handle.cancel()
+        loop, network, xpub, prefix = key
+        indices = sorted(batch.futures)
+        result = loop.run_in_executor(
+            self.executor, _derive_addresses, network, xpub, prefix, indices
+        )
+        result.add_done_callback(
+            partial(self._resolve, [batch.futures[i] for i in indices])
+        )
+
+    @staticmethod
+    def _resolve(futures, result):
+        error = result.exception() if not result.cancelled() else None
+        for position, future in enumerate(futures):
+            if future.done():
+                continue
+            if result.cancelled():
+                future.cancel()
+            elif error is not None:
+                future.set_exception(error)
+            else:
+                address = result.result()[position]
+                if isinstance(address, Exception):
+                    future.set_exception(address)
+                else:
+                    future.set_result(address)
+
+    async def get_addresses(self, network: str, xpub: str, prefix: str = '',
+                            start: int = 0, count: int = 1,
+                            chunk_size: int = DEFAULT_CHUNK_SIZE
+                            ) -> List[str]:
+        _get_network(network)
+        loop = _running_loop()
+        future = self._share(
+            (loop, 'range', network, xpub, prefix, start, count),
+            lambda: loop.run_in_executor(
+                self.executor, _get_addresses, network, xpub, prefix, start,
+                count, chunk_size
+            )
+        )
+        return list(await asyncio.shield(future))
+
+    async def iter_addresses(self, network: str, xpub: str, prefix: str = '',
+                             start: int = 0, stop: Optional[int] = None,
+                             chunk_size: int = DEFAULT_CHUNK_SIZE
+                             ) -> AsyncIterator[Tuple[int, str]]:
+        """Yield ``(index, address)`` pairs, forever without ``stop``.
+
+        The next chunk of ``chunk_size`` addresses is derived while the
+        current one is consumed.
+        """
+        if start < 0:
+            raise ValueError("Index can't be less than 0")
+
+        def fetch(index):
+            count = chunk_size if stop is None else min(chunk_size,
+                                                        stop - index)
+            if count <= 0:
+                return None
+            return asyncio.ensure_future(self.get_addresses(
+                network, xpub, prefix, index, count, chunk_size
+            ))
+
+        index = start
+        pending = fetch(index)
+        try:
+            while pending is not None:
+                addresses = await pending
+                pending = fetch(index + len(addresses))
+                for address in addresses:
+                    yield index, address
+                    index += 1
+        finally:
+            if pending is not None:
+                pending.cancel()
+
+
+default_deriver = AsyncDeriver()
+
+
+def configure(executor=None, batch_delay: float = DEFAULT_BATCH_DELAY,
+              max_batch: int = DEFAULT_MAX_BATCH) -> AsyncDeriver:
+    """Replace the deriver used by module level coroutines."""
+    global default_deriver
+    default_deriver = AsyncDeriver(executor, batch_delay, max_batch)
+    return default_deriver
+
+
+async def aget_address(network: str, xpub: str, path: str = '0') -> str:
+    """Async :func:`coinaddress.address_from_xpub`."""
+    return await default_deriver.get_address(network, xpub, path)
+
+
+async def aget_addresses(network: str, xpub: str, prefix: str = '',
+                         start: int = 0, count: int = 1,
+                         chunk_size: int = DEFAULT_CHUNK_SIZE) -> List[str]:
+    """Async :func:`coinaddress.addresses_from_xpub`."""
+    return await default_deriver.get_addresses(
+        network, xpub, prefix, start, count, chunk_size
+    )
+
+
+def aiter_addresses(network: str, xpub: str, prefix: str = '',
+                    start: int = 0, stop: Optional[int] = None,
+                    chunk_size: int = DEFAULT_CHUNK_SIZE
+                    ) -> AsyncIterator[Tuple[int, str]]:
+    """Async :func:`coinaddress.iter_addresses_from_xpub`."""
+    return default_deriver.iter_addresses(
+        network, xpub, prefix, start, stop, chunk_size
+    )
@@ -0,0 +1,139 @@
+"""Pluggable elliptic curve backends used for key derivation.
+
+A backend implements the few secp256k1 operations needed by
+:class:`~coinaddress.keys.PublicKey`. Points are opaque to the rest of the
+package and are only passed back to the backend which created them.
+
+Available backends:
+
+* ``coincurve`` -- native libsecp256k1 binding, used when installed
+* ``python`` -- pure Python integer arithmetic with a precomputed
+  generator table
+* ``ecdsa`` -- generic ``ecdsa`` package arithmetic, kept as a reference
+  for cross-checking
+
+The backend is chosen with :func:`set_backend` or the ``COINADDRESS_BACKEND``
+environment variable, ``auto`` (the default) picks the fastest available.
+"""
+import importlib
+import os
+from typing import List, Tuple
+
+ENV_VAR = 'COINADDRESS_BACKEND'
+
+#: Backend name to ``module:class`` path, in ``auto`` preference order.
+BACKENDS = {
+    'coincurve': 'coinaddress.backends.coincurve:CoincurveBackend',
+    'python': 'coinaddress.backends.python:PythonBackend',
+    'ecdsa': 'coinaddress.backends.ecdsa:EcdsaBackend',
+}
+AUTO_ORDER = ('coincurve', 'python')
+
+
+class BackendNotAvailable(ImportError):
+    pass
+
+
+class Backend:
+    """Interface of an elliptic curve backend."""
+
+    name = None
+
+    def decode(self, key: bytes):
+        """Load a validated point from a SEC1 encoded public key."""
+        raise NotImplementedError
+
+    def from_coordinates(self, x: int, y: int):
+        """Load a point from affine coordinates of a validated key."""
+        raise NotImplementedError
+
+    def tweak_add(self, point, scalar: int):
+        """Return ``point + scalar * G``."""
+        raise NotImplementedError
+
+    def normalize(self, point):
+        """Return point in the form accepted by :meth:`serialize`."""
+        return point
+
+    def normalize_many(self, points: List) -> List:
+        return [self.normalize(p) for p in points]
+
+    def coordinates(self, point) -> Tuple[int, int]:
+        """Affine ``(x, y)`` coordinates of a normalized point."""
+        raise NotImplementedError
+
+    def serialize(self, point, compressed: bool = True) -> bytes:
+        """SEC1 encoding of a normalized point."""
+        raise NotImplementedError
+
+    def __repr__(self):
+        return '<%s backend>' % self.name
+
+
+_instances = {}
+_current = None
+
+
+def load_backend(name: str) -> Backend:
+    """Get backend instance by name.
+
+    Raises :class:`BackendNotAvailable` if its dependencies aren't installed.
+    """
+    if name not in BACKENDS:
+        raise ValueError("Unknown backend %s, choose one of %s" % (
+            name, ', '.join(BACKENDS)
+        ))
+    if name not in _instances:
+        module_name, class_name = BACKENDS[name].split(':')
+        try:
+            module = importlib.import_module(module_name)
+        except ImportError as e:
+            raise BackendNotAvailable(
+                "Backend %s is not available: %s" % (name, e)
+            ) from e
+        _instances[name] = getattr(module, class_name)()
+    return _instances[name]
+
+
+def available_backends() -> List[str]:
+    """Names of backends which can be loaded in this environment."""
+    available = []
+    for name in BACKENDS:
+        try:
+            load_backend(name)
+        except BackendNotAvailable:
+            continue
+        available.append(name)
+    return available
+
+
+def _auto_backend() -> Backend:
+    for name in AUTO_ORDER:
+        try:
+            return load_backend(name)
+        except BackendNotAvailable:
+            continue
+    raise BackendNotAvailable("No elliptic curve backend available")
+
+
+def set_backend(name: str = 'auto') -> Backend:
+    """Select the backend used for new nodes.
+
+    Points of different backends can't be mixed, so the shared node cache
+    is cleared.
+    """
+    global _current
+    from coinaddress.cache import node_cache
+    backend = _auto_backend() if name == 'auto' else load_backend(name)
+    _current = backend
+    node_cache.clear()
+    return backend
+
+
+def get_backend() -> Backend:
+    """Get the current backend, selecting it from the environment first."""
+    global _current
+    if _current is None:
+        name = os.environ.get(ENV_VAR) or 'auto'
+        _current = _auto_backend() if name == 'auto' else load_backend(name)
+    return _current
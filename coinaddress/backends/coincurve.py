@@ -0,0 +1,23 @@
+"""Native libsecp256k1 backend through the ``coincurve`` binding."""
+from coincurve import PublicKey as CoincurvePublicKey
+
+from . import Backend
+
+
+class CoincurveBackend(Backend):
+    name = 'coincurve'
+
+    def decode(self, key):
+        return CoincurvePublicKey(key)
+
+    def from_coordinates(self, x, y):
+        return CoincurvePublicKey.from_point(x, y)
+
+    def tweak_add(self, point, scalar):
+        return point.add(scalar.to_bytes(32, 'big'))
+
+    def coordinates(self, point):
+        return point.point()
+
+    def serialize(self, point, compressed=True):
+        return point.format(compressed=compressed)
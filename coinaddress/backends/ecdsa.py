@@ -0,0 +1,34 @@
+"""Reference backend using generic ``ecdsa`` point arithmetic.
+
+It is much slower than the other backends and is kept for cross-checking.
+"""
+from ecdsa.curves import SECP256k1
+from ecdsa.ecdsa import Public_key as ECDSAPublicKey
+from ecdsa.ellipticcurve import Point
+
+from coinaddress import secp256k1
+
+from . import Backend
+
+
+class EcdsaBackend(Backend):
+    name = 'ecdsa'
+
+    def decode(self, key):
+        return self.from_coordinates(*secp256k1.decode_point(key))
+
+    def from_coordinates(self, x, y):
+        return Point(SECP256k1.curve, x, y)
+
+    def tweak_add(self, point, scalar):
+        g = SECP256k1.generator
+        return ECDSAPublicKey(g, g * scalar).point + point
+
+    def coordinates(self, point):
+        return point.x(), point.y()
+
+    def serialize(self, point, compressed=True):
+        x, y = self.coordinates(point)
+        if compressed:
+            return bytes((2 + (y & 1),)) + x.to_bytes(32, 'big')
+        return b'\x04' + x.to_bytes(32, 'big') + y.to_bytes(32, 'big')
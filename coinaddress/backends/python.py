@@ -0,0 +1,55 @@
+"""Pure Python backend on top of :mod:`coinaddress.secp256k1`.
+
+Points are Jacobian ``(X, Y, Z)`` integer tuples, normalized ones have
+``Z == 1``.
+"""
+from coinaddress import secp256k1
+
+from . import Backend
+
+
+class PythonBackend(Backend):
+    name = 'python'
+
+    def decode(self, key):
+        x, y = secp256k1.decode_point(key)
+        return x, y, 1
+
+    def from_coordinates(self, x, y):
+        return x, y, 1
+
+    def tweak_add(self, point, scalar):
+        return secp256k1.jacobian_add_affine(
+            secp256k1.multiply_generator(scalar), self.coordinates(point)
+        )
+
+    def normalize(self, point):
+        if point[2] == 1:
+            return point
+        x, y = secp256k1.to_affine(point)
+        return x, y, 1
+
+    def normalize_many(self, points):
+        """Normalize with a single shared inversion.
+
+        See :func:`~coinaddress.secp256k1.batch_to_affine`.
+        """
+        result = list(points)
+        pending = [i for i, p in enumerate(result) if p[2] != 1]
+        affine = secp256k1.batch_to_affine([result[i] for i in pending])
+        for i, (x, y) in zip(pending, affine):
+            result[i] = (x, y, 1)
+        return result
+
+    def coordinates(self, point):
+        x, y, z = point
+        if z != 1:
+            raise ValueError("Point is not normalized")
+        return x, y
+
+    def serialize(self, point, compressed=True):
+        x, y = self.coordinates(point)
+        if compressed:
+            # 0x02 even, 0x03 odd
+            return bytes((2 + (y & 1),)) + x.to_bytes(32, 'big')
+        return b'\x04' + x.to_bytes(32, 'big') + y.to_bytes(32, 'big')
@@ -0,0 +1,167 @@
+"""Table driven base58 and base58check codec.
+
+The same engine serves the Bitcoin alphabet (Bitcoin-family networks, xpubs)
+and the Ripple alphabet.
+
+Big integer work is done in groups of five base58 digits: ``58 ** 5`` fits
+into a single 30-bit CPython digit, so every big division and multiplication
+takes the fast single-digit path. A group is split into characters with
+small integer arithmetic and a precomputed two-character table. For a
+25-byte address payload that's 7 big divisions instead of 34.
+"""
+import hashlib
+from typing import Iterable, List
+
+from . import bulk
+
+BITCOIN_ALPHABET = (
+    '123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz'
+)
+RIPPLE_ALPHABET = (
+    'rpshnaf39wBUDNEGHJKLM4PQRST7VWXYZ2bcdeCg65jkm8oFqi1tuvAxyz'
+)
+
+_GROUP_DIGITS = 5
+_GROUP = 58 ** _GROUP_DIGITS
+_PAIR = 58 ** 2
+_INVALID = 0xff
+
+
+def checksum(data: bytes) -> bytes:
+    """First 4 bytes of double SHA256."""
+    return hashlib.sha256(hashlib.sha256(data).digest()).digest()[:4]
+
+
+class Base58Codec:
+    """base58 codec for the given 58 characters alphabet."""
+
+    def __init__(self, alphabet: str):
+        if len(alphabet) != 58 or len(set(alphabet)) != 58:
+            raise ValueError("Alphabet must have 58 unique characters")
+        self.alphabet = alphabet
+        self._zero = alphabet[0]
+        self._pairs = [a + b for a in alphabet for b in alphabet]
+        table = bytearray([_INVALID]) * 256
+        for value, char in enumerate(alphabet.encode('ascii')):
+            table[char] = value
+        self._decode_table = bytes(table)
+
+    def _encode_int(self, n: int) -> str:
+        alphabet = self.alphabet
+        pairs = self._pairs
+        groups = []
+        while n:
+            n, group = divmod(n, _GROUP)
+            rest, low = divmod(group, _PAIR)
+            top, middle = divmod(rest, _PAIR)
+            groups.append(alphabet[top] + pairs[middle] + pairs[low])
+        return ''.join(reversed(groups)).lstrip(self._zero)
+
+    def encode(self, data: bytes) -> str:
+        """Encode bytes, leading zero bytes become leading zero characters."""
+        encoded = self._encode_int(int.from_bytes(data, 'big'))
+        pad = len(data) - len(data.lstrip(b'\0'))
+        return self._zero * pad + encoded
+
+    def encode_check(self, data: bytes) -> str:
+        """Encode bytes with 4 bytes double SHA256 checksum appended."""
+        return self.encode(data + checksum(data))
+
+    def encode_many(self, payloads: Iterable[bytes]) -> List[str]:
+        encode = self.encode
+        return [encode(data) for data in payloads]
+
+    def encode_check_many(self, payloads: Iterable[bytes]) -> List[str]:
+        encode = self.encode
+        return [encode(data + checksum(data)) for data in payloads]
+
+    def encode_check_buffer(self, payloads: bytes, size: int,
+                            version: bytes = b'') -> List[str]:
+        """base58check of ``version`` and every ``size`` bytes payload.
+
+        Digits of large batches are computed with NumPy, see
+        :mod:`coinaddress.bulk`.
+        """
+        rows = [version + row for row in bulk.split(payloads, size)]
+        np = bulk.numpy_for(len(rows))
+        if np is None:
+            return self.encode_check_many(rows)
+        data = b''.join([row + checksum(row) for row in rows])
+        return self._encode_numpy(np, data, len(version) + size + 4)
+
+    def _encode_numpy(self, np, data: bytes, size: int) -> List[str]:
+        # Every row is a big number of 32-bit limbs divided by 58 ** 5 at
+        # once, so a division costs a few array operations for all rows.
+        count = len(data) // size
+        rows = np.frombuffer(data, np.uint8).reshape(count, size)
+        padded = np.zeros((count, size + -size % 4), np.uint64)
+        padded[:, -size:] = rows
+        padded = padded.reshape(count, -1, 4)
+        limbs = (
+            padded[:, :, 0] << np.uint64(24) | padded[:, :, 1] << np.uint64(16)
+            | padded[:, :, 2] << np.uint64(8) | padded[:, :, 3]
+        )
+        width = 0
+        while 58 ** width < 256 ** size:
+            width += 1
+        groups = -(-width // _GROUP_DIGITS)
+        width = groups * _GROUP_DIGITS
+        digits = np.empty((count, width), np.uint8)
+        group = np.uint64(_GROUP)
+        shift = np.uint64(32)
+        for g in range(groups - 1, -1, -1):
+            rem = np.zeros(count, np.uint64)
+            for j in range(limbs.shape[1]):
+                value = rem << shift | limbs[:, j]
+                limbs[:, j] = value // group
+                rem = value % group
+            for k in range(_GROUP_DIGITS - 1, -1, -1):
+                rem, digits[:, g * _GROUP_DIGITS + k] = np.divmod(rem, 58)
+        chars = np.frombuffer(self.alphabet.encode('ascii'), np.uint8)[digits]
+        # Leading zero bytes become zero characters, the rest of leading
+        # zero digits is stripped
+        nonzero = digits != 0
+        first = np.where(nonzero.any(1), nonzero.argmax(1), width)
+        nonzero = rows != 0
+        pad = np.where(nonzero.any(1), nonzero.argmax(1), size)
+        text = bulk.to_text(chars)
+        return [
+            address[start:]
+            for address, start in zip(text, (first - pad).tolist())
+        ]
+
+    def decode_int(self, encoded: str) -> int:
+        """Decode string into integer without leading zeros handling."""
+        try:
+            digits = encoded.encode('ascii').translate(self._decode_table)
+        except UnicodeEncodeError:
+            raise ValueError("Invalid base58 character") from None
+        if _INVALID in digits:
+            raise ValueError("Invalid base58 character")
+        n = 0
+        head = len(digits) % _GROUP_DIGITS
+        for i in range(head):
+            n = n * 58 + digits[i]
+        for i in range(head, len(digits), _GROUP_DIGITS):
+            d0, d1, d2, d3, d4 = digits[i:i + _GROUP_DIGITS]
+            n = n * _GROUP + (
+                (((d0 * 58 + d1) * 58 + d2) * 58 + d3) * 58 + d4
+            )
+        return n
+
+    def decode(self, encoded: str) -> bytes:
+        n = self.decode_int(encoded)
+        pad = len(encoded) - len(encoded.lstrip(self._zero))
+        return b'\0' * pad + n.to_bytes((n.bit_length() + 7) // 8, 'big')
+
+    def decode_check(self, encoded: str) -> bytes:
+        """Decode string and verify and strip its 4 bytes checksum."""
+        data = self.decode(encoded)
+        payload, check = data[:-4], data[-4:]
+        if len(data) < 4 or checksum(payload) != check:
+            raise ValueError("Invalid checksum")
+        return payload
+
+
+bitcoin = Base58Codec(BITCOIN_ALPHABET)
+ripple = Base58Codec(RIPPLE_ALPHABET)
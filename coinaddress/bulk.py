@@ -0,0 +1,81 @@
+"""Bulk hash and encode stage over contiguous buffers.
+
+Derived keys are serialized into a single buffer of ``N`` fixed size public
+keys (33 bytes compressed or 65 bytes uncompressed), hashed into a buffer of
+``N`` raw 20 bytes payloads, see
+:meth:`~coinaddress.networks.base.BaseNetwork.hash_public_keys`, and the
+payloads are encoded into address strings at once, see
+:meth:`~coinaddress.networks.base.BaseNetwork.encode_payloads`.
+
+Checksum and charset mapping of base58check, CashAddr and EIP-55 encoders
+is vectorized with NumPy when it's installed (``pip install
+coinaddress[numpy]``) and the batch has at least :data:`NUMPY_MIN_BATCH`
+addresses. Pure Python encoders are used otherwise, both give the same
+results. Hash functions can't be vectorized and stay a ``hashlib`` call per
+key and checksum.
+"""
+import hashlib
+from typing import List
+
+#: Size of raw address payload, hash160 or Ethereum account.
+PAYLOAD_SIZE = 20
+#: Smallest batch encoded with NumPy, smaller ones are faster in pure Python.
+NUMPY_MIN_BATCH = 64
+
+#: NumPy module, ``False`` if it's unavailable or disabled, ``None`` until
+#: the first bulk encoding.
+_numpy = None
+
+
+def use_numpy(enabled: bool = True):
+    """Enable or disable NumPy encoders.
+
+    Raises :class:`ImportError` when enabling without NumPy installed.
+    """
+    global _numpy
+    if enabled:
+        import numpy
+        _numpy = numpy
+    else:
+        _numpy = False
+
+
+def numpy_for(count: int):
+    """NumPy module if a batch of ``count`` items should use it, or None."""
+    global _numpy
+    if count < NUMPY_MIN_BATCH:
+        return None
+    if _numpy is None:
+        try:
+            import numpy
+        except ImportError:
+            numpy = False
+        _numpy = numpy
+    return _numpy or None
+
+
+def split(buffer: bytes, size: int) -> List[memoryview]:
+    """Split buffer into views of ``size`` bytes records."""
+    if len(buffer) % size:
+        raise ValueError("Buffer size must be a multiple of %d" % size)
+    view = memoryview(buffer)
+    return [view[i:i + size] for i in range(0, len(view), size)]
+
+
+def hash160(keys: bytes, key_size: int = 33) -> bytes:
+    """``ripemd160(sha256(key))`` of every key of the buffer, concatenated."""
+    sha256 = hashlib.sha256
+    ripemd160 = hashlib.new('ripemd160')
+    digests = []
+    for key in split(keys, key_size):
+        h = ripemd160.copy()
+        h.update(sha256(key).digest())
+        digests.append(h.digest())
+    return b''.join(digests)
+
+
+def to_text(chars, head: str = '') -> List[str]:
+    """Rows of 2D array of ASCII codes as strings prefixed with ``head``."""
+    count, width = chars.shape
+    text = chars.tobytes().decode('ascii')
+    return [head + text[i:i + width] for i in range(0, count * width, width)]
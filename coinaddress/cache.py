@@ -0,0 +1,110 @@
+"""Bounded LRU cache for decoded xpubs and intermediate derivation nodes."""
+import threading
+from collections import OrderedDict
+
+DEFAULT_MAXSIZE = 1024
+
+_MISSING = object()
+
+
+class LRUCache:
+    """Thread-safe least recently used cache with hit/miss/eviction counters.
+
+    ``maxsize`` of 0 disables caching completely.
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_MAXSIZE):
+        if maxsize < 0:
+            raise ValueError("maxsize can't be less than 0")
+        self._maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def maxsize(self) -> int:
+        return self._maxsize
+
+    @maxsize.setter
+    def maxsize(self, value: int):
+        if value < 0:
+            raise ValueError("maxsize can't be less than 0")
+        with self._lock:
+            self._maxsize = value
+            self._evict()
+
+    def _evict(self):
+        while len(self._data) > self._maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def get(self, key, default=None):
+        with self._lock:
+            value = self._data.get(key, _MISSING)
+            if value is _MISSING:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            if not self._maxsize:
+                return
+            self._data[key] = value
+            self._data.move_to_end(key)
+            self._evict()
+
+    def get_or_create(self, key, factory):
+        """Get value by key or build it with ``factory`` and store it.
+
+        ``factory`` is called outside of the lock, so two threads missing the
+        same key at once may both compute it; the last result wins.
+        """
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = factory()
+            self.put(key, value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def reset_stats(self):
+        with self._lock:
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'size': len(self._data),
+                'maxsize': self._maxsize,
+            }
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
+
+
+#: Shared cache used by networks for decoded xpubs, keyed by
+#: ``(network, xpub)``, and derived nodes, keyed by ``(xpub, path prefix)``.
+node_cache = LRUCache()
+
+
+def configure_cache(maxsize: int = DEFAULT_MAXSIZE):
+    """Resize the shared node cache. Use 0 to disable caching."""
+    node_cache.maxsize = maxsize
+
+
+def cache_info() -> dict:
+    """Get hit/miss/eviction counters of the shared node cache."""
+    return node_cache.stats()
@@ -1,11 +1,151 @@
 """Console script for coinaddress."""
+import csv
+import json
 import sys
+import time
+from itertools import islice
+
 import click
 
+from . import __version__, stats
+from .backends import BACKENDS, get_backend, set_backend
+from .jobs import INPUT_FORMATS, OUTPUT_FORMATS, read_jobs, run_jobs, write_results
 from .networks import registry
+from .parallel import generate_addresses, generate_payloads
+from .payloads import write_payloads
+from .cache import configure_cache
+from .store import open_store, set_store
+
+#: Number of lines joined into a single write to the output.
+WRITE_CHUNK_SIZE = 8192
+#: Output formats of the generate command.
+GENERATE_FORMATS = ('text', 'ndjson', 'csv', 'binary')
+
+
+def write_lines(output, lines) -> int:
+    """Write lines to output joining them into large chunks.
+
+    Returns number of written lines.
+    """
+    lines = iter(lines)
+    written = 0
+    while True:
+        chunk = list(islice(lines, WRITE_CHUNK_SIZE))
+        if not chunk:
+            break
+        written += len(chunk)
+        chunk.append('')
+        output.write('\n'.join(chunk))
+    return written
+
+
+def write_rows(output, output_format, prefix, pairs) -> int:
+    """Write ``(index, address)`` pairs as NDJSON or CSV rows with paths.
+
+    Returns number of written rows.
+    """
+    rows = (
+        (index, '%s/%d' % (prefix, index) if prefix else str(index), address)
+        for index, address in pairs
+    )
+    if output_format == 'csv':
+        writer = csv.writer(output, lineterminator='\n')
+        writer.writerow(('index', 'path', 'address'))
+        written = 0
+        while True:
+            chunk = list(islice(rows, WRITE_CHUNK_SIZE))
+            if not chunk:
+                return written
+            writer.writerows(chunk)
+            written += len(chunk)
+    dumps = json.dumps
+    return write_lines(output, (
+        dumps({'index': index, 'path': path, 'address': address})
+        for index, path, address in rows
+    ))
+
+
+def print_stats(count, elapsed, jobs):
+    rate = count / elapsed if elapsed else 0.0
+    lines = [
+        '%d addresses in %.3f s (%.1f addresses/sec)' % (count, elapsed, rate),
+    ]
+    if jobs != 1:
+        lines.append('per-stage timings cover the main process only')
+    lines.append('%-36s %10s %10s %10s' % (
+        'stage', 'calls', 'total s', 'avg us'
+    ))
+    for stage, counter in stats.snapshot().items():
+        lines.append('%-36s %10d %10.3f %10.2f' % (
+            stage, counter['calls'], counter['total_seconds'],
+            counter['avg_us']
+        ))
+    click.echo('\n'.join(lines), err=True)
+
 
+def print_version(ctx, param, value):
+    if not value or ctx.resilient_parsing:
+        return
+    backend = get_backend()
+    click.echo('coinaddress %s (EC backend: %s)' % (__version__, backend.name))
+    ctx.exit()
 
-@click.command()
+
+def select_backend(ctx, param, value):
+    if value is not None and not ctx.resilient_parsing:
+        set_backend(value)
+
+
+def select_store(path, persist_nodes):
+    if path is None:
+        return None
+    return open_store(path, persist_nodes=persist_nodes)
+
+
+class DefaultGroup(click.Group):
+    """Group running ``default_command`` when no subcommand is given.
+
+    Keeps ``coinaddress NETWORK PATH`` working next to subcommands.
+    """
+    default_command = 'generate'
+
+    def parse_args(self, ctx, args):
+        if args and args[0] not in self.commands and args[0] not in (
+                '--help', '--version'):
+            args = [self.default_command] + list(args)
+        return super().parse_args(ctx, args)
+
+
+@click.group(cls=DefaultGroup)
+@click.option('--version', is_flag=True, expose_value=False, is_eager=True,
+              callback=print_version,
+              help="Show version and elliptic curve backend and exit")
+def main():
+    """Coin address generation CLI.
+
+    Without a command addresses of a single xpub are generated, see
+    `coinaddress generate --help`.
+    """
+
+
+backend_option = click.option(
+    '--backend', default=None, type=click.Choice(['auto'] + list(BACKENDS)),
+    envvar='COINADDRESS_BACKEND', is_eager=True, expose_value=False,
+    callback=select_backend,
+    help="Elliptic curve backend, native one is used when installed",
+)
+store_option = click.option(
+    '--store', 'store_path', default=None, type=click.Path(dir_okay=False),
+    envvar='COINADDRESS_STORE',
+    help="SQLite file keeping derived addresses across runs",
+)
+store_nodes_option = click.option(
+    '--store-nodes/--no-store-nodes', default=True, show_default=True,
+    help="Keep intermediate nodes (chain code and public key) in the store",
+)
+
+
+@main.command()
 @click.argument('network')
 @click.argument('path', default='0', type=str)
 @click.option('--xpub-file', default='-', type=click.File('r'))
@@ -13,10 +153,25 @@ from .networks import registry
 @click.option('--output', '-o', default='-', type=click.File('w'))
 @click.option('--number', '--num', '-n', default=1, type=int,
               help="Number of addresses to generate")
-def main(network, xpub, xpub_file, path, output, number=1):
-    """Coin address generation CLI.
+@click.option('--jobs', '-j', default=1, type=click.IntRange(0),
+              help="Number of worker processes, 0 to use all CPUs")
+@click.option('--format', 'output_format', type=click.Choice(GENERATE_FORMATS),
+              default='text', show_default=True, help="Output format")
+@backend_option
+@click.option('--version', is_flag=True, expose_value=False, is_eager=True,
+              callback=print_version,
+              help="Show version and elliptic curve backend and exit")
+@click.option('--stats', 'show_stats', is_flag=True,
+              help="Print throughput and per-stage timings to stderr")
+@store_option
+@store_nodes_option
+def generate(network, xpub, xpub_file, path, output, number=1, jobs=1,
+             output_format='text', show_stats=False, store_path=None,
+             store_nodes=True):
+    """Generate one or multiple coin addresses from xpub.
 
-    You can generate one or multiple coin addresses from xpub.
+    The command name can be omitted: `coinaddress bitcoin 0` is the same as
+    `coinaddress generate bitcoin 0`.
 
     Supported NETWORK list:
 
@@ -46,21 +201,162 @@ def main(network, xpub, xpub_file, path, output, number=1):
     xpub can be passed with `--xpub` option but you should avoid this and prefer
     read from file for security reasons.
 
+    Use `--jobs` to spread generation across multiple processes, addresses
+    are still written in index order:
+
+        cat xpub.txt | coinaddress bitcoin 0 -n 1000000 -j 8
+
+    `--format` writes a single address per line (`text`), JSON lines or CSV
+    rows with `index`, `path` and `address`, or `binary`: a header followed
+    by raw 20 bytes payloads (hash160 or account id) skipping the address
+    encoding, see `coinaddress.payloads` module for the layout.
+
     """
     if xpub is None:
         xpub = xpub_file.readline().strip()
+    store = select_store(store_path, store_nodes)
+    if show_stats:
+        stats.reset()
+        stats.enable()
+    started = time.perf_counter()
+    try:
+        count = _generate(
+            network, xpub, path, output, number, jobs, output_format
+        )
+    finally:
+        # Instrumentation patches network classes for the whole process
+        if show_stats:
+            stats.disable()
+        if store is not None:
+            set_store(None)
+            store.close()
+    if show_stats:
+        print_stats(count, time.perf_counter() - started, jobs)
+    return 0
+
+
+def _generate(network, xpub, path, output, number, jobs, output_format):
     net = registry.get(network)
+    if net is None:
+        raise click.BadParameter(
+            "Unknown network %s" % network, param_hint='NETWORK'
+        )
     path_parts = path.split('/')
     last_index = int(path_parts[-1])
     prefix = '/'.join(path_parts[:-1])
-    for i in range(last_index, last_index + number):
-        index_path = f'{i}'
-        if prefix:
-            index_path = f'{prefix}/{i}'
-        result = net.get_address(xpub=xpub, path=index_path)
-        output.write(result)
-        output.write('\n')
-    return 0
+    if output_format == 'binary':
+        output.flush()
+        output = getattr(output, 'buffer', output)
+        count = write_payloads(
+            output, net.name, prefix, last_index, number, generate_payloads(
+                network, xpub, prefix=prefix, start=last_index, count=number,
+                jobs=jobs or None
+            )
+        )
+    else:
+        if jobs == 1:
+            pairs = net.iter_addresses(
+                xpub=xpub, prefix=prefix, start=last_index,
+                stop=last_index + number
+            )
+        else:
+            pairs = enumerate(generate_addresses(
+                network, xpub, prefix=prefix, start=last_index, count=number,
+                jobs=jobs or None
+            ), last_index)
+        if output_format == 'text':
+            count = write_lines(output, (address for _, address in pairs))
+        else:
+            count = write_rows(output, output_format, prefix, pairs)
+    output.flush()
+    return count
+
+
+@main.command('jobs')
+@click.argument('jobs_file', default='-', type=click.File('r'))
+@click.option('--input-format', type=click.Choice(INPUT_FORMATS),
+              default=None, help="Input format, detected by default")
+@click.option('--output', '-o', default='-', type=click.File('w'))
+@click.option('--format', 'output_format', type=click.Choice(OUTPUT_FORMATS),
+              default='ndjson', show_default=True, help="Output format")
+@click.option('--jobs', '-j', 'workers', default=1, type=click.IntRange(0),
+              help="Number of worker processes, 0 to use all CPUs")
+@backend_option
+@store_option
+@store_nodes_option
+def jobs_command(jobs_file, input_format, output, output_format, workers=1,
+                 store_path=None, store_nodes=True):
+    """Generate addresses of many xpubs listed in JOBS_FILE.
+
+    JOBS_FILE is CSV with a header row or JSON lines with `network`, `xpub`,
+    `path` (`0` by default), `count` (1 by default) and optional `id`
+    fields:
+
+        {"id": "shop-1", "network": "BTC", "xpub": "xpub...", "path": "0/0", "count": 100}
+
+    Every output row is tagged with the job number (counting from 1) and id.
+    Failing jobs are reported with an `error` field and don't stop others;
+    the exit code is 1 if any job failed.
+    """
+    try:
+        job_list = read_jobs(jobs_file, input_format)
+        store = select_store(store_path, store_nodes)
+        try:
+            written, failed = write_results(
+                output, run_jobs(job_list, workers=workers), output_format
+            )
+        finally:
+            if store is not None:
+                set_store(None)
+                store.close()
+    except ValueError as e:
+        raise click.UsageError(str(e))
+    output.flush()
+    click.echo('%d addresses, %d failed jobs' % (written, failed), err=True)
+    if failed:
+        sys.exit(1)
+
+
+@main.command()
+@click.option('--host', default='127.0.0.1', show_default=True)
+@click.option('--port', '-p', default=8080, show_default=True,
+              type=click.IntRange(0, 65535))
+@click.option('--unix-socket', default=None, type=click.Path(dir_okay=False),
+              help="Listen on Unix socket instead of TCP port")
+@click.option('--cache-size', default=None, type=click.IntRange(0),
+              help="Number of decoded xpubs and nodes kept in memory")
+@backend_option
+@store_option
+@store_nodes_option
+def serve(host, port, unix_socket, cache_size=None, store_path=None,
+          store_nodes=True):
+    """Run local HTTP address service.
+
+    Endpoints: `GET /address`, `GET /addresses`, `POST /batch` and
+    `GET /metrics`, see `coinaddress.server` module for details:
+
+        curl 'http://127.0.0.1:8080/address?network=BTC&xpub=xpub...&path=0/0'
+    """
+    from .server import make_server
+
+    if cache_size is not None:
+        configure_cache(cache_size)
+    store = select_store(store_path, store_nodes)
+    try:
+        server = make_server(host, port, unix_socket)
+    except (OSError, ValueError) as e:
+        raise click.UsageError(str(e))
+    where = unix_socket or '%s:%d' % server.server_address[:2]
+    click.echo('Serving addresses on %s' % where, err=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if store is not None:
+            set_store(None)
+            store.close()
 
 
 if __name__ == "__main__":
@@ -1,6 +1,13 @@
 """Main module."""
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from .keys import DEFAULT_CHUNK_SIZE
 from .networks import registry
-from .networks.base import BaseNetwork
+from .networks.base import BaseNetwork, XpubLoadResult
+from .scan import (
+    DEFAULT_CHAINS, DEFAULT_GAP_LIMIT, DEFAULT_SCAN_CHUNK_SIZE, ChainScan,
+    GapScanner, Predicate,
+)
 
 
 def get_network(name: str) -> BaseNetwork:
@@ -12,3 +19,51 @@ def address_from_xpub(network: str, xpub: str, path: str = '0') -> str:
     """
     net = get_network(network)
     return net.get_address(xpub=xpub, path=path)
+
+
+def addresses_from_xpub(network: str, xpub: str, prefix: str = '',
+                        start: int = 0, count: int = 1,
+                        chunk_size: int = DEFAULT_CHUNK_SIZE) -> List[str]:
+    """Get ``count`` sequential addresses derived from xpub under ``prefix``.
+    """
+    net = get_network(network)
+    return net.get_addresses(
+        xpub=xpub, prefix=prefix, start=start, count=count,
+        chunk_size=chunk_size
+    )
+
+
+def iter_addresses_from_xpub(network: str, xpub: str, prefix: str = '',
+                             start: int = 0, stop: Optional[int] = None,
+                             chunk_size: int = DEFAULT_CHUNK_SIZE
+                             ) -> Iterator[Tuple[int, str]]:
+    """Lazily yield ``(index, address)`` pairs derived from xpub.
+
+    Without ``stop`` addresses are yielded forever.
+    """
+    net = get_network(network)
+    return net.iter_addresses(
+        xpub=xpub, prefix=prefix, start=start, stop=stop,
+        chunk_size=chunk_size
+    )
+
+
+def load_xpubs(network: str, xpubs: Iterable[str]) -> XpubLoadResult:
+    """Decode many xpubs at once, reporting invalid ones instead of raising.
+    """
+    net = get_network(network)
+    return net.load_xpubs(xpubs)
+
+
+def scan_xpub(network: str, xpub: str, is_used: Predicate,
+              chains: Sequence[str] = DEFAULT_CHAINS,
+              gap_limit: int = DEFAULT_GAP_LIMIT,
+              chunk_size: int = DEFAULT_SCAN_CHUNK_SIZE
+              ) -> Dict[str, ChainScan]:
+    """Find used addresses of xpub chains with the gap limit rule.
+
+    ``is_used`` is called with a list of addresses at once and returns
+    a flag for each of them.
+    """
+    net = get_network(network)
+    return GapScanner(net, xpub, is_used, gap_limit, chunk_size).scan(chains)
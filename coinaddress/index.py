@@ -0,0 +1,262 @@
+"""On-disk reverse index from address to the xpub and path it came from.
+
+The index file holds fixed size records sorted by the raw 20 bytes address
+payload (hash160, or Ethereum account), so lookups binary search a read-only
+``mmap`` of the file and never load it into memory. Layout::
+
+    header     magic, key size, record size, record count, metadata offset
+    records    key (20 bytes), source id (uint32), child index (uint32)
+    metadata   JSON list of sources: network, xpub, prefix and count
+
+A source is one ``(network, xpub, prefix)`` triple, records refer to it by
+position. Addresses are staged in memory by :meth:`AddressIndex.add` and
+:meth:`AddressIndex.extend` and become visible to lookups after
+:meth:`AddressIndex.flush`, which merges them with the existing records into
+a new file and atomically replaces the old one. Other processes see the new
+records after reopening the index.
+
+Unlike :mod:`coinaddress.store`, which keys entries by an xpub fingerprint,
+the metadata holds full xpub strings in plain text, so the index file is as
+sensitive as the xpubs themselves.
+"""
+import heapq
+import json
+import mmap
+import os
+import struct
+import tempfile
+from collections import namedtuple
+
+from .networks import registry
+
+MAGIC = b'CAINDEX1'
+HEADER = struct.Struct('<8sIIQQ')
+#: Big-endian so records sort by key, source and index as plain bytes.
+RECORD = struct.Struct('>20sII')
+KEY_SIZE = 20
+
+#: Addresses derived past the requested count, see :meth:`AddressIndex.add`.
+DEFAULT_GAP = 20
+
+_WRITE_BATCH = 8192
+
+#: Result of :meth:`AddressIndex.lookup`.
+IndexMatch = namedtuple('IndexMatch', ['network', 'xpub', 'path', 'index'])
+
+
+def _get_network(name):
+    net = registry.get(name)
+    if net is None:
+        raise ValueError("Unknown network %s" % name)
+    return net
+
+
+class AddressIndex:
+    """Reverse address index stored in ``path``.
+
+    The file is created on the first :meth:`flush` if it doesn't exist.
+    Use as a context manager to flush and close it on exit.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.sources = []
+        self._pending = []
+        self._dirty = False
+        self._file = None
+        self._mmap = None
+        self._count = 0
+        if os.path.exists(path):
+            self._open()
+
+    def _open(self):
+        self._file = open(self.path, 'rb')
+        header = self._file.read(HEADER.size)
+        if len(header) != HEADER.size:
+            self.close()
+            raise ValueError("Invalid index file %s" % self.path)
+        magic, key_size, record_size, count, meta_offset = HEADER.unpack(
+            header
+        )
+        if (magic != MAGIC or key_size != KEY_SIZE or
+                record_size != RECORD.size):
+            self.close()
+            raise ValueError("Invalid index file %s" % self.path)
+        self._file.seek(meta_offset)
+        self.sources = json.loads(self._file.read().decode('utf-8'))
+        self._count = count
+        if count:
+            self._mmap = mmap.mmap(
+                self._file.fileno(), 0, access=mmap.ACCESS_READ
+            )
+
+    def close(self):
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            if exc_type is None:
+                self.flush()
+        finally:
+            self.close()
+
+    def __len__(self):
+        """Number of flushed records."""
+        return self._count
+
+    def _find_source(self, network, xpub, prefix):
+        for source_id, source in enumerate(self.sources):
+            if (source['network'] == network and source['xpub'] == xpub and
+                    source['prefix'] == prefix):
+                return source_id
+        return None
+
+    def add(self, network: str, xpub: str, prefix='', count=1,
+            gap=DEFAULT_GAP) -> int:
+        """Index the first ``count`` addresses and ``gap`` more of xpub.
+
+        Already indexed sources are extended up to ``count + gap`` if they
+        have fewer addresses. Returns number of indexed addresses.
+        """
+        net = _get_network(network)
+        source_id = self._find_source(net.name, xpub, prefix)
+        if source_id is None:
+            net.get_node(xpub, prefix)
+            source_id = len(self.sources)
+            self.sources.append({
+                'network': net.name, 'xpub': xpub, 'prefix': prefix,
+                'count': 0,
+            })
+            self._dirty = True
+        indexed = self.sources[source_id]['count']
+        if indexed < count + gap:
+            self._derive(net, source_id, indexed, count + gap)
+        return self.sources[source_id]['count']
+
+    def extend(self, network: str, xpub: str, prefix='',
+               count=DEFAULT_GAP) -> int:
+        """Index ``count`` more addresses of already indexed xpub."""
+        net = _get_network(network)
+        source_id = self._find_source(net.name, xpub, prefix)
+        if source_id is None:
+            raise ValueError("%s/%s is not indexed" % (xpub, prefix))
+        indexed = self.sources[source_id]['count']
+        self._derive(net, source_id, indexed, indexed + count)
+        return self.sources[source_id]['count']
+
+    def _derive(self, net, source_id, start, stop):
+        source = self.sources[source_id]
+        node = net.get_node(source['xpub'], source['prefix'])
+        pack = RECORD.pack
+        public_key_hash = net.public_key_hash
+        self._pending.extend(
+            pack(public_key_hash(child), source_id, index)
+            for index, child in enumerate(node.iter_children(start, stop),
+                                          start)
+        )
+        source['count'] = stop
+        self._dirty = True
+
+    def _records(self):
+        mm = self._mmap
+        size = RECORD.size
+        offset = HEADER.size
+        for _ in range(self._count):
+            yield mm[offset:offset + size]
+            offset += size
+
+    def flush(self):
+        """Merge staged records into the file and replace it atomically."""
+        if not self._dirty:
+            return
+        self._pending.sort()
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(b'\0' * HEADER.size)
+                count = 0
+                batch = []
+                for record in heapq.merge(self._records(), self._pending):
+                    batch.append(record)
+                    if len(batch) >= _WRITE_BATCH:
+                        f.write(b''.join(batch))
+                        count += len(batch)
+                        batch = []
+                f.write(b''.join(batch))
+                count += len(batch)
+                meta_offset = f.tell()
+                f.write(json.dumps(self.sources).encode('utf-8'))
+                f.seek(0)
+                f.write(HEADER.pack(
+                    MAGIC, KEY_SIZE, RECORD.size, count, meta_offset
+                ))
+                f.flush()
+                os.fsync(f.fileno())
+            self.close()
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        self._pending = []
+        self._dirty = False
+        self._open()
+
+    def lookup(self, network: str, address: str):
+        """Find where address came from, ``None`` if it isn't indexed.
+
+        Raises ``ValueError`` if address isn't valid for the network.
+        """
+        net = _get_network(network)
+        return self.lookup_payload(net.name, net.decode_address(address))
+
+    def lookup_payload(self, network: str, payload: bytes):
+        """Find raw address payload, see :meth:`lookup`."""
+        name = _get_network(network).name
+        mm = self._mmap
+        if mm is None:
+            return None
+        size = RECORD.size
+        base = HEADER.size
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            offset = base + mid * size
+            if mm[offset:offset + KEY_SIZE] < payload:
+                lo = mid + 1
+            else:
+                hi = mid
+        while lo < self._count:
+            offset = base + lo * size
+            key, source_id, index = RECORD.unpack_from(mm, offset)
+            if key != payload:
+                break
+            source = self.sources[source_id]
+            if source['network'] == name:
+                prefix = source['prefix']
+                path = '%s/%d' % (prefix, index) if prefix else str(index)
+                return IndexMatch(name, source['xpub'], path, index)
+            lo += 1
+        return None
+
+
+def build_index(path, network: str, xpubs, prefix='', count=1,
+                gap=DEFAULT_GAP) -> AddressIndex:
+    """Add many xpubs of the network to the index in ``path`` and flush it."""
+    index = AddressIndex(path)
+    try:
+        for xpub in xpubs:
+            index.add(network, xpub, prefix, count, gap)
+        index.flush()
+    except BaseException:
+        index.close()
+        raise
+    return index
@@ -0,0 +1,257 @@
+"""Bulk jobs: many ``(network, xpub, path, count)`` ranges in one run.
+
+Jobs are read from CSV (with a header row) or JSON lines with ``network``,
+``xpub``, ``path`` (``0`` by default), ``count`` (1 by default) and an
+optional ``id`` passed through to the results. Results are written as NDJSON
+or CSV rows tagged with the job number and id. A failing job is reported
+with its error and doesn't stop the others.
+"""
+import csv
+import json
+import os
+from collections import deque, namedtuple
+from typing import IO, Iterable, Iterator, Optional
+
+from .backends import get_backend
+from .networks import registry
+from .parallel import DEFAULT_BATCH_SIZE, _derive_batch
+from .store import get_store
+
+INPUT_FORMATS = ('csv', 'jsonl')
+OUTPUT_FORMATS = ('ndjson', 'csv')
+CSV_FIELDS = ('job', 'id', 'network', 'path', 'address', 'error')
+#: Number of rows joined into a single write to the output.
+WRITE_CHUNK_SIZE = 8192
+
+#: Single job, ``number`` counts from 1 in input order. Invalid input rows
+#: are jobs with ``error`` set.
+Job = namedtuple('Job', [
+    'number', 'id', 'network', 'xpub', 'path', 'prefix', 'start', 'count',
+    'error',
+])
+
+#: Result of a job or a part of it: ``(path, address)`` pairs or ``error``.
+JobResult = namedtuple('JobResult', ['job', 'addresses', 'error'])
+
+
+def parse_job(number: int, row) -> Job:
+    """Validate job fields of a mapping, see the module description."""
+    if not isinstance(row, dict):
+        return Job(number, None, None, None, None, '', 0, 0,
+                   "Job must be an object")
+    job_id = row.get('id')
+    if job_id == '':
+        job_id = None
+    network = row.get('network') or None
+    xpub = row.get('xpub') or None
+    path = str(row.get('path') or '0')
+    prefix, _, index = path.rpartition('/')
+    count = row.get('count')
+    if count in (None, ''):
+        # Missing JSON field or empty CSV cell
+        count = 1
+    try:
+        count = int(count)
+    except (TypeError, ValueError):
+        count = 0
+    error = None
+    if network is None or xpub is None:
+        error = "network and xpub are required"
+    elif registry.get(network) is None:
+        error = "Unknown network %s" % network
+    elif not index.isdigit():
+        error = "Invalid path %s" % path
+    elif count < 1:
+        error = "Invalid count %s" % row.get('count')
+    start = int(index) if index.isdigit() else 0
+    return Job(
+        number, job_id, network, xpub, path, prefix, start, count, error
+    )
+
+
+def read_jobs(stream: IO[str], input_format: Optional[str] = None
+              ) -> Iterator[Job]:
+    """Read jobs from CSV or JSON lines, detected from content by default."""
+    if input_format is None:
+        first = stream.readline()
+        input_format = 'jsonl' if first.lstrip().startswith('{') else 'csv'
+        lines = _chain(first, stream)
+    elif input_format in INPUT_FORMATS:
+        lines = stream
+    else:
+        raise ValueError("Unknown input format %s" % input_format)
+
+    if input_format == 'csv':
+        reader = csv.DictReader(lines)
+        if reader.fieldnames is None:
+            return
+        missing = {'network', 'xpub'} - set(reader.fieldnames)
+        if missing:
+            raise ValueError(
+                "Missing CSV columns: %s" % ', '.join(sorted(missing))
+            )
+        for number, row in enumerate(reader, 1):
+            yield parse_job(number, row)
+        return
+
+    number = 0
+    for line in lines:
+        if not line.strip():
+            continue
+        number += 1
+        try:
+            row = json.loads(line)
+        except ValueError as e:
+            yield Job(number, None, None, None, None, '', 0, 0,
+                      "Invalid JSON: %s" % e)
+            continue
+        yield parse_job(number, row)
+
+
+def _chain(first, lines):
+    yield first
+    yield from lines
+
+
+def _path(job: Job, index: int) -> str:
+    return '%s/%d' % (job.prefix, index) if job.prefix else str(index)
+
+
+def _tasks(jobs: Iterable[Job], batch_size: int):
+    """Split jobs into ``(job, start, count)`` batches."""
+    for job in jobs:
+        if job.error is not None:
+            yield job, job.start, 0
+            continue
+        stop = job.start + job.count
+        for start in range(job.start, stop, batch_size):
+            yield job, start, min(batch_size, stop - start)
+
+
+def _result(job, start, addresses=None, error=None) -> JobResult:
+    if error is not None:
+        return JobResult(job, [], error)
+    return JobResult(job, [
+        (_path(job, index), address)
+        for index, address in enumerate(addresses, start)
+    ], None)
+
+
+def run_jobs(jobs: Iterable[Job], workers: int = 1,
+             batch_size: int = DEFAULT_BATCH_SIZE) -> Iterator[JobResult]:
+    """Run jobs yielding results in job order.
+
+    Large jobs are split into batches of ``batch_size`` addresses, so a job
+    may produce several results. With more than one worker batches are spread
+    across a process pool, at most ``2 * workers`` of them in flight. Decoded
+    xpubs are kept in the node cache of every process, so repeated xpubs are
+    decoded once. Only the first error of a job is reported.
+    """
+    if batch_size < 1:
+        raise ValueError("batch_size can't be less than 1")
+    workers = workers or os.cpu_count() or 1
+    failed = set()
+
+    def report(job, start, addresses=None, error=None):
+        if job.number in failed:
+            return None
+        if error is not None:
+            failed.add(job.number)
+        return _result(job, start, addresses, error)
+
+    tasks = _tasks(jobs, batch_size)
+    if workers == 1:
+        for job, start, count in tasks:
+            if job.error is not None:
+                yield report(job, start, error=job.error)
+                continue
+            if job.number in failed:
+                continue
+            try:
+                addresses = _derive_batch(
+                    job.network, job.xpub, job.prefix, start, count
+                )
+            except Exception as e:
+                result = report(job, start, error=str(e) or repr(e))
+            else:
+                result = report(job, start, addresses)
+            if result is not None:
+                yield result
+        return
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    backend = get_backend().name
+    store = get_store()
+    pending = deque()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        def submit():
+            task = next(tasks, None)
+            if task is None:
+                return
+            job, start, count = task
+            future = None
+            if job.error is None:
+                future = executor.submit(
+                    _derive_batch, job.network, job.xpub, job.prefix, start,
+                    count, backend, store
+                )
+            pending.append((job, start, future))
+
+        for _ in range(2 * workers):
+            submit()
+        while pending:
+            job, start, future = pending.popleft()
+            submit()
+            if future is None:
+                result = report(job, start, error=job.error)
+            else:
+                try:
+                    addresses = future.result()
+                except Exception as e:
+                    result = report(job, start, error=str(e) or repr(e))
+                else:
+                    result = report(job, start, addresses)
+            if result is not None:
+                yield result
+
+
+def _rows(results: Iterable[JobResult]):
+    for result in results:
+        job = result.job
+        tag = {'job': job.number, 'id': job.id, 'network': job.network}
+        if result.error is not None:
+            row = dict(tag, path=job.path, error=result.error)
+            yield row, False
+            continue
+        for path, address in result.addresses:
+            yield dict(tag, path=path, address=address), True
+
+
+def write_results(output: IO[str], results: Iterable[JobResult],
+                  output_format: str = 'ndjson'):
+    """Write results, returns ``(addresses, failed jobs)`` counts."""
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError("Unknown output format %s" % output_format)
+    written = failed = 0
+    if output_format == 'csv':
+        writer = csv.DictWriter(output, CSV_FIELDS, lineterminator='\n')
+        writer.writeheader()
+        write = writer.writerows
+    else:
+        dumps = json.dumps
+
+        def write(rows):
+            output.write(''.join([dumps(row) + '\n' for row in rows]))
+    chunk = []
+    for row, ok in _rows(results):
+        if ok:
+            written += 1
+        else:
+            failed += 1
+        chunk.append(row)
+        if len(chunk) >= WRITE_CHUNK_SIZE:
+            write(chunk)
+            chunk = []
+    write(chunk)
+    return written, failed
@@ -1,18 +1,82 @@
 import hashlib
 import hmac
-from binascii import hexlify, unhexlify
+from binascii import hexlify
 
-from ecdsa.curves import SECP256k1
-from ecdsa.ecdsa import Public_key as ECDSAPublicKey
+from . import secp256k1
+from .backends import get_backend
 
-from .utils import int_to_hex, create_verifying_key
+try:
+    from hmac import digest as hmac_digest
+except ImportError:  # pragma: no cover, Python < 3.7
+    def hmac_digest(key, msg, digest):
+        return hmac.new(key, msg, digest).digest()
+
+#: Trust points of derived nodes: only the root xpub point is validated.
+#: Children of a valid point can't leave the group, so re-validating them
+#: only repeats the curve and order checks.
+TRUST_DERIVED_KEYS = True
+
+#: Number of sibling nodes normalized together by bulk derivation.
+DEFAULT_CHUNK_SIZE = 1024
+
+#: First hardened child index, public keys derive only the ones below it.
+HARDENED_INDEX = 2 ** 31
+
+
+def trust_derived_keys(enabled: bool = True):
+    """Switch validation of derived child points off or on."""
+    global TRUST_DERIVED_KEYS
+    TRUST_DERIVED_KEYS = enabled
+
+
+def normalize(nodes):
+    """Normalize points of many nodes at once.
+
+    The pure Python backend converts them to affine with a single inversion.
+    """
+    if not nodes:
+        return
+    backend = nodes[0].backend
+    points = backend.normalize_many([node._point for node in nodes])
+    for node, point in zip(nodes, points):
+        node._point = point
 
 
 class PublicKey:
+    """Extended public key node.
+
+    The public point is an opaque object of the elliptic curve ``backend``
+    (see :mod:`coinaddress.backends`). The pure Python backend keeps it as
+    plain integers in Jacobian coordinates and converts it to affine only
+    when the key is serialized. ``ecdsa`` objects are built only on explicit
+    :attr:`verifying_key` access.
 
-    def __init__(self, chain_code, verifying_key):
-        self.verifying_key = verifying_key
+    ``trusted`` nodes are derived from a validated parent and are never
+    validated again.
+
+    ``chain_code`` is raw 32 bytes. Compressed and uncompressed
+    serializations are computed once and memoized.
+    """
+
+    __slots__ = (
+        'chain_code', 'trusted', 'backend', '_point', '_verifying_key',
+        '_compressed', '_uncompressed',
+    )
+
+    def __init__(self, chain_code: bytes, verifying_key=None, point=None,
+                 trusted=False, backend=None):
         self.chain_code = chain_code
+        self.trusted = trusted
+        self.backend = backend = backend or get_backend()
+        self._compressed = None
+        self._uncompressed = None
+        if point is None:
+            if verifying_key is None:
+                raise ValueError("Either verifying_key or point is required")
+            vk_point = verifying_key.pubkey.point
+            point = backend.from_coordinates(vk_point.x(), vk_point.y())
+        self._point = point
+        self._verifying_key = verifying_key
 
     def get_child_from_path(self, path: str):
         parts = path.split('/')
@@ -26,6 +90,37 @@ class PublicKey:
             node = node.get_child(part_index)
         return node
 
+    def get_children(self, start: int, count: int,
+                     chunk_size: int = DEFAULT_CHUNK_SIZE):
+        """Derive ``count`` sequential children starting from ``start``."""
+        return list(self.iter_children(start, start + count, chunk_size))
+
+    def iter_children(self, start: int, stop=None,
+                      chunk_size: int = DEFAULT_CHUNK_SIZE):
+        """Yield sequential children from ``start`` up to ``stop``.
+
+        Children are derived in chunks of ``chunk_size`` nodes and every
+        chunk is converted to affine coordinates with a single modular
+        inversion, see :func:`~coinaddress.secp256k1.batch_to_affine`.
+        ``chunk_size`` also bounds the number of nodes held in memory.
+        Without ``stop`` children are yielded forever.
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size can't be less than 1")
+        if stop is not None and stop > HARDENED_INDEX:
+            raise ValueError(
+                "Index can't be greater than %d" % (HARDENED_INDEX - 1)
+            )
+        index = start
+        while stop is None or index < stop:
+            end = index + chunk_size
+            if stop is not None:
+                end = min(end, stop)
+            children = [self.get_child(i) for i in range(index, end)]
+            normalize(children)
+            yield from children
+            index = end
+
     def get_child(self, child_number):
         """Derive a child key.
 
@@ -34,53 +129,88 @@ class PublicKey:
 
         This derivation is fully described at
         https://github.com/bitcoin/bips/blob/master/bip-0032.mediawiki#child-key-derivation-functions  # noqa
-        """
-
-        child_number_hex = int_to_hex(child_number, 8)
 
-        data = self.hex()
+        Hardened children (``child_number >= 2 ** 31``) need the private
+        key and raise :class:`ValueError`.
+        """
+        if not 0 <= child_number < HARDENED_INDEX:
+            raise ValueError(
+                "Index must be between 0 and %d" % (HARDENED_INDEX - 1)
+            )
 
-        data += child_number_hex
+        data = self.compressed + child_number.to_bytes(4, 'big')
 
         # Compute a 64 Byte `i_full` that is the HMAC-SHA512, using
         # self.chain_code as the seed, and data as the message.
-        i_full = hmac.new(
-            unhexlify(self.chain_code),
-            msg=unhexlify(data),
-            digestmod=hashlib.sha512
-        ).digest()
-        # split `i_full` into its 32 Byte components.
-        i_left, i_right = i_full[:32], i_full[32:]
-
-        c_i = hexlify(i_right)
+        i_full = hmac_digest(self.chain_code, data, hashlib.sha512)
+        # split `i_full` into its 32 Byte components,
+        # `i_right` is the child's chain code
+        c_i = i_full[32:]
 
         # only use public information for this derivation
-        g = SECP256k1.generator
-        i_left_int = int(hexlify(i_left), 16)
-        point = (
-            ECDSAPublicKey(g, g * i_left_int).point +
-            self.verifying_key.pubkey.point
-        )
-        # `i_right` is the child's chain code
+        i_left_int = int.from_bytes(i_full[:32], 'big')
+        point = self.backend.tweak_add(self._point, i_left_int)
 
         child = self.__class__(
-            chain_code=c_i,
-            verifying_key=create_verifying_key(point.x(), point.y())
+            chain_code=c_i, point=point, trusted=TRUST_DERIVED_KEYS,
+            backend=self.backend
         )
+        if not child.trusted:
+            child.validate()
 
         return child
 
+    def _normalized(self):
+        self._point = point = self.backend.normalize(self._point)
+        return point
+
+    @property
+    def affine(self):
+        """Affine ``(x, y)`` coordinates, normalized once on first access."""
+        return self.backend.coordinates(self._normalized())
+
+    def validate(self):
+        """Check that the point is on secp256k1.
+
+        secp256k1 has cofactor 1, so any finite point on the curve has the
+        group order and no separate order check is needed.
+        """
+        x, y = self.affine
+        if not secp256k1.is_on_curve(x, y):
+            raise ValueError("Point is not on secp256k1 curve")
+
+    @property
+    def verifying_key(self):
+        if self._verifying_key is None:
+            # ecdsa is only needed by the legacy verifying key interface
+            from .utils import create_verifying_key
+            self._verifying_key = create_verifying_key(
+                *self.affine, validate=not self.trusted
+            )
+        return self._verifying_key
+
     @property
     def point(self):
         return self.verifying_key.pubkey.point
 
+    @property
+    def compressed(self) -> bytes:
+        """33 bytes SEC1 compressed public key."""
+        if self._compressed is None:
+            self._compressed = self.backend.serialize(self._normalized())
+        return self._compressed
+
+    @property
+    def uncompressed(self) -> bytes:
+        """65 bytes SEC1 uncompressed public key."""
+        if self._uncompressed is None:
+            self._uncompressed = self.backend.serialize(
+                self._normalized(), compressed=False
+            )
+        return self._uncompressed
+
     def hex(self) -> bytes:
-        x, y = self.point.x(), self.point.y()
-        parity = 2 + (y & 1)  # 0x02 even, 0x03 odd
-        return int_to_hex(parity, 2) + int_to_hex(x, 64)
+        return hexlify(self.compressed)
 
     def __bytes__(self) -> bytes:
-        nbytes = self.verifying_key.curve.baselen
-        x = self.point.x().to_bytes(nbytes, 'big')
-        y = self.point.y().to_bytes(nbytes, 'big')
-        return bytes([0x04]) + x + y
+        return self.uncompressed
@@ -1,10 +1,40 @@
+import sys
+
 from .registry import registry
 
-from .bitcoin import Bitcoin
-from .bitcoin_cash import BitcoinCash
-from .ethereum import Ethereum
-from .litecoin import Litecoin
-from .ripple import Ripple
+registry.register_lazy('coinaddress.networks.bitcoin', 'bitcoin', 'BTC')
+registry.register_lazy('coinaddress.networks.bitcoin_cash', 'bitcoin_cash',
+                       'BCH')
+registry.register_lazy('coinaddress.networks.ethereum', 'ethereum', 'ETH')
+registry.register_lazy('coinaddress.networks.litecoin', 'litecoin', 'LTC')
+registry.register_lazy('coinaddress.networks.ripple', 'ripple', 'XRP')
+
+if sys.version_info >= (3, 7):
+    from importlib import import_module
+
+    # Network classes are imported on first access
+    _CLASSES = {
+        'Bitcoin': '.bitcoin',
+        'BitcoinCash': '.bitcoin_cash',
+        'Ethereum': '.ethereum',
+        'Litecoin': '.litecoin',
+        'Ripple': '.ripple',
+    }
+
+    def __getattr__(name):
+        module = _CLASSES.get(name)
+        if module is None:
+            raise AttributeError(
+                "module %r has no attribute %r" % (__name__, name)
+            )
+        return getattr(import_module(module, __name__), name)
+else:
+    # Module __getattr__ needs Python 3.7, older ones import classes eagerly
+    from .bitcoin import Bitcoin
+    from .bitcoin_cash import BitcoinCash
+    from .ethereum import Ethereum
+    from .litecoin import Litecoin
+    from .ripple import Ripple
 
 __all__ = [
     'registry',
@@ -1,51 +1,247 @@
 import hashlib
-from binascii import unhexlify, hexlify
+from collections import namedtuple
+from itertools import islice
+from typing import Iterable, List
 
-import base58
+from coinaddress.cache import node_cache
+from coinaddress import base58, bulk
+from coinaddress.store import get_store
+from coinaddress.backends import get_backend
+from coinaddress.keys import DEFAULT_CHUNK_SIZE, PublicKey
 
-from sha3 import keccak_256
-
-from coinaddress.keys import PublicKey
-from coinaddress.utils import verifying_key_from_hex
+#: Result of :meth:`BaseNetwork.load_xpubs`: ``loaded`` maps xpub to its
+#: decoded node and ``invalid`` maps xpub to the error message.
+XpubLoadResult = namedtuple('XpubLoadResult', ['loaded', 'invalid'])
 
 
 def sha3(seed):
+    from sha3 import keccak_256
     return keccak_256(seed).digest()
 
 
 class BaseNetwork:
+    #: Canonical registry name, set on registration.
+    name = None
     pubkey_address_prefix = 0x00
 
+    @property
+    def store_key(self) -> str:
+        """Network name in the persistent store, see :mod:`coinaddress.store`."""
+        return self.name
+
     def get_address(self, xpub: str, path='0'):
-        node = self.deserialize_xpub(xpub)
-        child_node = node.get_child_from_path(path)
+        store = get_store()
+        if store is not None and path.rpartition('/')[2].isdigit():
+            return store.get_address(
+                self.store_key, xpub, path,
+                lambda: self._derive_address(xpub, path)
+            )
+        return self._derive_address(xpub, path)
+
+    def _derive_address(self, xpub: str, path: str):
+        prefix, _, index = path.rpartition('/')
+        node = self.get_node(xpub, prefix)
+        child_node = node.get_child_from_path(index)
         return self.public_key_to_address(child_node)
 
+    def get_addresses(self, xpub: str, prefix='', start=0, count=1,
+                      chunk_size=DEFAULT_CHUNK_SIZE):
+        """Get ``count`` sequential addresses under ``prefix``.
+
+        The xpub is decoded and the ``prefix`` node is derived only once,
+        so every address costs a single leaf derivation. Leaves are derived
+        and normalized in chunks of ``chunk_size`` nodes.
+        """
+        return [
+            address for _, address in self.iter_addresses(
+                xpub, prefix, start, start + count, chunk_size
+            )
+        ]
+
+    def iter_addresses(self, xpub: str, prefix='', start=0, stop=None,
+                       chunk_size=DEFAULT_CHUNK_SIZE):
+        """Yield ``(index, address)`` pairs under ``prefix``.
+
+        Addresses are derived lazily from the cached ``prefix`` node starting
+        at ``start`` up to ``stop`` (forever without ``stop``). Every chunk of
+        ``chunk_size`` keys is hashed and encoded at once, see
+        :mod:`coinaddress.bulk`, so memory use is bounded by ``chunk_size``.
+        """
+        if start < 0:
+            raise ValueError("Index can't be less than 0")
+        node = self.get_node(xpub, prefix)
+        store = get_store()
+        if store is not None:
+            def derive(first, last):
+                return [
+                    address
+                    for payloads in self._payload_chunks(
+                        node, first, last, chunk_size
+                    )
+                    for address in self.encode_payloads(payloads)
+                ]
+            yield from store.iter_addresses(
+                self.store_key, xpub, prefix, start, stop, derive, chunk_size
+            )
+            return
+        index = start
+        for payloads in self._payload_chunks(node, start, stop, chunk_size):
+            for address in self.encode_payloads(payloads):
+                yield index, address
+                index += 1
+
+    def iter_payloads(self, xpub: str, prefix='', start=0, stop=None,
+                      chunk_size=DEFAULT_CHUNK_SIZE):
+        """Yield raw address payloads under ``prefix``.
+
+        Same as :meth:`iter_addresses` without encoding payloads into address
+        strings, see :meth:`hash_public_keys`. The persistent store holds
+        address strings only and is not used.
+        """
+        for payloads in self.iter_payload_chunks(
+                xpub, prefix, start, stop, chunk_size):
+            for i in range(0, len(payloads), bulk.PAYLOAD_SIZE):
+                yield payloads[i:i + bulk.PAYLOAD_SIZE]
+
+    def iter_payload_chunks(self, xpub: str, prefix='', start=0, stop=None,
+                            chunk_size=DEFAULT_CHUNK_SIZE):
+        """Yield contiguous buffers of raw payloads of ``chunk_size`` keys.
+
+        Buffers hold payloads of sequential indexes under ``prefix``, only
+        the last one may be shorter.
+        """
+        if start < 0:
+            raise ValueError("Index can't be less than 0")
+        node = self.get_node(xpub, prefix)
+        yield from self._payload_chunks(node, start, stop, chunk_size)
+
+    def _payload_chunks(self, node, start, stop, chunk_size):
+        children = node.iter_children(start, stop, chunk_size)
+        while True:
+            chunk = list(islice(children, chunk_size))
+            if not chunk:
+                return
+            yield self.hash_public_keys(self.public_keys(chunk))
+
+    def get_root(self, xpub: str):
+        """Get decoded xpub node, cached by ``(network, xpub)``."""
+        return node_cache.get_or_create(
+            (self.__class__, xpub), lambda: self.deserialize_xpub(xpub)
+        )
+
+    def get_node(self, xpub: str, path=''):
+        """Get node at ``path`` under xpub.
+
+        Every intermediate node is cached by ``(xpub, path prefix)``, so
+        repeated lookups under the same parent derive only the missing levels.
+        """
+        if not path:
+            return self.get_root(xpub)
+        key = (xpub, path)
+        node = node_cache.get(key)
+        if node is None:
+            store = get_store()
+            if store is not None:
+                node = store.get_node(
+                    xpub, path, lambda: self._derive_node(xpub, path)
+                )
+            else:
+                node = self._derive_node(xpub, path)
+            node_cache.put(key, node)
+        return node
+
+    def _derive_node(self, xpub: str, path: str):
+        parent_path, _, index = path.rpartition('/')
+        parent = self.get_node(xpub, parent_path)
+        return parent.get_child_from_path(index)
+
     def public_key_to_address(self, node):
-        key = unhexlify(node.hex())
-        # First get the hash160 of the key
+        return self.encode_address(self.public_key_hash(node))
+
+    def public_keys(self, nodes) -> bytes:
+        """Contiguous buffer of serialized public keys of nodes."""
+        return b''.join([node.compressed for node in nodes])
+
+    def hash_public_keys(self, keys: bytes) -> bytes:
+        """Raw address payloads of a buffer made by :meth:`public_keys`.
+
+        Bulk counterpart of :meth:`public_key_hash`.
+        """
+        return bulk.hash160(keys)
+
+    def encode_payloads(self, payloads: bytes) -> List[str]:
+        """Encode a buffer of 20 bytes payloads into address strings.
+
+        Bulk counterpart of :meth:`encode_address`.
+        """
+        return base58.bitcoin.encode_check_buffer(
+            payloads, bulk.PAYLOAD_SIZE, bytes([self.pubkey_address_prefix])
+        )
+
+    def public_key_hash(self, node) -> bytes:
+        """Get raw address payload of the node, hash160 of the public key."""
+        key = node.compressed
         rh = hashlib.new('ripemd160', hashlib.sha256(key).digest())
-        hash160_bytes = rh.digest()
+        return rh.digest()
+
+    def encode_address(self, payload: bytes) -> str:
+        """Encode raw address payload into the address string."""
         # Prepend the network address byte
-        network_hash160_bytes = \
-            bytes([self.pubkey_address_prefix]) + hash160_bytes
+        network_hash160_bytes = bytes([self.pubkey_address_prefix]) + payload
         # Return a base58 encoded address with a checksum
-        return base58.b58encode_check(network_hash160_bytes).decode()
+        return base58.bitcoin.encode_check(network_hash160_bytes)
+
+    def encode_addresses(self, payloads: Iterable[bytes]) -> List[str]:
+        """Encode many raw address payloads at once."""
+        prefix = bytes([self.pubkey_address_prefix])
+        return base58.bitcoin.encode_check_many(
+            prefix + payload for payload in payloads
+        )
+
+    def decode_address(self, address: str) -> bytes:
+        """Decode address string back into its raw payload.
+
+        Reverse of :meth:`encode_address`, raises ``ValueError`` on malformed
+        addresses and addresses of other networks.
+        """
+        data = base58.bitcoin.decode_check(address)
+        if len(data) != 21 or data[0] != self.pubkey_address_prefix:
+            raise ValueError("Invalid address %s" % address)
+        return data[1:]
 
     def deserialize_xpub(self, key: str):
         """Load the ExtendedBip32Key from a hex key.
         """
-        key = base58.b58decode_check(key.encode())
+        key = base58.bitcoin.decode_check(key)
+        if len(key) != 78:
+            raise ValueError("Invalid xpub length, got %s" % len(key))
         chain_code, key_data = key[13:45], key[45:]
 
         point_type = key_data[0]
+        backend = get_backend()
         if point_type in [2, 3, 4]:
             # Compressed public coordinates
-            verifying_key = verifying_key_from_hex(key_data)
+            point = backend.decode(key_data)
         else:
             raise ValueError("Invalid key_data prefix, got %s" % point_type)
 
         return PublicKey(
-            chain_code=hexlify(chain_code),
-            verifying_key=verifying_key,
+            chain_code=chain_code,
+            point=point,
+            backend=backend,
         )
+
+    def load_xpubs(self, xpubs: Iterable[str]) -> XpubLoadResult:
+        """Decode many xpubs at once and warm the node cache with them.
+
+        Invalid xpubs don't stop the load, they are reported in
+        ``invalid`` with the reason instead.
+        """
+        loaded = {}
+        invalid = {}
+        for xpub in xpubs:
+            try:
+                loaded[xpub] = self.get_root(xpub)
+            except ValueError as e:
+                invalid[xpub] = str(e)
+        return XpubLoadResult(loaded, invalid)
@@ -1,33 +1,60 @@
-from base58 import b58decode_check
+from functools import lru_cache
+from typing import Iterable, List
+
+from coinaddress import bulk
 
 from .base import BaseNetwork
 from .registry import registry
 
 CHARSET = 'qpzry9x8gf2tvdw0s3jn54khce6mua7l'
+#: Maps 5-bit values to CashAddr characters with ``bytes.translate``.
+CHARSET_TABLE = CHARSET.encode('ascii').ljust(256, b'\0')
+_INVALID = 0xff
+#: Maps CashAddr characters back to 5-bit values, ``0xff`` for invalid ones.
+DECODE_TABLE = bytes(
+    CHARSET.find(chr(char)) if chr(char) in CHARSET else _INVALID
+    for char in range(256)
+)
+
+#: Known network prefixes: mainnet, testnet and regtest.
+PREFIXES = ('bitcoincash', 'bchtest', 'bchreg')
+
+#: Version byte of P2PKH address with 160 bits hash.
+P2PKH_VERSION = 0
+
+GENERATOR = (
+    0x98f2bc8e61, 0x79b76d99e2, 0xf33e5fb3c4, 0xae2eabe2a8, 0x1e4f43e470,
+)
+
+
+def _polymod_table():
+    table = []
+    for top in range(32):
+        value = 0
+        for bit, generator in enumerate(GENERATOR):
+            if top >> bit & 1:
+                value ^= generator
+        table.append(value)
+    return tuple(table)
+
+
+#: XOR of generator values for each possible top 5 bits of checksum state.
+POLYMOD_TABLE = _polymod_table()
 
 
 def b32encode(inputs):
-    out = ''
-    for char_code in inputs:
-        out += CHARSET[char_code]
-    return out
+    return bytes(inputs).translate(CHARSET_TABLE).decode('ascii')
 
 
-def polymod(values):
-    chk = 1
-    generator = [
-        (0x01, 0x98f2bc8e61),
-        (0x02, 0x79b76d99e2),
-        (0x04, 0xf33e5fb3c4),
-        (0x08, 0xae2eabe2a8),
-        (0x10, 0x1e4f43e470)]
+def polymod_update(chk, values):
+    table = POLYMOD_TABLE
     for value in values:
-        top = chk >> 35
-        chk = ((chk & 0x07ffffffff) << 5) ^ value
-        for i in generator:
-            if top & i[0] != 0:
-                chk ^= i[1]
-    return chk ^ 1
+        chk = ((chk & 0x07ffffffff) << 5) ^ value ^ table[chk >> 35]
+    return chk
+
+
+def polymod(values):
+    return polymod_update(1, values) ^ 1
 
 
 def prefix_expand(prefix):
@@ -64,18 +91,133 @@ def convertbits(data, frombits, tobits, pad=True):
     return ret
 
 
-@registry.register('bitcoin_cash', 'BCH')
-class BitcoinCash(BaseNetwork):
-    pubkey_address_prefix = 0x1C
-
-    def public_key_to_address(self, public_key):
-        version_int = 0
-        prefix = 'bitcoincash'
+@lru_cache(maxsize=None)
+def prefix_state(prefix):
+    """Checksum state after the expanded prefix, shared by all addresses."""
+    return polymod_update(1, prefix_expand(prefix))
+
+
+def encode(prefix: str, version: int, payload: bytes) -> str:
+    """Encode CashAddr address straight from the version and hash bytes."""
+    data = bytes((version,)) + payload
+    bits = len(data) * 8
+    pad = -bits % 5
+    groups = (bits + pad) // 5
+    n = int.from_bytes(data, 'big') << pad
+    values = bytes(n >> 5 * i & 0x1f for i in range(groups - 1, -1, -1))
+    chk = polymod_update(prefix_state(prefix), values)
+    chk = polymod_update(chk, b'\0' * 8) ^ 1
+    checksum = bytes(chk >> 5 * i & 0x1f for i in range(7, -1, -1))
+    return prefix + ':' + (values + checksum).translate(
+        CHARSET_TABLE
+    ).decode('ascii')
+
+
+def encode_many(prefix: str, version: int,
+                payloads: Iterable[bytes]) -> List[str]:
+    return [encode(prefix, version, payload) for payload in payloads]
+
+
+def encode_buffer(prefix: str, version: int, payloads: bytes,
+                  size: int = bulk.PAYLOAD_SIZE) -> List[str]:
+    """Encode every ``size`` bytes payload of the buffer.
+
+    Checksums of large batches are computed with NumPy, see
+    :mod:`coinaddress.bulk`.
+    """
+    rows = bulk.split(payloads, size)
+    np = bulk.numpy_for(len(rows))
+    if np is None:
+        return encode_many(prefix, version, rows)
+    count = len(rows)
+    data = np.empty((count, size + 1), np.uint8)
+    data[:, 0] = version
+    data[:, 1:] = np.frombuffer(payloads, np.uint8).reshape(count, size)
+    bits = np.unpackbits(data, axis=1)
+    bits = np.pad(bits, ((0, 0), (0, -bits.shape[1] % 5)))
+    values = bits.reshape(count, -1, 5) @ np.array([16, 8, 4, 2, 1], np.uint8)
+    values = values.astype(np.uint8)
+    # Checksum state of every address is updated one 5-bit column at once
+    table = np.array(POLYMOD_TABLE, np.uint64)
+    mask = np.uint64(0x07ffffffff)
+    five = np.uint64(5)
+    top = np.uint64(35)
+    chk = np.full(count, prefix_state(prefix), np.uint64)
+    for column in values.T.astype(np.uint64):
+        chk = (chk & mask) << five ^ column ^ table[chk >> top]
+    for _ in range(8):
+        chk = (chk & mask) << five ^ table[chk >> top]
+    chk ^= np.uint64(1)
+    checksum = np.stack([
+        chk >> np.uint64(5 * i) & np.uint64(0x1f) for i in range(7, -1, -1)
+    ], axis=1).astype(np.uint8)
+    charset = np.frombuffer(CHARSET.encode('ascii'), np.uint8)
+    return bulk.to_text(
+        charset[np.concatenate([values, checksum], axis=1)], prefix + ':'
+    )
+
+
+def decode(address: str, prefix: str = None):
+    """Decode CashAddr address into ``(prefix, version, payload)``.
+
+    ``prefix`` is assumed for addresses written without one.
+    """
+    if address not in (address.lower(), address.upper()):
+        raise ValueError("Mixed case CashAddr address %s" % address)
+    address = address.lower()
+    if ':' in address:
+        prefix, _, data = address.rpartition(':')
+    elif prefix is None:
+        raise ValueError("Missing CashAddr prefix in %s" % address)
+    else:
+        data = address
+    try:
+        values = data.encode('ascii').translate(DECODE_TABLE)
+    except UnicodeEncodeError:
+        raise ValueError("Invalid CashAddr character") from None
+    if _INVALID in values or len(values) < 9:
+        raise ValueError("Invalid CashAddr address %s" % address)
+    if polymod_update(prefix_state(prefix), values) ^ 1:
+        raise ValueError("Invalid CashAddr checksum")
+    decoded = convertbits(values[:-8], 5, 8, False)
+    if not decoded:
+        raise ValueError("Invalid CashAddr padding")
+    return prefix, decoded[0], bytes(decoded[1:])
 
-        pub_key = super().public_key_to_address(public_key)
-        payload = list(b58decode_check(pub_key)[1:])
 
-        payload = [version_int] + payload
-        payload = convertbits(payload, 8, 5)
-        checksum = calculate_checksum(prefix, payload)
-        return prefix + ':' + b32encode(payload + checksum)
+@registry.register('bitcoin_cash', 'BCH')
+class BitcoinCash(BaseNetwork):
+    """Bitcoin Cash with CashAddr addresses.
+
+    ``prefix`` selects the network: ``bitcoincash`` (default), ``bchtest``
+    or ``bchreg``.
+    """
+    prefix = 'bitcoincash'
+
+    def __init__(self, prefix=None):
+        if prefix is not None:
+            if prefix not in PREFIXES:
+                raise ValueError("Unknown CashAddr prefix %s" % prefix)
+            self.prefix = prefix
+
+    @property
+    def store_key(self):
+        if self.prefix == BitcoinCash.prefix:
+            return self.name
+        return '%s:%s' % (self.name, self.prefix)
+
+    def encode_address(self, payload):
+        return encode(self.prefix, P2PKH_VERSION, payload)
+
+    def encode_addresses(self, payloads):
+        return encode_many(self.prefix, P2PKH_VERSION, payloads)
+
+    def encode_payloads(self, payloads):
+        return encode_buffer(self.prefix, P2PKH_VERSION, payloads)
+
+    def decode_address(self, address):
+        prefix, version, payload = decode(address, self.prefix)
+        if (prefix != self.prefix or version != P2PKH_VERSION or
+                len(payload) != 20):
+            raise ValueError("Invalid address %s" % address)
+        return payload
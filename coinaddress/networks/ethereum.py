@@ -1,31 +1,152 @@
-from binascii import hexlify
-from sha3 import keccak_256
+from typing import Iterable, List, Union
+
+from coinaddress import bulk
 
 from .base import BaseNetwork
 from .registry import registry
 
 
+def _case_table():
+    """Two hex characters for every address byte and pair of case flags.
+
+    EIP-55 uppercases a hex character when the matching nibble of the
+    address hash is greater than 7, i.e. its highest bit is set. Index is
+    ``byte << 2 | upper_first << 1 | upper_second``.
+    """
+    table = []
+    for byte in range(256):
+        first, second = '%02x' % byte
+        for flags in range(4):
+            table.append(
+                (first.upper() if flags & 2 else first) +
+                (second.upper() if flags & 1 else second)
+            )
+    return tuple(table)
+
+
+CASE_TABLE = _case_table()
+
+
+def _keccak_256():
+    # pysha3 is imported on the first Ethereum hash, not with the package
+    from sha3 import keccak_256
+    return keccak_256
+
+
+def checksum_encode(address: bytes) -> str:
+    """EIP-55 checksummed ``0x`` address of raw 20 bytes address."""
+    return _checksum_encode(address, _keccak_256())
+
+
+def _checksum_encode(address, keccak_256):
+    address_hash = keccak_256(address.hex().encode('ascii')).digest()
+    table = CASE_TABLE
+    return '0x' + ''.join([
+        table[byte << 2 | (h >> 6 & 2) | (h >> 3 & 1)]
+        for byte, h in zip(address, address_hash)
+    ])
+
+
 def to_checksum_address(value):
-    norm_address = value.lower()
-    address_hash = '0x' + hexlify(
-        keccak_256(norm_address[2:].encode()).digest()
-    ).decode('ascii')
-
-    checksum_address = "".join(
-        (
-            norm_address[i].upper()
-            if int(address_hash[i], 16) > 7
-            else norm_address[i]
-        )
-        for i in range(2, 42)
-    )
-    return '0x%s' % checksum_address
+    return checksum_encode(bytes.fromhex(value[2:]))
+
+
+def public_key_to_account(public_key: bytes) -> bytes:
+    """Raw 20 bytes address of 65 bytes (or 64 without prefix) public key."""
+    if len(public_key) == 65:
+        public_key = public_key[1:]
+    return _keccak_256()(public_key).digest()[12:]
+
+
+def public_keys_to_accounts(public_keys: bytes, key_size: int = 65) -> bytes:
+    """Raw 20 bytes addresses of every key of the buffer, concatenated."""
+    skip = 1 if key_size == 65 else 0
+    keccak_256 = _keccak_256()
+    return b''.join([
+        keccak_256(key[skip:]).digest()[12:]
+        for key in bulk.split(public_keys, key_size)
+    ])
+
+
+def checksum_encode_buffer(accounts: bytes) -> List[str]:
+    """EIP-55 checksummed addresses of every 20 bytes account of the buffer.
+
+    Case of large batches is mapped with NumPy, see :mod:`coinaddress.bulk`.
+    """
+    rows = bulk.split(accounts, bulk.PAYLOAD_SIZE)
+    keccak_256 = _keccak_256()
+    np = bulk.numpy_for(len(rows))
+    if np is None:
+        return [_checksum_encode(row, keccak_256) for row in rows]
+    count = len(rows)
+    width = 2 * bulk.PAYLOAD_SIZE
+    hex_chars = accounts.hex().encode('ascii')
+    hashes = b''.join([
+        keccak_256(hex_chars[i:i + width]).digest()[:bulk.PAYLOAD_SIZE]
+        for i in range(0, len(hex_chars), width)
+    ])
+    hashes = np.frombuffer(hashes, np.uint8).reshape(count, -1)
+    nibbles = np.empty((count, width), np.uint8)
+    nibbles[:, 0::2] = hashes >> 4
+    nibbles[:, 1::2] = hashes & 0xf
+    chars = np.frombuffer(hex_chars, np.uint8).reshape(count, width)
+    # Only a-f letters have the case, upper one is 0x20 below the lower one
+    upper = (nibbles > 7) & (chars > ord('9'))
+    return bulk.to_text(chars - (upper.astype(np.uint8) << 5), '0x')
+
+
+def encode_public_keys(public_keys: Iterable[bytes],
+                       raw: bool = False) -> List[Union[str, bytes]]:
+    """Addresses of many uncompressed public keys at once.
+
+    With ``raw`` 20 bytes addresses are returned and EIP-55 checksumming is
+    skipped altogether.
+    """
+    keccak_256 = _keccak_256()
+    accounts = [
+        keccak_256(key[1:] if len(key) == 65 else key).digest()[12:]
+        for key in public_keys
+    ]
+    if raw:
+        return accounts
+    return [_checksum_encode(account, keccak_256) for account in accounts]
 
 
 @registry.register('ethereum', 'ETH')
 class Ethereum(BaseNetwork):
-    def public_key_to_address(self, node):
-        pk_bytes = bytes(node)
-        keccak = keccak_256(pk_bytes[1:]).digest()
-        eth_address = '0x%s' % hexlify(keccak[12:]).decode('ascii')
-        return to_checksum_address(eth_address)
+    def public_key_hash(self, node):
+        return _keccak_256()(node.uncompressed[1:]).digest()[12:]
+
+    def encode_address(self, payload):
+        return checksum_encode(payload)
+
+    def encode_addresses(self, payloads):
+        keccak_256 = _keccak_256()
+        return [_checksum_encode(payload, keccak_256) for payload in payloads]
+
+    def public_keys(self, nodes):
+        return b''.join([node.uncompressed for node in nodes])
+
+    def hash_public_keys(self, keys):
+        return public_keys_to_accounts(keys)
+
+    def encode_payloads(self, payloads):
+        return checksum_encode_buffer(payloads)
+
+    def decode_address(self, address):
+        """Raw 20 bytes of ``0x`` address.
+
+        Mixed case addresses must carry a valid EIP-55 checksum, all lower
+        or upper case ones are accepted as is.
+        """
+        body = address[2:]
+        if len(address) != 42 or address[:2] not in ('0x', '0X'):
+            raise ValueError("Invalid address %s" % address)
+        try:
+            payload = bytes.fromhex(body)
+        except ValueError:
+            raise ValueError("Invalid address %s" % address) from None
+        if body not in (body.lower(), body.upper()):
+            if checksum_encode(payload)[2:] != body:
+                raise ValueError("Invalid EIP-55 checksum of %s" % address)
+        return payload
@@ -1,16 +1,59 @@
+from importlib import import_module
+
+
 class Registry:
+    """Network names to network instances.
+
+    Classes are registered with the :meth:`register` decorator or lazily by
+    module with :meth:`register_lazy`, so a network module and its hashing
+    dependencies are imported on the first :meth:`get` of its name. Instances
+    are built on demand, one per class.
+    """
+
     def __init__(self):
-        self.__networks = {}
+        self.__classes = {}
+        self.__modules = {}
+        self.__instances = {}
 
     def register(self, *names):
         def wrapper(cls):
+            if 'name' not in cls.__dict__:
+                cls.name = names[0]
             for n in names:
-                self.__networks[n] = cls()
+                self.__classes[n] = cls
             return cls
         return wrapper
 
+    def register_lazy(self, module: str, *names):
+        """Import ``module`` registering ``names`` on the first lookup."""
+        for n in names:
+            self.__modules[n] = module
+
     def get(self, name, default=None):
-        return self.__networks.get(name, default)
+        cls = self.__classes.get(name)
+        if cls is None:
+            module = self.__modules.get(name)
+            if module is None:
+                return default
+            import_module(module)
+            cls = self.__classes.get(name)
+            if cls is None:
+                raise LookupError(
+                    "%s didn't register network %s" % (module, name)
+                )
+        instance = self.__instances.get(cls)
+        if instance is None:
+            instance = self.__instances.setdefault(cls, cls())
+        return instance
+
+    def names(self):
+        """All registered names, loaded or not."""
+        return sorted(set(self.__classes) | set(self.__modules))
+
+    def load_all(self):
+        """Import every lazily registered network module."""
+        for name in self.names():
+            self.get(name)
 
 
 registry = Registry()
@@ -1,5 +1,6 @@
 import hashlib
-from binascii import hexlify
+
+from coinaddress import base58, bulk
 
 from .base import BaseNetwork
 from .registry import registry
@@ -37,18 +38,30 @@ def to_bytes(number, length=None, endianess='big'):
 class Ripple(BaseNetwork):
     pubkey_address_prefix = 0x00
 
-    def public_key_to_address(self, node):
-        return get_ripple_from_pubkey(
-            bytes.fromhex(node.hex().decode())
+    def encode_address(self, payload):
+        return RippleBaseDecoder.encode(payload)
+
+    def encode_addresses(self, payloads):
+        return RippleBaseDecoder.encode_many(payloads)
+
+    def encode_payloads(self, payloads):
+        return base58.ripple.encode_check_buffer(
+            payloads, bulk.PAYLOAD_SIZE, bytes([self.pubkey_address_prefix])
         )
 
+    def decode_address(self, address):
+        data = base58.ripple.decode_check(address)
+        if len(data) != 21 or data[0] != self.pubkey_address_prefix:
+            raise ValueError("Invalid address %s" % address)
+        return data[1:]
+
 
 class RippleBaseDecoder(object):
     """Decodes Ripple's base58 alphabet.
     This is what ripple-lib does in ``base.js``.
     """
 
-    alphabet = 'rpshnaf39wBUDNEGHJKLM4PQRST7VWXYZ2bcdeCg65jkm8oFqi1tuvAxyz'
+    alphabet = base58.RIPPLE_ALPHABET
 
     @classmethod
     def decode(cls, *a, **kw):
@@ -63,10 +76,7 @@ class RippleBaseDecoder(object):
     @classmethod
     def decode_base(cls, encoded, pad_length=None):
         """Decode a base encoded string with the Ripple alphabet."""
-        n = 0
-        base = len(cls.alphabet)
-        for char in encoded:
-            n = n * base + cls.alphabet.index(char)
+        n = base58.ripple.decode_int(encoded)
         return to_bytes(n, pad_length, 'big')
 
     @classmethod
@@ -85,31 +95,16 @@ class RippleBaseDecoder(object):
     def encode(cls, data):
         """Apply base58 encode including version, checksum."""
         version = b'\x00'
-        bytes = version + data
-        bytes += hashlib.sha256(
-            hashlib.sha256(bytes).digest()
-        ).digest()[:4]   # checksum
-        return cls.encode_base(bytes)
+        return base58.ripple.encode_check(version + data)
+
+    @classmethod
+    def encode_many(cls, payloads):
+        """Encode many account ids at once, see :meth:`encode`."""
+        version = b'\x00'
+        return base58.ripple.encode_check_many(
+            version + data for data in payloads
+        )
 
     @classmethod
     def encode_base(cls, data):
-        # https://github.com/jgarzik/python-bitcoinlib/blob/master/bitcoin/base58.py  # noqa
-        # Convert big-endian bytes to integer
-        n = int(hexlify(data).decode('utf8'), 16)
-
-        # Divide that integer into base58
-        res = []
-        while n > 0:
-            n, r = divmod(n, len(cls.alphabet))
-            res.append(cls.alphabet[r])
-        res = ''.join(res[::-1])
-
-        # Encode leading zeros as base58 zeros
-        czero = 0
-        pad = 0
-        for c in data:
-            if c == czero:
-                pad += 1
-            else:
-                break
-        return cls.alphabet[0] * pad + res
+        return base58.ripple.encode(data)
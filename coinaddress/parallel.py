@@ -0,0 +1,105 @@
+"""Multi-core address generation."""
+import os
+from collections import deque
+from typing import Iterator, List
+
+from .backends import get_backend, set_backend
+from .networks import registry
+from .store import get_store, set_store
+
+#: Number of addresses derived by a worker per task.
+DEFAULT_BATCH_SIZE = 10000
+
+
+def _derive_batch(network: str, xpub: str, prefix: str, start: int,
+                  count: int, backend: str = None,
+                  store=None) -> List[str]:
+    # Workers keep decoded xpub and prefix node in their own node cache,
+    # so only the first task of every worker derives them.
+    if backend is not None and get_backend().name != backend:
+        set_backend(backend)
+    if store is not None and get_store() is None:
+        set_store(store)
+    return registry.get(network).get_addresses(
+        xpub=xpub, prefix=prefix, start=start, count=count
+    )
+
+
+def _derive_payload_batch(network: str, xpub: str, prefix: str, start: int,
+                          count: int, backend: str = None,
+                          store=None) -> bytes:
+    # Concatenated payloads are pickled back to the parent far cheaper
+    # than a list of strings.
+    if backend is not None and get_backend().name != backend:
+        set_backend(backend)
+    return b''.join(registry.get(network).iter_payload_chunks(
+        xpub=xpub, prefix=prefix, start=start, stop=start + count
+    ))
+
+
+def _generate(derive, network: str, xpub: str, prefix: str, start: int,
+              count: int, jobs: int, batch_size: int) -> Iterator:
+    """Yield results of ``derive`` for every batch in index order."""
+    if registry.get(network) is None:
+        raise ValueError("Unknown network %s" % network)
+    if batch_size < 1:
+        raise ValueError("batch_size can't be less than 1")
+    jobs = jobs or os.cpu_count() or 1
+    stop = start + count
+    if jobs == 1:
+        for index in range(start, stop, batch_size):
+            yield derive(
+                network, xpub, prefix, index, min(batch_size, stop - index)
+            )
+        return
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    backend = get_backend().name
+    store = get_store()
+    batches = iter(range(start, stop, batch_size))
+    pending = deque()
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        def submit():
+            index = next(batches, None)
+            if index is not None:
+                pending.append(executor.submit(
+                    derive, network, xpub, prefix, index,
+                    min(batch_size, stop - index), backend, store
+                ))
+
+        for _ in range(2 * jobs):
+            submit()
+        while pending:
+            result = pending.popleft().result()
+            submit()
+            yield result
+
+
+def generate_addresses(network: str, xpub: str, prefix: str = '',
+                       start: int = 0, count: int = 1, jobs: int = None,
+                       batch_size: int = DEFAULT_BATCH_SIZE) -> Iterator[str]:
+    """Yield ``count`` addresses under ``prefix`` using a process pool.
+
+    The index range is split into batches of ``batch_size`` addresses spread
+    across ``jobs`` worker processes (all CPUs by default). Addresses are
+    yielded in index order and at most ``2 * jobs`` batches are in flight,
+    so memory use doesn't depend on ``count``.
+    """
+    for addresses in _generate(_derive_batch, network, xpub, prefix, start,
+                               count, jobs, batch_size):
+        yield from addresses
+
+
+def generate_payloads(network: str, xpub: str, prefix: str = '',
+                      start: int = 0, count: int = 1, jobs: int = None,
+                      batch_size: int = DEFAULT_BATCH_SIZE
+                      ) -> Iterator[bytes]:
+    """Yield raw address payloads of ``count`` addresses in batches.
+
+    Works like :func:`generate_addresses`, but every item is the
+    concatenation of a whole batch of fixed size payloads in index order,
+    see :meth:`~coinaddress.networks.base.BaseNetwork.iter_payloads`.
+    """
+    yield from _generate(_derive_payload_batch, network, xpub, prefix, start,
+                         count, jobs, batch_size)
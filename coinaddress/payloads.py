@@ -0,0 +1,121 @@
+"""Fixed width binary file of raw address payloads.
+
+Written by ``coinaddress generate --format binary`` for bulk loading into
+databases without decoding address strings back. Records are the raw 20
+bytes address payloads (hash160 of Bitcoin family networks, Ripple account
+id, or Ethereum account) of sequential indexes, so the file can be memory
+mapped and record ``i`` is the address at index ``start + i``. Layout::
+
+    header     magic, header size, payload size, start index, count, network
+    prefix     derivation path prefix, zero padded to 8 bytes boundary
+    records    payload size bytes each
+
+Header integers are little-endian, records start at ``header size`` offset.
+"""
+import mmap
+import struct
+from collections import namedtuple
+from typing import IO, Iterable
+
+MAGIC = b'CAPAYLD1'
+HEADER = struct.Struct('<8sIIQQ16s')
+PAYLOAD_SIZE = 20
+
+#: Decoded header, ``size`` is the offset of the first record.
+PayloadsHeader = namedtuple('PayloadsHeader', [
+    'network', 'prefix', 'start', 'count', 'payload_size', 'size',
+])
+
+
+def pack_header(network: str, prefix: str, start: int, count: int,
+                payload_size: int = PAYLOAD_SIZE) -> bytes:
+    name = network.encode('ascii')
+    if len(name) > 16:
+        raise ValueError("Network name %s is too long" % network)
+    path = prefix.encode('utf-8')
+    size = HEADER.size + len(path)
+    size += -size % 8
+    return HEADER.pack(
+        MAGIC, size, payload_size, start, count, name
+    ) + path.ljust(size - HEADER.size, b'\0')
+
+
+def unpack_header(data: bytes) -> PayloadsHeader:
+    """Decode header from the beginning of ``data``."""
+    if len(data) < HEADER.size:
+        raise ValueError("Not a payloads file")
+    magic, size, payload_size, start, count, name = HEADER.unpack_from(data)
+    if magic != MAGIC or len(data) < size or not payload_size:
+        raise ValueError("Not a payloads file")
+    return PayloadsHeader(
+        name.rstrip(b'\0').decode('ascii'),
+        bytes(data[HEADER.size:size]).rstrip(b'\0').decode('utf-8'),
+        start, count, payload_size, size,
+    )
+
+
+def write_payloads(output: IO[bytes], network: str, prefix: str, start: int,
+                   count: int, chunks: Iterable[bytes],
+                   payload_size: int = PAYLOAD_SIZE) -> int:
+    """Write header and ``chunks`` of concatenated payloads.
+
+    Returns number of written payloads, which must be ``count``.
+    """
+    output.write(pack_header(network, prefix, start, count, payload_size))
+    written = 0
+    for chunk in chunks:
+        if len(chunk) % payload_size:
+            raise ValueError(
+                "Payloads must be %d bytes long" % payload_size
+            )
+        output.write(chunk)
+        written += len(chunk) // payload_size
+    if written != count:
+        raise ValueError("%d payloads written, %d expected" % (written, count))
+    return written
+
+
+class PayloadsFile:
+    """Read-only memory mapped payloads file.
+
+    ``file[i]`` is the payload of index ``file.header.start + i``.
+    """
+
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self.header = unpack_header(self._mmap)
+            size = self.header.payload_size
+            end = self.header.size + self.header.count * size
+            if end > len(self._mmap):
+                raise ValueError("Payloads file is truncated")
+        except ValueError:
+            self._mmap.close()
+            raise
+        self.records = memoryview(self._mmap)[self.header.size:end]
+
+    def __len__(self):
+        return self.header.count
+
+    def __getitem__(self, i: int) -> bytes:
+        if i < 0:
+            i += self.header.count
+        if not 0 <= i < self.header.count:
+            raise IndexError("Payload index out of range")
+        size = self.header.payload_size
+        return bytes(self.records[i * size:(i + 1) * size])
+
+    def __iter__(self):
+        for i in range(self.header.count):
+            yield self[i]
+
+    def close(self):
+        self.records.release()
+        self._mmap.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
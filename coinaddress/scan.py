@@ -0,0 +1,141 @@
+"""BIP44 style gap limit scanning.
+
+Addresses of every chain (external ``0`` and change ``1`` by default) are
+derived in chunks and passed to a user supplied batch predicate, which
+tells which of them are used, e.g. by looking them up in a database or
+:mod:`coinaddress.index`. A chain ends after ``gap_limit`` consecutive unused
+addresses. The next chunk is derived in a background thread while the
+predicate checks the current one.
+"""
+from collections import namedtuple
+from typing import Callable, Dict, Iterable, List, Sequence
+
+#: BIP44 gap limit.
+DEFAULT_GAP_LIMIT = 20
+#: Addresses derived and checked at once.
+DEFAULT_SCAN_CHUNK_SIZE = 100
+#: External and change chains of a BIP44 account xpub.
+DEFAULT_CHAINS = ('0', '1')
+
+#: Scan result of a chain: ``used`` ``(index, address)`` pairs,
+#: ``next_index`` after the last used address and number of ``scanned``
+#: addresses the gap rule was applied to.
+ChainScan = namedtuple('ChainScan', ['prefix', 'used', 'next_index',
+                                     'scanned'])
+
+Predicate = Callable[[List[str]], Iterable[bool]]
+
+
+class _Deferred:
+    """Call made in the calling thread when its result is needed."""
+
+    def __init__(self, func, args):
+        self.func = func
+        self.args = args
+
+    def result(self):
+        return self.func(*self.args)
+
+    def cancel(self):
+        return True
+
+
+class _SerialExecutor:
+    def submit(self, func, *args):
+        return _Deferred(func, args)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        pass
+
+
+class GapScanner:
+    """Scans chains of xpub on the network using ``is_used`` predicate.
+
+    ``is_used`` gets a list of addresses and returns a flag for each of
+    them. With ``overlap`` disabled chunks are derived in the calling thread
+    only when needed.
+    """
+
+    def __init__(self, network, xpub: str, is_used: Predicate,
+                 gap_limit: int = DEFAULT_GAP_LIMIT,
+                 chunk_size: int = DEFAULT_SCAN_CHUNK_SIZE,
+                 overlap: bool = True):
+        if gap_limit < 1:
+            raise ValueError("gap_limit can't be less than 1")
+        if chunk_size < 1:
+            raise ValueError("chunk_size can't be less than 1")
+        self.network = network
+        self.xpub = xpub
+        self.is_used = is_used
+        self.gap_limit = gap_limit
+        self.chunk_size = chunk_size
+        self.overlap = overlap
+
+    def _executor(self):
+        if not self.overlap:
+            return _SerialExecutor()
+        from concurrent.futures import ThreadPoolExecutor
+        return ThreadPoolExecutor(max_workers=1)
+
+    def _derive(self, prefix: str, start: int) -> List[str]:
+        return self.network.get_addresses(
+            self.xpub, prefix, start, self.chunk_size
+        )
+
+    def _check(self, addresses: List[str]) -> List[bool]:
+        flags = list(self.is_used(addresses))
+        if len(flags) != len(addresses):
+            raise ValueError(
+                "is_used returned %d flags for %d addresses"
+                % (len(flags), len(addresses))
+            )
+        return flags
+
+    def scan_chain(self, prefix: str, start: int = 0,
+                   executor=None) -> ChainScan:
+        """Scan a single chain starting at ``start`` index."""
+        if start < 0:
+            raise ValueError("Index can't be less than 0")
+        if executor is None:
+            with self._executor() as executor:
+                return self.scan_chain(prefix, start, executor)
+
+        used = []
+        last_used = start - 1
+        index = start
+        pending = executor.submit(self._derive, prefix, index)
+        try:
+            while True:
+                addresses = pending.result()
+                next_start = index + len(addresses)
+                # Derive the next chunk while the predicate runs
+                pending = executor.submit(self._derive, prefix, next_start)
+                flags = self._check(addresses)
+                for position, (address, is_used) in enumerate(
+                        zip(addresses, flags), index):
+                    if position - last_used > self.gap_limit:
+                        return ChainScan(
+                            prefix, used, last_used + 1, position - start
+                        )
+                    if is_used:
+                        used.append((position, address))
+                        last_used = position
+                if next_start - last_used > self.gap_limit:
+                    return ChainScan(
+                        prefix, used, last_used + 1, next_start - start
+                    )
+                index = next_start
+        finally:
+            pending.cancel()
+
+    def scan(self, chains: Sequence[str] = DEFAULT_CHAINS
+             ) -> Dict[str, ChainScan]:
+        """Scan every chain, results are keyed by chain prefix."""
+        with self._executor() as executor:
+            return {
+                prefix: self.scan_chain(prefix, executor=executor)
+                for prefix in chains
+            }
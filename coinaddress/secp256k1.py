@@ -0,0 +1,211 @@
+"""Pure integer secp256k1 arithmetic used by key derivation.
+
+Points are kept in Jacobian coordinates ``(X, Y, Z)`` representing the affine
+point ``(X / Z^2, Y / Z^3)``. ``Z == 0`` is the point at infinity. Affine
+points are plain ``(x, y)`` tuples.
+"""
+import sys
+import threading
+
+P = 0xFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFEFFFFFC2F
+N = 0xFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFEBAAEDCE6AF48A03BBFD25E8CD0364141
+B = 7
+GX = 0x79BE667EF9DCBBAC55A06295CE870B07029BFCDB2DCE28D959F2815B16F81798
+GY = 0x483ADA7726A3C4655DA4FBFC0E1108A8FD17B448A68554199C47D08FFB10D4B8
+
+INFINITY = (0, 1, 0)
+
+#: Bits per window of the fixed-base generator table.
+WINDOW_BITS = 8
+
+if sys.version_info >= (3, 8):
+    def inverse_mod(a: int, m: int = P) -> int:
+        return pow(a, -1, m)
+else:  # pragma: no cover
+    def inverse_mod(a: int, m: int = P) -> int:
+        # m is always prime here, so Fermat's little theorem applies
+        return pow(a, m - 2, m)
+
+
+def is_on_curve(x: int, y: int) -> bool:
+    return 0 <= x < P and 0 <= y < P and (y * y - x * x * x - B) % P == 0
+
+
+def decompress(x: int, y_odd: bool):
+    """Recover affine point from ``x`` and parity of ``y``.
+
+    secp256k1 has ``P % 4 == 3``, so the square root of ``x^3 + 7`` is a
+    single exponentiation to ``(P + 1) / 4``. The root is squared back to
+    make sure ``x`` is on the curve at all.
+    """
+    if not 0 <= x < P:
+        raise ValueError("x coordinate is out of range")
+    alpha = (pow(x, 3, P) + B) % P
+    beta = pow(alpha, (P + 1) // 4, P)
+    if beta * beta % P != alpha:
+        raise ValueError("x coordinate is not on secp256k1 curve")
+    if bool(beta & 1) != y_odd:
+        beta = P - beta
+    return x, beta
+
+
+def decode_point(key: bytes):
+    """Load affine point from a compressed or uncompressed SEC1 public key.
+
+    The point is checked to be on the curve. secp256k1 has cofactor 1, so
+    that's enough for it to be a valid public key.
+    """
+    if not key:
+        raise ValueError("Empty public key")
+    id_byte = key[0]
+    if id_byte == 4:
+        # 1B ID + 32B x coord + 32B y coord = 65 B
+        if len(key) != 65:
+            raise ValueError("Invalid key length")
+        x = int.from_bytes(key[1:33], 'big')
+        y = int.from_bytes(key[33:], 'big')
+        if not is_on_curve(x, y):
+            raise ValueError("Point is not on secp256k1 curve")
+        return x, y
+    elif id_byte in (2, 3):
+        if len(key) != 33:
+            raise ValueError("Invalid key length")
+        return decompress(int.from_bytes(key[1:], 'big'), id_byte == 3)
+    raise ValueError("The given key is not in a known format.")
+
+
+def jacobian_double(p):
+    x1, y1, z1 = p
+    if not y1 or not z1:
+        return INFINITY
+    a = x1 * x1 % P
+    b = y1 * y1 % P
+    c = b * b % P
+    d = 2 * ((x1 + b) ** 2 - a - c) % P
+    e = 3 * a % P
+    x3 = (e * e - 2 * d) % P
+    y3 = (e * (d - x3) - 8 * c) % P
+    z3 = 2 * y1 * z1 % P
+    return x3, y3, z3
+
+
+def jacobian_add_affine(p, q):
+    """Add affine point ``q`` to Jacobian point ``p``."""
+    x1, y1, z1 = p
+    x2, y2 = q
+    if not z1:
+        return x2, y2, 1
+    z1z1 = z1 * z1 % P
+    h = (x2 * z1z1 - x1) % P
+    r = (y2 * z1 * z1z1 - y1) % P
+    if not h:
+        if not r:
+            return jacobian_double(p)
+        return INFINITY
+    hh = h * h % P
+    hhh = h * hh % P
+    v = x1 * hh % P
+    x3 = (r * r - hhh - 2 * v) % P
+    y3 = (r * (v - x3) - y1 * hhh) % P
+    z3 = z1 * h % P
+    return x3, y3, z3
+
+
+def to_affine(p):
+    x, y, z = p
+    if not z:
+        raise ValueError("Point at infinity has no affine coordinates")
+    if z == 1:
+        return x, y
+    z_inv = inverse_mod(z)
+    z_inv2 = z_inv * z_inv % P
+    return x * z_inv2 % P, y * z_inv2 * z_inv % P
+
+
+def batch_to_affine(points):
+    """Convert many Jacobian points to affine with a single inversion.
+
+    Uses Montgomery's simultaneous inversion trick: one modular inversion
+    plus about three multiplications per point.
+    """
+    count = len(points)
+    if not count:
+        return []
+    prefix = [0] * count
+    acc = 1
+    for i, (_, _, z) in enumerate(points):
+        if not z:
+            raise ValueError("Point at infinity has no affine coordinates")
+        prefix[i] = acc
+        acc = acc * z % P
+    acc = inverse_mod(acc)
+    result = [None] * count
+    for i in range(count - 1, -1, -1):
+        x, y, z = points[i]
+        z_inv = acc * prefix[i] % P
+        acc = acc * z % P
+        z_inv2 = z_inv * z_inv % P
+        result[i] = (x * z_inv2 % P, y * z_inv2 * z_inv % P)
+    return result
+
+
+class GeneratorTable:
+    """Fixed-base window table for multiplication by the generator.
+
+    For every ``WINDOW_BITS`` wide window ``i`` of the scalar the table keeps
+    affine multiples ``d * 2^(WINDOW_BITS * i) * G`` for every digit ``d``,
+    so ``k * G`` costs one mixed addition per non-zero scalar byte and no
+    doublings at all.
+    """
+
+    def __init__(self, window_bits: int = WINDOW_BITS):
+        self.window_bits = window_bits
+        self.windows = (256 + window_bits - 1) // window_bits
+        size = (1 << window_bits) - 1
+        jacobian = []
+        base = (GX, GY, 1)
+        for _ in range(self.windows):
+            base_affine = to_affine(base)
+            point = base
+            jacobian.append(point)
+            for _ in range(size - 1):
+                point = jacobian_add_affine(point, base_affine)
+                jacobian.append(point)
+            # (2^w - 1) * B + B is the base of the next window
+            base = jacobian_add_affine(point, base_affine)
+        affine = batch_to_affine(jacobian)
+        self.rows = [
+            affine[i * size:(i + 1) * size] for i in range(self.windows)
+        ]
+
+    def multiply(self, k: int):
+        """Return ``k * G`` as a Jacobian point."""
+        k %= N
+        bits = self.window_bits
+        mask = (1 << bits) - 1
+        acc = INFINITY
+        for row in self.rows:
+            digit = k & mask
+            if digit:
+                acc = jacobian_add_affine(acc, row[digit - 1])
+            k >>= bits
+        return acc
+
+
+_generator_table = None
+_generator_table_lock = threading.Lock()
+
+
+def generator_table() -> GeneratorTable:
+    """Get the process wide generator table, building it on first use."""
+    global _generator_table
+    if _generator_table is None:
+        with _generator_table_lock:
+            if _generator_table is None:
+                _generator_table = GeneratorTable()
+    return _generator_table
+
+
+def multiply_generator(k: int):
+    """Return ``k * G`` as a Jacobian point using the precomputed table."""
+    return generator_table().multiply(k)
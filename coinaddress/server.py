@@ -0,0 +1,326 @@
+"""Local HTTP address service.
+
+A threaded stdlib HTTP/1.1 server listening on a TCP port or a Unix socket.
+Decoded xpubs and parent nodes stay warm in the shared node cache between
+requests. Endpoints, all answering JSON:
+
+* ``GET /address?network=&xpub=&path=0`` -- single address
+* ``GET /addresses?network=&xpub=&prefix=&start=0&count=1`` -- range
+* ``POST /batch`` -- ``{"jobs": [{"network", "xpub", "path", "count",
+  "id"}, ...]}``, see :mod:`coinaddress.jobs`; every job gets either
+  ``addresses`` or ``error``
+* ``GET /metrics`` -- request counters, throughput, latency percentiles and
+  node cache hit rate
+
+Invalid requests get status 400 with an ``error`` message, unexpected
+failures get status 500.
+"""
+import json
+import os
+import socket
+import socketserver
+import stat
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from .cache import cache_info
+from .jobs import parse_job
+from .networks import registry
+
+#: Number of latest request latencies percentiles are computed from.
+LATENCY_WINDOW = 10000
+#: Most addresses a single range or batch request may ask for.
+MAX_COUNT = 100000
+#: Largest accepted request body, room for ``MAX_COUNT`` single address jobs.
+MAX_BODY_SIZE = MAX_COUNT * 512
+PERCENTILES = (50, 90, 99)
+
+
+class BadRequest(ValueError):
+    pass
+
+
+class Metrics:
+    """Thread-safe request counters and latency window."""
+
+    def __init__(self, window: int = LATENCY_WINDOW):
+        self._lock = threading.Lock()
+        self._latencies = deque(maxlen=window)
+        self.started = time.time()
+        self.requests = {}
+        self.errors = 0
+        self.addresses = 0
+
+    def record(self, endpoint: str, seconds: float, addresses: int = 0,
+               error: bool = False):
+        with self._lock:
+            self.requests[endpoint] = self.requests.get(endpoint, 0) + 1
+            self.addresses += addresses
+            self.errors += error
+            self._latencies.append(seconds)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            latencies = sorted(self._latencies)
+            requests = dict(self.requests)
+            addresses = self.addresses
+            errors = self.errors
+        uptime = time.time() - self.started
+        cache = cache_info()
+        lookups = cache['hits'] + cache['misses']
+        return {
+            'uptime_seconds': uptime,
+            'requests': requests,
+            'errors': errors,
+            'addresses': addresses,
+            'addresses_per_second': addresses / uptime if uptime else 0.0,
+            'latency_ms': {
+                'p%d' % p: (
+                    latencies[min(len(latencies) - 1,
+                                  len(latencies) * p // 100)] * 1000
+                    if latencies else 0.0
+                )
+                for p in PERCENTILES
+            },
+            'cache': dict(
+                cache, hit_rate=cache['hits'] / lookups if lookups else 0.0
+            ),
+        }
+
+
+def _get_network(params):
+    name = params.get('network')
+    net = registry.get(name) if name else None
+    if net is None:
+        raise BadRequest("Unknown network %s" % name)
+    return net
+
+
+def _get_int(params, name, default):
+    value = params.get(name)
+    if value is None:
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        raise BadRequest("Invalid %s %s" % (name, value)) from None
+
+
+def _required(params, name):
+    value = params.get(name)
+    if not value:
+        raise BadRequest("%s is required" % name)
+    return value
+
+
+def _check_count(count):
+    if not 0 < count <= MAX_COUNT:
+        raise BadRequest("count must be between 1 and %d" % MAX_COUNT)
+
+
+def get_address(params):
+    net = _get_network(params)
+    path = params.get('path') or '0'
+    address = net.get_address(_required(params, 'xpub'), path)
+    return {'path': path, 'address': address}, 1
+
+
+def get_addresses(params):
+    net = _get_network(params)
+    start = _get_int(params, 'start', 0)
+    count = _get_int(params, 'count', 1)
+    _check_count(count)
+    addresses = net.get_addresses(
+        _required(params, 'xpub'), params.get('prefix') or '', start, count
+    )
+    return {'start': start, 'addresses': addresses}, len(addresses)
+
+
+def run_batch(body):
+    jobs = body.get('jobs') if isinstance(body, dict) else None
+    if not isinstance(jobs, list):
+        raise BadRequest("jobs list is required")
+    jobs = [parse_job(number, row) for number, row in enumerate(jobs, 1)]
+    _check_count(sum(job.count for job in jobs) or 1)
+    results = []
+    served = 0
+    for job in jobs:
+        result = {'job': job.number, 'id': job.id}
+        error = job.error
+        if error is None:
+            try:
+                result['addresses'] = registry.get(job.network).get_addresses(
+                    job.xpub, job.prefix, job.start, job.count
+                )
+                served += job.count
+            except Exception as e:
+                # A failing job must not abort the rest of the batch
+                error = str(e) or e.__class__.__name__
+        if error is not None:
+            result['error'] = error
+        results.append(result)
+    return {'results': results}, served
+
+
+GET_ROUTES = {
+    '/address': get_address,
+    '/addresses': get_addresses,
+}
+
+
+class AddressRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    server_version = 'coinaddress'
+
+    def log_message(self, format, *args):
+        # Requests are accounted in /metrics instead of the access log
+        pass
+
+    def address_string(self):
+        # Unix socket clients have no address
+        if isinstance(self.client_address, tuple):
+            return self.client_address[0]
+        return 'unix'
+
+    def send_json(self, status, payload):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def handle_route(self, endpoint, func, *args):
+        started = time.perf_counter()
+        metrics = self.server.metrics
+        try:
+            payload, served = func(*args)
+        except (ValueError, RuntimeError) as e:
+            metrics.record(endpoint, time.perf_counter() - started, error=True)
+            self.send_json(400, {'error': str(e)})
+            return
+        except Exception:
+            metrics.record(endpoint, time.perf_counter() - started, error=True)
+            self.send_json(500, {'error': "Internal server error"})
+            return
+        metrics.record(endpoint, time.perf_counter() - started, served)
+        self.send_json(200, payload)
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        if url.path == '/metrics':
+            self.send_json(200, self.server.metrics.snapshot())
+            return
+        func = GET_ROUTES.get(url.path)
+        if func is None:
+            self.send_json(404, {'error': "Not found"})
+            return
+        params = {
+            name: values[-1]
+            for name, values in parse_qs(url.query).items()
+        }
+        self.handle_route(url.path, func, params)
+
+    def do_POST(self):
+        url = urlsplit(self.path)
+        try:
+            length = _get_int(self.headers, 'Content-Length', 0)
+            if length < 0:
+                raise BadRequest("Invalid Content-Length %d" % length)
+        except BadRequest as e:
+            # The body can't be skipped, so the connection can't be reused
+            self.close_connection = True
+            self.send_json(400, {'error': str(e)})
+            return
+        if length > MAX_BODY_SIZE:
+            self.close_connection = True
+            self.send_json(413, {
+                'error': "Request body can't exceed %d bytes" % MAX_BODY_SIZE
+            })
+            return
+        data = self.rfile.read(length)
+        if url.path != '/batch':
+            self.send_json(404, {'error': "Not found"})
+            return
+        try:
+            body = json.loads(data.decode('utf-8') or 'null')
+        except ValueError as e:
+            self.send_json(400, {'error': "Invalid JSON: %s" % e})
+            return
+        self.handle_route(url.path, run_batch, body)
+
+
+class ThreadingHTTPServer(socketserver.ThreadingMixIn, HTTPServer):
+    # http.server has it only since Python 3.7
+    daemon_threads = True
+
+
+def _socket_id(path):
+    try:
+        info = os.lstat(path)
+    except FileNotFoundError:
+        return None
+    if not stat.S_ISSOCK(info.st_mode):
+        raise ValueError("%s exists and is not a socket" % path)
+    return info.st_dev, info.st_ino
+
+
+class UnixHTTPServer(socketserver.ThreadingMixIn,
+                     socketserver.UnixStreamServer):
+    """Server on a Unix socket file, removed again on close.
+
+    A socket file left by a crashed server is replaced, but other files
+    and sockets with a server listening on them are never touched.
+    """
+    daemon_threads = True
+    _created = None
+
+    def server_bind(self):
+        path = self.server_address
+        if _socket_id(path) is not None:
+            probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                probe.connect(path)
+            except OSError:
+                os.unlink(path)
+            else:
+                raise ValueError("%s is in use by another server" % path)
+            finally:
+                probe.close()
+        super().server_bind()
+        self._created = _socket_id(path)
+        self.server_name = 'localhost'
+        self.server_port = 0
+
+    def server_close(self):
+        super().server_close()
+        # The file may have been replaced by another server meanwhile
+        try:
+            created = self._created is not None and (
+                _socket_id(self.server_address) == self._created
+            )
+        except ValueError:
+            created = False
+        if created:
+            os.unlink(self.server_address)
+        self._created = None
+
+
+def make_server(host: str = '127.0.0.1', port: int = 8080,
+                unix_socket: str = None):
+    """Create a server, call ``serve_forever()`` on it to run.
+
+    The server listens on ``unix_socket`` if it's given and on
+    ``host:port`` otherwise. Its metrics are in ``server.metrics``.
+    """
+    if unix_socket is not None:
+        if not hasattr(socket, 'AF_UNIX'):
+            raise ValueError("Unix sockets are not supported")
+        server = UnixHTTPServer(unix_socket, AddressRequestHandler)
+    else:
+        server = ThreadingHTTPServer((host, port), AddressRequestHandler)
+    server.metrics = Metrics()
+    return server
@@ -0,0 +1,144 @@
+"""Opt-in per-stage call counters and timings.
+
+Instrumentation works by replacing stage methods with timed wrappers on
+:func:`enable` and restoring the originals on :func:`disable`, so it costs
+nothing while disabled. Instrumented stages:
+
+* ``deserialize_xpub`` -- xpub decoding
+* ``get_child`` -- child key derivation
+* ``public_key_to_address`` -- hashing and encoding of a derived key
+* ``public_key_hash`` -- hashing of a derived key
+* ``encode_address.<Network>`` -- address encoder of every network
+* ``hash_public_keys`` -- bulk hashing of a chunk of derived keys
+* ``encode_payloads.<Network>`` -- bulk address encoder of every network
+"""
+import threading
+import time
+from contextlib import contextmanager
+
+_lock = threading.Lock()
+_local = threading.local()
+_counters = {}
+_patched = []
+
+
+def _record(stage: str, elapsed: float):
+    with _lock:
+        counter = _counters.get(stage)
+        if counter is None:
+            counter = _counters[stage] = [0, 0.0]
+        counter[0] += 1
+        counter[1] += elapsed
+
+
+def _timed(method, stage=None):
+    """Wrap method into a timed one.
+
+    Without ``stage`` the stage is ``<method>.<class of self>``. Nested calls
+    of the same stage (``super()`` calls) are counted once.
+    """
+    name = method.__name__
+
+    def wrapper(self, *args, **kwargs):
+        key = stage or '%s.%s' % (name, type(self).__name__)
+        active = getattr(_local, 'active', None)
+        if active is None:
+            active = _local.active = set()
+        if key in active:
+            return method(self, *args, **kwargs)
+        active.add(key)
+        started = time.perf_counter()
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            _record(key, time.perf_counter() - started)
+            active.discard(key)
+
+    wrapper.__name__ = name
+    wrapper.__doc__ = method.__doc__
+    wrapper.__wrapped__ = method
+    return wrapper
+
+
+def _subclasses(cls):
+    yield cls
+    for subclass in cls.__subclasses__():
+        yield from _subclasses(subclass)
+
+
+def _targets():
+    from .keys import PublicKey
+    from .networks import registry
+    from .networks.base import BaseNetwork
+
+    # Network modules are imported on their first registry lookup, import
+    # all of them so every class is patched
+    registry.load_all()
+    yield PublicKey, 'get_child', 'get_child'
+    for cls in _subclasses(BaseNetwork):
+        for attr in ('deserialize_xpub', 'public_key_to_address',
+                     'public_key_hash', 'hash_public_keys'):
+            if attr in cls.__dict__:
+                yield cls, attr, attr
+        for attr in ('encode_address', 'encode_payloads'):
+            if attr in cls.__dict__:
+                yield cls, attr, None
+
+
+def _patch(cls, attr, stage):
+    original = cls.__dict__[attr]
+    setattr(cls, attr, _timed(original, stage))
+    _patched.append((cls, attr, original))
+
+
+def is_enabled() -> bool:
+    return bool(_patched)
+
+
+def enable():
+    """Start collecting stage counters."""
+    with _lock:
+        if _patched:
+            return
+        for cls, attr, stage in list(_targets()):
+            _patch(cls, attr, stage)
+
+
+def disable():
+    """Stop collecting counters, collected values are kept."""
+    with _lock:
+        while _patched:
+            cls, attr, original = _patched.pop()
+            setattr(cls, attr, original)
+
+
+def reset():
+    with _lock:
+        _counters.clear()
+
+
+def snapshot() -> dict:
+    """Get counters as ``{stage: {'calls', 'total_seconds', 'avg_us'}}``."""
+    with _lock:
+        return {
+            stage: {
+                'calls': calls,
+                'total_seconds': total,
+                'avg_us': total / calls * 1e6 if calls else 0.0,
+            }
+            for stage, (calls, total) in sorted(_counters.items())
+        }
+
+
+@contextmanager
+def collect():
+    """Collect counters within the block.
+
+    Counters are reset on enter, read them with :func:`snapshot`.
+    """
+    reset()
+    enable()
+    try:
+        yield
+    finally:
+        disable()
@@ -0,0 +1,349 @@
+"""Optional persistent store of derived addresses and intermediate nodes.
+
+The store is a SQLite database in WAL mode, so any number of processes can
+read it while one of them writes. Once selected with :func:`set_store`,
+networks consult it transparently: ``get_address``, ``get_addresses`` and
+``iter_addresses`` return stored addresses and save newly derived ones, and
+``get_node`` saves intermediate nodes as chain code and compressed public
+key.
+
+Entries are keyed by network, xpub fingerprint and path. The fingerprint is
+a digest of the xpub string, so xpub strings are not written to disk, but
+a stored node is as sensitive as an xpub: its chain code and public key
+derive every address below it. Pass ``persist_nodes=False`` to keep only
+addresses on disk.
+"""
+import hashlib
+import os
+import threading
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from .backends import get_backend
+from .keys import DEFAULT_CHUNK_SIZE, PublicKey
+
+#: Default cap of stored addresses and, separately, of stored nodes.
+DEFAULT_MAX_ENTRIES = 10000000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS addresses (
+    network TEXT NOT NULL,
+    fingerprint BLOB NOT NULL,
+    prefix TEXT NOT NULL,
+    idx INTEGER NOT NULL,
+    address TEXT NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS addresses_key
+    ON addresses (network, fingerprint, prefix, idx);
+CREATE TABLE IF NOT EXISTS nodes (
+    fingerprint BLOB NOT NULL,
+    path TEXT NOT NULL,
+    chain_code BLOB NOT NULL,
+    public_key BLOB NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS nodes_key ON nodes (fingerprint, path);
+"""
+
+_active = None
+
+
+def xpub_fingerprint(xpub: str) -> bytes:
+    """16 bytes digest of xpub string identifying it in the store.
+
+    Not to be confused with the BIP32 key fingerprint, which is only
+    4 bytes long.
+    """
+    return hashlib.sha256(xpub.encode('ascii')).digest()[:16]
+
+
+class DerivationStore:
+    """SQLite store of derived addresses and nodes in ``path``.
+
+    ``max_entries`` caps number of stored addresses and nodes, the oldest
+    entries are evicted first. ``verify_rate`` is the share of reads (0 to 1)
+    checked against fresh derivation; mismatching entries are replaced and
+    counted in :meth:`stats`. Intermediate nodes are derived every time
+    without ``persist_nodes``.
+    """
+
+    def __init__(self, path: str, max_entries: int = DEFAULT_MAX_ENTRIES,
+                 verify_rate: float = 0.0, timeout: float = 5.0,
+                 persist_nodes: bool = True):
+        if max_entries < 1:
+            raise ValueError("max_entries can't be less than 1")
+        if not 0 <= verify_rate <= 1:
+            raise ValueError("verify_rate must be between 0 and 1")
+        self._setup(path, max_entries, verify_rate, timeout, persist_nodes)
+        self._connect()
+
+    def _setup(self, path, max_entries, verify_rate, timeout,
+               persist_nodes=True):
+        self.path = path
+        self.max_entries = max_entries
+        self.verify_rate = verify_rate
+        self.timeout = timeout
+        self.persist_nodes = persist_nodes
+        self.hits = 0
+        self.misses = 0
+        self.mismatches = 0
+        self._lock = threading.Lock()
+        self._connection = None
+        self._pid = None
+
+    def _connect(self):
+        import sqlite3
+        connection = sqlite3.connect(
+            self.path, timeout=self.timeout, check_same_thread=False,
+            isolation_level=None,
+        )
+        connection.execute('PRAGMA journal_mode=WAL')
+        connection.execute('PRAGMA synchronous=NORMAL')
+        connection.executescript(_SCHEMA)
+        self._connection = connection
+        self._pid = os.getpid()
+
+    def __getstate__(self):
+        return {
+            'path': self.path, 'max_entries': self.max_entries,
+            'verify_rate': self.verify_rate, 'timeout': self.timeout,
+            'persist_nodes': self.persist_nodes,
+        }
+
+    def __setstate__(self, state):
+        # Connected on first use, worker processes get a pickled copy
+        self._setup(**state)
+
+    @property
+    def connection(self):
+        # SQLite connections can't be shared with forked children
+        if self._connection is None or self._pid != os.getpid():
+            self._connect()
+        return self._connection
+
+    def close(self):
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+            self._pid = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _verify(self) -> bool:
+        if not self.verify_rate:
+            return False
+        import random
+        return random.random() < self.verify_rate
+
+    def _write(self, statement: str, rows, table: str):
+        with self._lock:
+            connection = self.connection
+            connection.execute('BEGIN IMMEDIATE')
+            try:
+                connection.executemany(statement, rows)
+                # Entries are evicted oldest first and replaced only on
+                # mismatch, so the rowid span is a cheap bound of the count.
+                low, high = connection.execute(
+                    'SELECT min(rowid), max(rowid) FROM %s' % table
+                ).fetchone()
+                if low is not None and high - low + 1 > self.max_entries:
+                    connection.execute(
+                        'DELETE FROM %s WHERE rowid <= ?' % table,
+                        (high - self.max_entries,)
+                    )
+                connection.execute('COMMIT')
+            except BaseException:
+                connection.execute('ROLLBACK')
+                raise
+
+    def _put_addresses(self, network: str, fingerprint: bytes, prefix: str,
+                       addresses: Dict[int, str]):
+        self._write(
+            'INSERT OR REPLACE INTO addresses '
+            '(network, fingerprint, prefix, idx, address) '
+            'VALUES (?, ?, ?, ?, ?)',
+            [
+                (network, fingerprint, prefix, index, address)
+                for index, address in addresses.items()
+            ],
+            'addresses',
+        )
+
+    def _get_addresses(self, network: str, fingerprint: bytes, prefix: str,
+                       start: int, stop: int) -> Dict[int, str]:
+        with self._lock:
+            rows = self.connection.execute(
+                'SELECT idx, address FROM addresses WHERE network = ? AND '
+                'fingerprint = ? AND prefix = ? AND idx >= ? AND idx < ?',
+                (network, fingerprint, prefix, start, stop)
+            ).fetchall()
+        return dict(rows)
+
+    def get_address(self, network: str, xpub: str, path: str,
+                    derive: Callable[[], str]) -> str:
+        """Get stored address or ``derive`` and store it."""
+        prefix, _, index = path.rpartition('/')
+        index = int(index)
+        fingerprint = xpub_fingerprint(xpub)
+        address = self._get_addresses(
+            network, fingerprint, prefix, index, index + 1
+        ).get(index)
+        if address is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+            if not self._verify():
+                return address
+        derived = derive()
+        if derived != address:
+            if address is not None:
+                self.mismatches += 1
+            self._put_addresses(network, fingerprint, prefix, {index: derived})
+        return derived
+
+    def iter_addresses(self, network: str, xpub: str, prefix: str,
+                       start: int, stop: Optional[int],
+                       derive: Callable[[int, int], List[str]],
+                       chunk_size: int = DEFAULT_CHUNK_SIZE
+                       ) -> Iterator[Tuple[int, str]]:
+        """Yield ``(index, address)`` pairs, deriving missing chunks.
+
+        ``derive(start, stop)`` returns addresses of the index range. Chunks
+        of ``chunk_size`` addresses are read from the store and derived as a
+        whole unless all of their addresses are stored.
+        """
+        fingerprint = xpub_fingerprint(xpub)
+        index = start
+        while stop is None or index < stop:
+            end = index + chunk_size
+            if stop is not None:
+                end = min(end, stop)
+            stored = self._get_addresses(
+                network, fingerprint, prefix, index, end
+            )
+            self.hits += len(stored)
+            self.misses += end - index - len(stored)
+            if len(stored) == end - index and not self._verify():
+                addresses = [stored[i] for i in range(index, end)]
+            else:
+                addresses = derive(index, end)
+                changed = {
+                    i: address
+                    for i, address in enumerate(addresses, index)
+                    if stored.get(i) != address
+                }
+                self.mismatches += sum(1 for i in changed if i in stored)
+                if changed:
+                    self._put_addresses(
+                        network, fingerprint, prefix, changed
+                    )
+            yield from enumerate(addresses, index)
+            index = end
+
+    def get_node(self, xpub: str, path: str,
+                 derive: Callable[[], PublicKey]) -> PublicKey:
+        """Get stored node or ``derive`` and store it."""
+        if not self.persist_nodes:
+            return derive()
+        fingerprint = xpub_fingerprint(xpub)
+        with self._lock:
+            row = self.connection.execute(
+                'SELECT chain_code, public_key FROM nodes '
+                'WHERE fingerprint = ? AND path = ?', (fingerprint, path)
+            ).fetchone()
+        if row is not None:
+            self.hits += 1
+            chain_code, public_key = row
+            if not self._verify():
+                backend = get_backend()
+                return PublicKey(
+                    chain_code=chain_code, point=backend.decode(public_key),
+                    trusted=True, backend=backend,
+                )
+        else:
+            self.misses += 1
+        node = derive()
+        if row != (node.chain_code, node.compressed):
+            if row is not None:
+                self.mismatches += 1
+            self._write(
+                'INSERT OR REPLACE INTO nodes '
+                '(fingerprint, path, chain_code, public_key) '
+                'VALUES (?, ?, ?, ?)',
+                [(fingerprint, path, node.chain_code, node.compressed)],
+                'nodes',
+            )
+        return node
+
+    def verify(self, network, xpub: str, prefix: str = '',
+               sample: int = 100) -> List[str]:
+        """Check up to ``sample`` random stored addresses of xpub.
+
+        Addresses are derived from scratch, ignoring stored nodes.
+        Mismatching entries are replaced, their paths are returned.
+        """
+        fingerprint = xpub_fingerprint(xpub)
+        with self._lock:
+            rows = self.connection.execute(
+                'SELECT idx, address FROM addresses WHERE network = ? AND '
+                'fingerprint = ? AND prefix = ? ORDER BY random() LIMIT ?',
+                (network.store_key, fingerprint, prefix, sample)
+            ).fetchall()
+        if not rows:
+            return []
+        node = network.get_root(xpub)
+        if prefix:
+            node = node.get_child_from_path(prefix)
+        bad = {}
+        for index, address in rows:
+            derived = network.public_key_to_address(node.get_child(index))
+            if derived != address:
+                bad[index] = derived
+        if bad:
+            self.mismatches += len(bad)
+            self._put_addresses(network.store_key, fingerprint, prefix, bad)
+        return [
+            '%s/%d' % (prefix, index) if prefix else str(index)
+            for index in sorted(bad)
+        ]
+
+    def clear(self):
+        with self._lock:
+            self.connection.execute('DELETE FROM addresses')
+            self.connection.execute('DELETE FROM nodes')
+
+    def stats(self) -> dict:
+        with self._lock:
+            addresses, = self.connection.execute(
+                'SELECT count(*) FROM addresses'
+            ).fetchone()
+            nodes, = self.connection.execute(
+                'SELECT count(*) FROM nodes'
+            ).fetchone()
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'mismatches': self.mismatches,
+            'addresses': addresses,
+            'nodes': nodes,
+            'max_entries': self.max_entries,
+        }
+
+
+def set_store(store: Optional[DerivationStore]):
+    """Select the store consulted by networks, ``None`` disables it."""
+    global _active
+    _active = store
+
+
+def get_store() -> Optional[DerivationStore]:
+    return _active
+
+
+def open_store(path: str, **kwargs) -> DerivationStore:
+    """Open the store in ``path`` and select it, see :class:`DerivationStore`."""
+    store = DerivationStore(path, **kwargs)
+    set_store(store)
+    return store
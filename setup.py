@@ -12,8 +12,7 @@ with open('HISTORY.rst') as history_file:
 
 requirements = [
     'Click>=7.0',
-    'ecdsa>=0.14.1',
-    'base58>=1.0.3',
+    'ecdsa>=0.15',
     'crypto>=1.4.1',
     ## 'pysha3>=1.0.2', python -m pip install pysha3 is the ONLY way that pysha3 should be installed. not this current way.
 ]
@@ -44,6 +43,10 @@ setup(
         ],
     },
     install_requires=requirements,
+    extras_require={
+        'native': ['coincurve>=13.0'],
+        'numpy': ['numpy>=1.17'],
+    },
     license="MIT license",
     long_description=readme + '\n\n' + history,
     include_package_data=True,
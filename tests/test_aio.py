@@ -0,0 +1,172 @@
+"""Tests for `coinaddress.aio` module."""
+import asyncio
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import pytest
+
+from coinaddress import aio
+
+from .test_coinaddress import SAMPLES
+
+XPUB = SAMPLES[0].xpub
+ADDRESSES = SAMPLES[0].addresses
+
+
+def run(coroutine):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.run_until_complete(loop.shutdown_asyncgens())
+        loop.close()
+
+
+@pytest.fixture
+def calls(monkeypatch):
+    """Record bulk derivation calls of micro-batches."""
+    calls = []
+    derive = aio._derive_addresses
+
+    def wrapper(network, xpub, prefix, indices):
+        calls.append(indices)
+        return derive(network, xpub, prefix, indices)
+    monkeypatch.setattr(aio, '_derive_addresses', wrapper)
+    return calls
+
+
+def test_aget_address():
+    assert run(aio.aget_address('bitcoin', XPUB, '0/1')) == ADDRESSES[1]
+
+
+def test_aget_addresses():
+    assert run(aio.aget_addresses('BTC', XPUB, '0', 0, 3)) == ADDRESSES
+
+
+def test_aiter_addresses():
+    async def collect(stop):
+        return [
+            pair async for pair in aio.aiter_addresses(
+                'bitcoin', XPUB, '0', 0, stop, chunk_size=2
+            )
+        ]
+    assert run(collect(3)) == list(enumerate(ADDRESSES))
+
+
+def test_aiter_addresses_forever():
+    async def first(count):
+        result = []
+        async for index, address in aio.aiter_addresses(
+                'bitcoin', XPUB, '0', 1, chunk_size=1):
+            result.append(address)
+            if len(result) == count:
+                break
+        return result
+    assert run(first(2)) == ADDRESSES[1:]
+
+
+def test_micro_batching(calls):
+    deriver = aio.AsyncDeriver(batch_delay=0.01)
+
+    async def main():
+        return await asyncio.gather(*[
+            deriver.get_address('bitcoin', XPUB, '0/%d' % i)
+            for i in (2, 0, 1, 0, 2)
+        ])
+    assert run(main()) == [ADDRESSES[i] for i in (2, 0, 1, 0, 2)]
+    assert calls == [[0, 1, 2]]
+
+
+def test_max_batch(calls):
+    deriver = aio.AsyncDeriver(batch_delay=0.01, max_batch=2)
+
+    async def main():
+        return await asyncio.gather(*[
+            deriver.get_address('bitcoin', XPUB, '0/%d' % i) for i in range(3)
+        ])
+    assert run(main()) == ADDRESSES
+    assert calls == [[0, 1], [2]]
+
+
+def test_coalescing(monkeypatch):
+    calls = []
+    get_addresses = aio._get_addresses
+
+    def wrapper(*args):
+        calls.append(args)
+        return get_addresses(*args)
+    monkeypatch.setattr(aio, '_get_addresses', wrapper)
+
+    async def main():
+        return await asyncio.gather(*[
+            aio.aget_addresses('bitcoin', XPUB, '0', 0, 3) for _ in range(5)
+        ])
+    assert run(main()) == [ADDRESSES] * 5
+    assert len(calls) == 1
+
+
+def test_batch_sparse_indices():
+    assert aio._derive_addresses('bitcoin', XPUB, '0', [0, 2]) == [
+        ADDRESSES[0], ADDRESSES[2]
+    ]
+
+
+def test_invalid_index_not_batched(calls):
+    deriver = aio.AsyncDeriver(batch_delay=0.01)
+
+    async def main():
+        return await asyncio.gather(
+            deriver.get_address('bitcoin', XPUB, '0/1'),
+            deriver.get_address('bitcoin', XPUB, '0/2147483648'),
+            return_exceptions=True,
+        )
+    valid, invalid = run(main())
+    assert valid == ADDRESSES[1]
+    assert isinstance(invalid, ValueError)
+    assert calls == [[1]]
+
+
+def test_batch_failing_run(monkeypatch):
+    get_addresses = aio._get_network('bitcoin').get_addresses
+
+    def fail_second_run(xpub, prefix, start, count):
+        if start == 2:
+            raise ValueError("boom")
+        return get_addresses(xpub, prefix, start, count)
+    monkeypatch.setattr(
+        aio._get_network('bitcoin'), 'get_addresses', fail_second_run
+    )
+    first, second = aio._derive_addresses('bitcoin', XPUB, '0', [0, 2])
+    assert first == ADDRESSES[0]
+    assert isinstance(second, ValueError)
+
+
+@pytest.mark.parametrize("executor", [ThreadPoolExecutor, ProcessPoolExecutor])
+def test_executor(executor):
+    with executor(max_workers=1) as pool:
+        deriver = aio.AsyncDeriver(executor=pool)
+
+        async def main():
+            return await asyncio.gather(
+                deriver.get_address('bitcoin', XPUB, '0/0'),
+                deriver.get_address('bitcoin', XPUB, '0/1'),
+                deriver.get_addresses('bitcoin', XPUB, '0', 2, 1),
+            )
+        assert run(main()) == [ADDRESSES[0], ADDRESSES[1], [ADDRESSES[2]]]
+
+
+def test_errors():
+    with pytest.raises(ValueError):
+        run(aio.aget_address('unknown', XPUB, '0'))
+    with pytest.raises(RuntimeError):
+        run(aio.aget_address('bitcoin', XPUB, "0/1'"))
+    with pytest.raises(ValueError):
+        run(aio.aget_address('bitcoin', XPUB[:-1], '0/1'))
+
+
+def test_configure():
+    try:
+        deriver = aio.configure(max_batch=1)
+        assert aio.default_deriver is deriver
+        assert run(aio.aget_address('bitcoin', XPUB, '0/0')) == ADDRESSES[0]
+    finally:
+        aio.configure()
@@ -0,0 +1,72 @@
+"""Differential tests for `coinaddress.backends`."""
+import pytest
+
+from coinaddress import backends
+from coinaddress.backends import (
+    available_backends,
+    get_backend,
+    load_backend,
+    set_backend,
+)
+
+from .test_coinaddress import SAMPLES
+
+
+@pytest.fixture(params=list(backends.BACKENDS))
+def backend(request):
+    try:
+        selected = set_backend(request.param)
+    except backends.BackendNotAvailable as e:
+        pytest.skip(str(e))
+    yield selected
+    set_backend()
+
+
+@pytest.mark.parametrize("sample", SAMPLES)
+def test_backends_generate_sample_addresses(backend, sample):
+    prefix = '' if sample.parent is None else f'{sample.parent}'
+    node = sample.network.get_node(sample.xpub, prefix)
+    assert node.backend is backend
+    assert sample.network.get_addresses(
+        sample.xpub, prefix=prefix, count=len(sample.addresses)
+    ) == sample.addresses
+
+
+def test_backends_agree_on_nodes():
+    sample = SAMPLES[0]
+    results = set()
+    for name in available_backends():
+        set_backend(name)
+        node = sample.network.get_node(sample.xpub, '0/5/7')
+        results.add((node.chain_code, node.compressed, node.uncompressed))
+    set_backend()
+    assert len(results) == 1
+
+
+def test_set_backend_from_env(monkeypatch):
+    monkeypatch.setattr(backends, '_current', None)
+    monkeypatch.setenv(backends.ENV_VAR, 'python')
+    assert get_backend().name == 'python'
+    monkeypatch.setenv(backends.ENV_VAR, 'unknown')
+    monkeypatch.setattr(backends, '_current', None)
+    with pytest.raises(ValueError):
+        get_backend()
+
+
+def test_auto_backend_prefers_native():
+    expected = 'coincurve' if 'coincurve' in available_backends() \
+        else 'python'
+    assert set_backend('auto').name == expected
+    assert load_backend('python').name == 'python'
+
+
+def test_command_line_reports_backend():
+    from click.testing import CliRunner
+    from coinaddress import cli
+
+    result = CliRunner().invoke(
+        cli.main, args=['--backend', 'python', '--version']
+    )
+    set_backend()
+    assert result.exit_code == 0
+    assert result.output.endswith('(EC backend: python)\n')
@@ -0,0 +1,61 @@
+"""Tests for `coinaddress.base58` module."""
+import random
+
+import pytest
+
+from coinaddress import base58
+
+PAYLOADS = [
+    b'',
+    b'\0',
+    b'\0\0\x01',
+    b'\x01',
+    b'\xff' * 25,
+    b'\0' * 25,
+] + [
+    b'\0' * (n % 3) + random.Random(n).getrandbits(8 * n).to_bytes(n, 'big')
+    for n in range(1, 40)
+]
+
+
+@pytest.mark.parametrize("codec", [base58.bitcoin, base58.ripple])
+@pytest.mark.parametrize("payload", PAYLOADS)
+def test_matches_reference_implementation(codec, payload):
+    reference = pytest.importorskip('base58')
+    alphabet = codec.alphabet.encode()
+    assert codec.encode(payload) == \
+        reference.b58encode(payload, alphabet=alphabet).decode()
+    assert codec.encode_check(payload) == \
+        reference.b58encode_check(payload, alphabet=alphabet).decode()
+
+
+@pytest.mark.parametrize("codec", [base58.bitcoin, base58.ripple])
+@pytest.mark.parametrize("payload", PAYLOADS)
+def test_roundtrip(codec, payload):
+    assert codec.decode(codec.encode(payload)) == payload
+    assert codec.decode_check(codec.encode_check(payload)) == payload
+
+
+def test_encode_many():
+    assert base58.bitcoin.encode_many(PAYLOADS) == [
+        base58.bitcoin.encode(p) for p in PAYLOADS
+    ]
+    assert base58.bitcoin.encode_check_many(PAYLOADS) == [
+        base58.bitcoin.encode_check(p) for p in PAYLOADS
+    ]
+
+
+@pytest.mark.parametrize("encoded", [
+    '0OIl', 'abc!', 'привет',
+    # valid characters, broken checksum
+    '13V8eaCtzrrkSeJRDgKL5MC1cLSTvfFryh',
+    '1',
+])
+def test_decode_check_invalid(encoded):
+    with pytest.raises(ValueError):
+        base58.bitcoin.decode_check(encoded)
+
+
+def test_invalid_alphabet():
+    with pytest.raises(ValueError):
+        base58.Base58Codec('abc')
@@ -0,0 +1,28 @@
+"""Smoke tests keeping benchmark cases in sync with the package."""
+import json
+
+import pytest
+
+from benchmarks import cases, runner  # noqa: F401, cases register on import
+
+
+@pytest.mark.parametrize("name", list(runner.CASES))
+def test_case_runs(name):
+    setup, _ = runner.CASES[name]
+    try:
+        func = setup()
+    except ImportError as e:
+        pytest.skip(str(e))
+    func(0)
+    func(1)
+
+
+def test_save_and_compare(tmp_path, capsys):
+    baseline = str(tmp_path / 'base.json')
+    args = ['hash.*', '--min-time', '0.001', '--repeat', '1']
+    assert runner.main(args + ['--save', baseline]) == 0
+    with open(baseline) as f:
+        report = json.load(f)
+    assert set(report['results']) == {'hash.hash160', 'hash.keccak256'}
+    assert runner.main(args + ['--compare', baseline, '--threshold', '100']) == 0
+    assert 'baseline us' in capsys.readouterr().out
@@ -0,0 +1,102 @@
+"""Tests for `coinaddress.bulk` module and bulk network encoders."""
+import os
+import random
+
+import pytest
+
+from coinaddress import base58, bulk
+from coinaddress.networks import Bitcoin, BitcoinCash, Ethereum, Litecoin, Ripple
+
+from .test_coinaddress import SAMPLES
+
+NETWORKS = [
+    Bitcoin(), Litecoin(), Ripple(), Ethereum(), BitcoinCash(),
+    BitcoinCash('bchtest'),
+]
+ENGINES = ['python', 'numpy']
+
+
+@pytest.fixture(params=ENGINES)
+def engine(request, monkeypatch):
+    if request.param == 'numpy':
+        pytest.importorskip('numpy')
+        bulk.use_numpy(True)
+        monkeypatch.setattr(bulk, 'NUMPY_MIN_BATCH', 1)
+    else:
+        bulk.use_numpy(False)
+    yield request.param
+    bulk._numpy = None
+
+
+def random_payloads(count, size=bulk.PAYLOAD_SIZE):
+    rnd = random.Random(count)
+    rows = [bytes(rnd.getrandbits(8) for _ in range(size))
+            for _ in range(count)]
+    # Leading zero bytes become leading zero characters in base58
+    rows[0] = bytes(size)
+    rows[1] = bytes(size // 2) + rows[1][size // 2:]
+    rows[2] = b'\xff' * size
+    return rows
+
+
+def test_split():
+    assert [bytes(row) for row in bulk.split(b'abcdef', 2)] == [
+        b'ab', b'cd', b'ef'
+    ]
+    with pytest.raises(ValueError):
+        bulk.split(b'abcde', 2)
+
+
+def test_hash160():
+    net = SAMPLES[0].network
+    children = net.get_node(SAMPLES[0].xpub, '0').get_children(0, 3)
+    keys = b''.join(child.compressed for child in children)
+    assert bulk.hash160(keys) == b''.join(
+        net.public_key_hash(child) for child in children
+    )
+    assert bulk.hash160(b'') == b''
+
+
+@pytest.mark.parametrize('sample', SAMPLES, ids=lambda s: type(s.network).__name__)
+def test_encode_payloads(engine, sample):
+    net = sample.network
+    node = net.get_node(sample.xpub, str(sample.parent))
+    children = node.get_children(0, len(sample.addresses))
+    payloads = net.hash_public_keys(net.public_keys(children))
+    assert payloads == b''.join(map(net.public_key_hash, children))
+    assert net.encode_payloads(payloads) == sample.addresses
+
+
+@pytest.mark.parametrize('net', NETWORKS, ids=lambda n: n.store_key)
+def test_encode_payloads_random(engine, net):
+    rows = random_payloads(200)
+    assert net.encode_payloads(b''.join(rows)) == [
+        net.encode_address(row) for row in rows
+    ]
+    assert net.encode_payloads(b'') == []
+
+
+@pytest.mark.parametrize('size', [1, 21, 33])
+@pytest.mark.parametrize('version', [b'', b'\0', b'\0\0', b'\x30'], ids=bytes.hex)
+def test_encode_check_buffer(engine, size, version):
+    rows = random_payloads(50, size)
+    for codec in (base58.bitcoin, base58.ripple):
+        assert codec.encode_check_buffer(b''.join(rows), size, version) == [
+            codec.encode_check(version + row) for row in rows
+        ]
+
+
+def test_get_addresses_bulk(engine):
+    sample = SAMPLES[0]
+    net = sample.network
+    addresses = net.get_addresses(sample.xpub, '0', 0, 150, chunk_size=64)
+    assert addresses[:3] == sample.addresses
+    assert addresses[149] == net.get_address(sample.xpub, '0/149')
+
+
+def test_numpy_for_small_batches(monkeypatch):
+    monkeypatch.setattr(bulk, '_numpy', os)
+    assert bulk.numpy_for(bulk.NUMPY_MIN_BATCH - 1) is None
+    assert bulk.numpy_for(bulk.NUMPY_MIN_BATCH) is os
+    monkeypatch.setattr(bulk, '_numpy', False)
+    assert bulk.numpy_for(bulk.NUMPY_MIN_BATCH) is None
@@ -0,0 +1,69 @@
+"""Tests for `coinaddress.cache` module."""
+import threading
+
+import pytest
+
+from coinaddress.cache import LRUCache, node_cache
+from coinaddress.networks import Bitcoin
+
+from .test_coinaddress import SAMPLES
+
+XPUB = SAMPLES[0].xpub
+
+
+@pytest.fixture
+def clean_cache():
+    node_cache.clear()
+    node_cache.reset_stats()
+    yield node_cache
+    node_cache.clear()
+    node_cache.reset_stats()
+
+
+def test_lru_eviction():
+    cache = LRUCache(maxsize=2)
+    cache.put('a', 1)
+    cache.put('b', 2)
+    assert cache.get('a') == 1
+    cache.put('c', 3)
+    assert 'b' not in cache
+    assert cache.get('b') is None
+    assert cache.stats() == {
+        'hits': 1, 'misses': 1, 'evictions': 1, 'size': 2, 'maxsize': 2,
+    }
+    cache.maxsize = 1
+    assert len(cache) == 1
+    assert cache.get('c') == 3
+
+
+def test_lru_disabled():
+    cache = LRUCache(maxsize=0)
+    assert cache.get_or_create('a', lambda: 1) == 1
+    assert len(cache) == 0
+
+
+def test_lru_threads():
+    cache = LRUCache(maxsize=50)
+
+    def worker(offset):
+        for i in range(1000):
+            cache.get_or_create((offset + i) % 100, lambda: i)
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    stats = cache.stats()
+    assert stats['size'] == 50
+    assert stats['hits'] + stats['misses'] == 8000
+
+
+def test_network_uses_cache(clean_cache):
+    net = Bitcoin()
+    assert net.get_address(XPUB, '0/0') == SAMPLES[0].addresses[0]
+    assert (net.__class__, XPUB) in clean_cache
+    assert (XPUB, '0') in clean_cache
+    hits = clean_cache.hits
+    assert net.get_address(XPUB, '0/1') == '196abnx7BmQaFTdehipiMBUD9JMjacF5ES'
+    assert clean_cache.hits == hits + 1
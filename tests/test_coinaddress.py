@@ -1,6 +1,8 @@
 #!/usr/bin/env python
 
 """Tests for `coinaddress` package."""
+from itertools import islice
+
 import pytest
 
 from click.testing import CliRunner
@@ -9,9 +11,10 @@ from coinaddress.networks.base import (
     BaseNetwork,
 )
 
-from coinaddress import cli
+from coinaddress import addresses_from_xpub, cli, iter_addresses_from_xpub
 from typing import List, Optional
 
+from coinaddress.networks import bitcoin_cash, ethereum
 from coinaddress.networks import (
     Bitcoin,
     BitcoinCash,
@@ -33,6 +36,21 @@ def test_command_line_interface():
     assert result.output == '13V8eaCtzrrkSeJRDgKL5MC1cLSTvfFryg\n'
 
 
+def test_command_line_interface_number():
+    runner = CliRunner()
+    result = runner.invoke(
+        cli.main,
+        args='bitcoin --xpub xpub6DS28deyJ4Ytx1MNsLY9ehvNo7XPRA8keE11XQJ7dJqNfE'
+             '8zLcbyMq1CVL4iq2aDPMPzZqr35JkQYKHHUvzKSPSBsqrBAXP28DwyePz7dh8 0/1 '
+             '-n 2'
+    )
+    assert result.exit_code == 0
+    assert result.output == (
+        '196abnx7BmQaFTdehipiMBUD9JMjacF5ES\n'
+        '13CCYbDjnhF5r7HcZbhtc1fg3UEkfs2DLW\n'
+    )
+
+
 class SampleAddress:
     network: BaseNetwork
     xpub: str
@@ -47,7 +65,7 @@ class SampleAddress:
         self.parent = parent
 
 
-@pytest.mark.parametrize("sample", [
+SAMPLES = [
     SampleAddress(
         Bitcoin(),
         'xpub6DS28deyJ4Ytx1MNsLY9ehvNo7XPRA8keE11XQJ7dJqNfE8zLcbyMq1CVL4iq2aDP'
@@ -103,7 +121,10 @@ class SampleAddress:
         ],
         0
     )
-])
+]
+
+
+@pytest.mark.parametrize("sample", SAMPLES)
 def test_generate_address(sample):
     for i, sample_address in enumerate(sample.addresses):
         path = f'{i}'
@@ -117,3 +138,148 @@ def test_generate_address(sample):
             "(%s child, %s parent)" % (
                 address, sample.network, sample_address, i, sample.parent
             )
+
+
+@pytest.mark.parametrize("sample", SAMPLES)
+def test_generate_addresses(sample):
+    prefix = '' if sample.parent is None else f'{sample.parent}'
+    addresses = sample.network.get_addresses(
+        sample.xpub, prefix=prefix, start=0, count=len(sample.addresses)
+    )
+    assert addresses == sample.addresses
+    assert sample.network.get_addresses(
+        sample.xpub, prefix=prefix, start=1, count=2
+    ) == sample.addresses[1:]
+
+
+def test_addresses_from_xpub():
+    sample = SAMPLES[0]
+    assert addresses_from_xpub(
+        'bitcoin', sample.xpub, prefix='0', count=3
+    ) == sample.addresses
+
+
+@pytest.mark.parametrize("sample", SAMPLES)
+def test_iter_addresses(sample):
+    prefix = '' if sample.parent is None else f'{sample.parent}'
+    addresses = sample.network.iter_addresses(
+        sample.xpub, prefix=prefix, start=1, chunk_size=2
+    )
+    assert list(islice(addresses, 2)) == [
+        (1, sample.addresses[1]), (2, sample.addresses[2]),
+    ]
+
+
+def test_iter_addresses_from_xpub():
+    sample = SAMPLES[0]
+    assert list(iter_addresses_from_xpub(
+        'bitcoin', sample.xpub, prefix='0', stop=3
+    )) == list(enumerate(sample.addresses))
+
+
+@pytest.mark.parametrize("prefix, version, expected", [
+    ('bitcoincash', 0,
+     'bitcoincash:qr6m7j9njldwwzlg9v7v53unlr4jkmx6eylep8ekg2'),
+    ('bchtest', 8, 'bchtest:pr6m7j9njldwwzlg9v7v53unlr4jkmx6eyvwc0uz5t'),
+    ('pref', 8, 'pref:pr6m7j9njldwwzlg9v7v53unlr4jkmx6ey65nvtks5'),
+    ('prefix', 120, 'prefix:0r6m7j9njldwwzlg9v7v53unlr4jkmx6ey3qnjwsrf'),
+])
+def test_cashaddr_encode(prefix, version, expected):
+    payload = bytes.fromhex('F5BF48B397DAE70BE82B3CCA4793F8EB2B6CDAC9')
+    assert bitcoin_cash.encode(prefix, version, payload) == expected
+    # the original generic implementation agrees
+    data = bitcoin_cash.convertbits([version] + list(payload), 8, 5)
+    checksum = bitcoin_cash.calculate_checksum(prefix, data)
+    assert prefix + ':' + bitcoin_cash.b32encode(data + checksum) == expected
+
+
+def test_bitcoin_cash_prefixes():
+    payload = bytes(range(20))
+    assert BitcoinCash('bchtest').encode_address(payload).startswith(
+        'bchtest:q'
+    )
+    assert BitcoinCash('bchreg').encode_address(payload).startswith('bchreg:')
+    with pytest.raises(ValueError):
+        BitcoinCash('bitcoin')
+
+
+@pytest.mark.parametrize("sample", SAMPLES)
+def test_encode_addresses(sample):
+    net = sample.network
+    prefix = '' if sample.parent is None else f'{sample.parent}'
+    node = net.get_node(sample.xpub, prefix)
+    payloads = [
+        net.public_key_hash(child)
+        for child in node.get_children(0, len(sample.addresses))
+    ]
+    assert net.encode_addresses(payloads) == sample.addresses
+
+
+@pytest.mark.parametrize("address", [
+    '0x5aAeb6053F3E94C9b9A09f33669435E7Ef1BeAed',
+    '0xfB6916095ca1df60bB79Ce92cE3Ea74c37c5d359',
+    '0xdbF03B407c01E7cD3CBea99509d93f8DDDC8C6FB',
+    '0xD1220A0cf47c7B9Be7A2E6BA89F429762e7b9aDb',
+])
+def test_eip55_checksum(address):
+    assert ethereum.checksum_encode(bytes.fromhex(address[2:])) == address
+    assert ethereum.to_checksum_address(address.lower()) == address
+
+
+def test_ethereum_encode_public_keys():
+    sample = SAMPLES[2]
+    children = sample.network.get_node(sample.xpub, '0').get_children(0, 3)
+    public_keys = [child.uncompressed for child in children]
+    assert ethereum.encode_public_keys(public_keys) == sample.addresses
+    raw = ethereum.encode_public_keys(public_keys, raw=True)
+    assert ['0x' + account.hex() for account in raw] == [
+        address.lower() for address in sample.addresses
+    ]
+
+
+@pytest.mark.parametrize("sample", SAMPLES)
+def test_decode_address(sample):
+    net = sample.network
+    for address in sample.addresses:
+        assert net.encode_address(net.decode_address(address)) == address
+
+
+@pytest.mark.parametrize("network, address", [
+    (Bitcoin(), 'LTqXoPy3Bc5ErEUtFm5XodQPYr3e38kHWx'),
+    (Bitcoin(), '13V8eaCtzrrkSeJRDgKL5MC1cLSTvfFryh'),
+    (Ripple(), '13V8eaCtzrrkSeJRDgKL5MC1cLSTvfFryg'),
+    (BitcoinCash(), 'bitcoincash:qzgs5gl6z7xxy39ccaz5kfrd8uwt7mzuhgku2maenn'),
+    (BitcoinCash(), 'bchtest:qzgs5gl6z7xxy39ccaz5kfrd8uwt7mzuhgku2maenm'),
+    (BitcoinCash(), 'bitcoincash:QZGS5GL6z7xxy39ccaz5kfrd8uwt7mzuhgku2maenm'),
+    (Ethereum(), '0x97aec6a7ba912e9a4139f08a282c2e38f68f88'),
+    (Ethereum(), '0x97AEC6A7bA912E9A4139F08a282c2e38F68F88e5'),
+])
+def test_decode_invalid_address(network, address):
+    with pytest.raises(ValueError):
+        network.decode_address(address)
+
+
+def test_decode_cashaddr_without_prefix():
+    net = BitcoinCash()
+    address = 'bitcoincash:qzgs5gl6z7xxy39ccaz5kfrd8uwt7mzuhgku2maenm'
+    assert net.decode_address(address[12:]) == net.decode_address(address)
+    assert net.decode_address(address.upper()) == net.decode_address(address)
+
+
+@pytest.mark.parametrize("index", [2 ** 31, 2 ** 32])
+def test_hardened_index_rejected(index):
+    sample = SAMPLES[0]
+    net = sample.network
+    with pytest.raises(ValueError):
+        net.get_address(sample.xpub, '0/%d' % index)
+    with pytest.raises(ValueError):
+        net.get_node(sample.xpub, '0').get_child(index)
+    with pytest.raises(ValueError):
+        net.get_addresses(sample.xpub, '0', start=index - 1, count=2)
+
+
+def test_last_non_hardened_index():
+    sample = SAMPLES[0]
+    net = sample.network
+    address = net.get_address(sample.xpub, '0/%d' % (2 ** 31 - 1))
+    assert net.get_addresses(sample.xpub, '0', 2 ** 31 - 1) == [address]
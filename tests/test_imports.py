@@ -0,0 +1,93 @@
+"""Import time guards: heavy dependencies are loaded only when needed."""
+import os
+import subprocess
+import sys
+
+import pytest
+
+from coinaddress.networks import registry
+from coinaddress.networks.registry import Registry
+
+from .test_coinaddress import SAMPLES
+
+XPUB = SAMPLES[0].xpub
+DEFERRED = (
+    'asyncio',
+    'concurrent.futures.process',
+    'ecdsa',
+    'sha3',
+    'sqlite3',
+)
+if sys.version_info >= (3, 7):
+    DEFERRED += (
+        'coinaddress.networks.bitcoin_cash',
+        'coinaddress.networks.ethereum',
+        'coinaddress.networks.litecoin',
+        'coinaddress.networks.ripple',
+    )
+
+
+def loaded_modules(code):
+    script = code + '\nimport sys\nprint("\\n".join(sys.modules))'
+    output = subprocess.check_output(
+        [sys.executable, '-c', script],
+        env=dict(os.environ, COINADDRESS_BACKEND='python'),
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        universal_newlines=True,
+    )
+    return set(output.split())
+
+
+@pytest.mark.parametrize("code", [
+    'import coinaddress.cli',
+    'import coinaddress\n'
+    'coinaddress.address_from_xpub("bitcoin", "%s", "0/0")' % XPUB,
+])
+def test_deferred_imports(code):
+    assert loaded_modules(code).isdisjoint(DEFERRED)
+
+
+def test_sha3_loaded_on_demand():
+    code = 'from coinaddress.networks import registry\nnet = registry.get("ETH")'
+    assert 'sha3' not in loaded_modules(code)
+    modules = loaded_modules(code + '\nnet.get_address("%s", "0/0")' % XPUB)
+    assert 'sha3' in modules
+
+
+@pytest.mark.skipif(sys.version_info < (3, 7),
+                    reason="Network classes are imported eagerly")
+def test_network_loaded_on_demand():
+    modules = loaded_modules(
+        'from coinaddress.networks import registry\nregistry.get("XRP")'
+    )
+    networks = {
+        name for name in modules if name.startswith('coinaddress.networks.')
+    }
+    assert networks == {
+        'coinaddress.networks.base',
+        'coinaddress.networks.registry',
+        'coinaddress.networks.ripple',
+    }
+
+
+def test_register_lazy():
+    lazy = Registry()
+    lazy.register_lazy('coinaddress.networks.ripple', 'ripple')
+    assert lazy.names() == ['ripple']
+    assert lazy.get('unknown') is None
+    # ripple module registers its class in the default registry
+    with pytest.raises(LookupError):
+        lazy.get('ripple')
+
+
+def test_lazy_names_registered():
+    for name in registry.names():
+        net = registry.get(name)
+        assert registry.get(net.name) is net
+
+
+def test_network_classes_exported():
+    from coinaddress import networks
+    assert networks.Ethereum().name == 'ethereum'
+    with pytest.raises(AttributeError):
+        networks.Dogecoin
@@ -0,0 +1,87 @@
+"""Tests for reverse address index."""
+import pytest
+
+from coinaddress.index import AddressIndex, IndexMatch, build_index
+from coinaddress.networks import registry
+
+from .test_coinaddress import SAMPLES
+
+
+@pytest.fixture
+def index_path(tmp_path):
+    return str(tmp_path / 'addresses.idx')
+
+
+@pytest.mark.parametrize("sample", SAMPLES)
+def test_lookup(index_path, sample):
+    name = sample.network.name
+    with build_index(index_path, name, [sample.xpub], '0', count=2,
+                     gap=1) as index:
+        assert len(index) == 3
+        for i, address in enumerate(sample.addresses):
+            assert index.lookup(name, address) == IndexMatch(
+                name, sample.xpub, '0/%d' % i, i
+            )
+
+
+def test_lookup_missing(index_path):
+    sample = SAMPLES[0]
+    missing = registry.get('bitcoin').get_address(sample.xpub, '1/0')
+    assert AddressIndex(index_path).lookup('bitcoin', missing) is None
+    with build_index(index_path, 'BTC', [sample.xpub], '0', count=3,
+                     gap=0) as index:
+        assert index.lookup('bitcoin', missing) is None
+        with pytest.raises(ValueError):
+            index.lookup('bitcoin', sample.addresses[0][:-1])
+
+
+def test_lookup_network(index_path):
+    """Same hash160 of different networks is told apart by network."""
+    xpub = SAMPLES[0].xpub
+    address = SAMPLES[0].addresses[1]
+    with AddressIndex(index_path) as index:
+        index.add('bitcoin', xpub, '0', count=2, gap=0)
+        index.add('litecoin', xpub, '1', count=2, gap=0)
+        index.flush()
+        payload = registry.get('bitcoin').decode_address(address)
+        assert index.lookup_payload('BTC', payload).path == '0/1'
+        assert index.lookup_payload('litecoin', payload) is None
+        assert index.lookup_payload('ethereum', payload) is None
+
+
+def test_extend(index_path):
+    sample = SAMPLES[0]
+    with AddressIndex(index_path) as index:
+        assert index.add('bitcoin', sample.xpub, '0', count=1, gap=0) == 1
+    with AddressIndex(index_path) as index:
+        assert len(index) == 1
+        assert index.lookup('bitcoin', sample.addresses[2]) is None
+        assert index.extend('bitcoin', sample.xpub, '0', count=2) == 3
+        # staged records aren't visible until flushed
+        assert index.lookup('bitcoin', sample.addresses[2]) is None
+        # already indexed addresses are not derived again
+        assert index.add('bitcoin', sample.xpub, '0', count=2, gap=0) == 3
+    with AddressIndex(index_path) as index:
+        assert len(index) == 3
+        assert index.lookup('bitcoin', sample.addresses[2]).index == 2
+        with pytest.raises(ValueError):
+            index.extend('bitcoin', sample.xpub, '1')
+
+
+def test_many_xpubs(index_path):
+    xpubs = [sample.xpub for sample in SAMPLES]
+    with build_index(index_path, 'bitcoin', xpubs, count=50) as index:
+        assert len(index) == 70 * len(xpubs)
+        net = registry.get('bitcoin')
+        for xpub in xpubs:
+            for path in ('0', '37', '69'):
+                address = net.get_address(xpub, path)
+                match = index.lookup('bitcoin', address)
+                assert (match.xpub, match.path) == (xpub, path)
+
+
+def test_invalid_file(index_path):
+    with open(index_path, 'wb') as f:
+        f.write(b'not an index')
+    with pytest.raises(ValueError):
+        AddressIndex(index_path)
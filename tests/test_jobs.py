@@ -0,0 +1,155 @@
+"""Tests for `coinaddress.jobs` module and ``jobs`` command."""
+import io
+import json
+
+import pytest
+
+from click.testing import CliRunner
+
+from coinaddress import cli
+from coinaddress.jobs import read_jobs, run_jobs, write_results
+
+from .test_coinaddress import SAMPLES
+
+XPUB = SAMPLES[0].xpub
+ADDRESSES = SAMPLES[0].addresses
+ETH_ADDRESS = '0xA2B7F1eB52Ef1dDBeBe1AEdB1DaB4CD85DD1a2E1'
+
+JSONL = '\n'.join(json.dumps(row) for row in [
+    {'id': 'a', 'network': 'bitcoin', 'xpub': XPUB, 'path': '0/1',
+     'count': 2},
+    {'id': 'b', 'network': 'unknown', 'xpub': XPUB},
+    {'network': 'BTC', 'xpub': XPUB[:-1], 'path': '0/0'},
+    {'network': 'BTC', 'xpub': XPUB, 'count': 'many'},
+]) + '\n\nnot json\n'
+
+CSV = (
+    'id,network,xpub,path,count\n'
+    'a,bitcoin,%s,0/0,3\n'
+    ',litecoin,%s,0/0,\n'
+    'c,bitcoin,%s,1/x,1\n'
+) % (XPUB, XPUB, XPUB)
+
+
+def parse(output):
+    return [json.loads(line) for line in output.splitlines()]
+
+
+def test_read_jobs_jsonl():
+    jobs = list(read_jobs(io.StringIO(JSONL)))
+    assert [job.number for job in jobs] == [1, 2, 3, 4, 5]
+    assert jobs[0][1:8] == ('a', 'bitcoin', XPUB, '0/1', '0', 1, 2)
+    assert jobs[0].error is None
+    assert jobs[1].error == 'Unknown network unknown'
+    assert jobs[2].error is None
+    assert jobs[3].error == 'Invalid count many'
+    assert jobs[4].error.startswith('Invalid JSON')
+
+
+def test_read_jobs_csv():
+    jobs = list(read_jobs(io.StringIO(CSV)))
+    assert jobs[0][1:8] == ('a', 'bitcoin', XPUB, '0/0', '0', 0, 3)
+    assert jobs[1].id is None
+    assert jobs[1].count == 1
+    assert jobs[2].error == 'Invalid path 1/x'
+
+
+@pytest.mark.parametrize('count', [0, -1, '0'])
+def test_read_jobs_invalid_count(count):
+    rows = [{'network': 'BTC', 'xpub': XPUB, 'count': count}]
+    jsonl = '\n'.join(json.dumps(row) for row in rows)
+    csv = 'network,xpub,count\nBTC,%s,%s\n' % (XPUB, count)
+    for data in (jsonl, csv):
+        job, = read_jobs(io.StringIO(data))
+        assert job.error == 'Invalid count %s' % count
+
+
+def test_read_jobs_missing_columns():
+    with pytest.raises(ValueError):
+        list(read_jobs(io.StringIO('network,path\nbitcoin,0\n'), 'csv'))
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_run_jobs(workers):
+    jobs = read_jobs(io.StringIO(JSONL))
+    results = list(run_jobs(jobs, workers=workers, batch_size=1))
+    assert [(r.job.number, r.addresses, r.error is None) for r in results] == [
+        (1, [('0/1', ADDRESSES[1])], True),
+        (1, [('0/2', ADDRESSES[2])], True),
+        (2, [], False),
+        (3, [], False),
+        (4, [], False),
+        (5, [], False),
+    ]
+
+
+def test_run_jobs_error_reported_once():
+    jobs = read_jobs(io.StringIO(json.dumps(
+        {'network': 'BTC', 'xpub': XPUB[:-1], 'count': 5}
+    )))
+    results = list(run_jobs(jobs, batch_size=2))
+    assert len(results) == 1
+    assert results[0].error == 'Invalid checksum'
+
+
+def test_write_results_csv():
+    output = io.StringIO()
+    results = run_jobs(read_jobs(io.StringIO(CSV)))
+    assert write_results(output, results, 'csv') == (4, 1)
+    lines = output.getvalue().splitlines()
+    assert lines[0] == 'job,id,network,path,address,error'
+    assert lines[1] == '1,a,bitcoin,0/0,%s,' % ADDRESSES[0]
+    assert lines[4].startswith('2,,litecoin,0/0,L')
+    assert lines[5] == '3,c,bitcoin,1/x,,Invalid path 1/x'
+
+
+def test_command_line_jobs(tmp_path):
+    jobs_file = tmp_path / 'jobs.jsonl'
+    jobs_file.write_text(JSONL)
+    result = CliRunner().invoke(cli.main, args=['jobs', str(jobs_file)])
+    assert result.exit_code == 1
+    assert result.output.endswith('2 addresses, 4 failed jobs\n')
+    rows = parse(result.output.rsplit('\n', 2)[0])
+    assert rows[2:] == [
+        {'job': 2, 'id': 'b', 'network': 'unknown', 'path': '0',
+         'error': 'Unknown network unknown'},
+        {'job': 3, 'id': None, 'network': 'BTC', 'path': '0/0',
+         'error': 'Invalid checksum'},
+        {'job': 4, 'id': None, 'network': 'BTC', 'path': '0',
+         'error': 'Invalid count many'},
+        {'job': 5, 'id': None, 'network': None, 'path': None,
+         'error': 'Invalid JSON: Expecting value: line 1 column 1 (char 0)'},
+    ]
+    assert rows[:2] == [
+        {'job': 1, 'id': 'a', 'network': 'bitcoin', 'path': '0/1',
+         'address': ADDRESSES[1]},
+        {'job': 1, 'id': 'a', 'network': 'bitcoin', 'path': '0/2',
+         'address': ADDRESSES[2]},
+    ]
+
+
+def test_command_line_jobs_stdin():
+    result = CliRunner().invoke(
+        cli.main, args=['jobs', '--format', 'csv', '-j', '2'],
+        input=CSV.splitlines(True)[0] + CSV.splitlines(True)[1]
+    )
+    assert result.exit_code == 0
+    assert result.output.splitlines()[1:4] == [
+        '1,a,bitcoin,0/%d,%s,' % (i, address)
+        for i, address in enumerate(ADDRESSES)
+    ]
+
+
+def test_command_line_jobs_bad_input():
+    result = CliRunner().invoke(
+        cli.main, args=['jobs', '--input-format', 'csv'], input='a,b\n1,2\n'
+    )
+    assert result.exit_code == 2
+    assert 'Missing CSV columns' in result.output
+
+
+def test_command_line_default_command():
+    args = ['--xpub', XPUB, '0/0', '-n', '3']
+    default = CliRunner().invoke(cli.main, args=['bitcoin'] + args)
+    generate = CliRunner().invoke(cli.main, args=['generate', 'bitcoin'] + args)
+    assert default.output == generate.output == '\n'.join(ADDRESSES) + '\n'
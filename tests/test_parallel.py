@@ -0,0 +1,46 @@
+"""Tests for `coinaddress.parallel` module."""
+import pytest
+
+from click.testing import CliRunner
+
+from coinaddress import cli
+from coinaddress.parallel import generate_addresses
+
+from .test_coinaddress import SAMPLES
+
+XPUB = SAMPLES[0].xpub
+ADDRESSES = SAMPLES[0].addresses
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_generate_addresses_ordered(jobs):
+    addresses = generate_addresses(
+        'bitcoin', XPUB, prefix='0', start=0, count=3, jobs=jobs,
+        batch_size=1
+    )
+    assert list(addresses) == ADDRESSES
+
+
+def test_generate_addresses_unknown_network():
+    with pytest.raises(ValueError):
+        list(generate_addresses('unknown', XPUB))
+
+
+def test_command_line_jobs():
+    runner = CliRunner()
+    result = runner.invoke(
+        cli.main, args=['bitcoin', '--xpub', XPUB, '0/0', '-n', '3', '-j', '2']
+    )
+    assert result.exit_code == 0
+    assert result.output == '\n'.join(ADDRESSES) + '\n'
+
+
+@pytest.mark.parametrize('args', [
+    ['-j', '1'], ['-j', '2'], ['--format', 'binary'],
+])
+def test_command_line_unknown_network(args):
+    result = CliRunner().invoke(
+        cli.main, args=['dogecoin', '--xpub', XPUB, '0/0'] + args
+    )
+    assert result.exit_code == 2
+    assert 'Unknown network dogecoin' in result.output
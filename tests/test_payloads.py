@@ -0,0 +1,145 @@
+import csv
+import io
+import json
+
+import pytest
+from click.testing import CliRunner
+
+from coinaddress import cli
+from coinaddress.networks import registry
+from coinaddress.parallel import generate_payloads
+from coinaddress.payloads import (
+    HEADER, PayloadsFile, pack_header, unpack_header, write_payloads,
+)
+
+from .test_coinaddress import SAMPLES
+
+XPUB = SAMPLES[0].xpub
+ADDRESSES = SAMPLES[0].addresses
+
+
+def generate(*args):
+    return CliRunner().invoke(
+        cli.main, args=['bitcoin', '--xpub', XPUB] + list(args)
+    )
+
+
+@pytest.mark.parametrize('sample', SAMPLES, ids=lambda s: type(s.network).__name__)
+def test_iter_payloads(sample):
+    net = sample.network
+    prefix = '' if sample.parent is None else str(sample.parent)
+    payloads = list(net.iter_payloads(
+        sample.xpub, prefix, 0, len(sample.addresses)
+    ))
+    assert [net.encode_address(p) for p in payloads] == sample.addresses
+    assert {len(p) for p in payloads} == {20}
+
+
+def test_iter_payloads_negative_start():
+    with pytest.raises(ValueError):
+        next(registry.get('bitcoin').iter_payloads(XPUB, '0', -1))
+
+
+@pytest.mark.parametrize('jobs', [1, 2])
+def test_generate_payloads(jobs):
+    chunks = list(generate_payloads(
+        'bitcoin', XPUB, '0', start=0, count=3, jobs=jobs, batch_size=2
+    ))
+    assert [len(chunk) for chunk in chunks] == [40, 20]
+    net = registry.get('bitcoin')
+    payloads = b''.join(chunks)
+    assert [
+        net.encode_address(payloads[i:i + 20]) for i in range(0, 60, 20)
+    ] == ADDRESSES
+
+
+def test_header_roundtrip():
+    data = pack_header('bitcoin', "44'/0'/0'/0", 7, 3)
+    assert len(data) % 8 == 0
+    assert unpack_header(data) == (
+        'bitcoin', "44'/0'/0'/0", 7, 3, 20, len(data)
+    )
+    assert len(pack_header('bitcoin', '', 0, 0)) == HEADER.size
+
+
+@pytest.mark.parametrize('data', [b'', b'x' * 64, pack_header('ripple', '0', 0, 1)[:40]])
+def test_unpack_header_invalid(data):
+    with pytest.raises(ValueError):
+        unpack_header(data)
+
+
+def test_write_payloads_count_mismatch():
+    with pytest.raises(ValueError):
+        write_payloads(io.BytesIO(), 'bitcoin', '', 0, 2, [b'\0' * 20])
+    with pytest.raises(ValueError):
+        write_payloads(io.BytesIO(), 'bitcoin', '', 0, 1, [b'\0' * 19])
+
+
+def test_payloads_file(tmp_path):
+    path = tmp_path / 'payloads.bin'
+    with open(path, 'wb') as f:
+        write_payloads(f, 'bitcoin', '0', 0, 3, generate_payloads(
+            'bitcoin', XPUB, '0', count=3, jobs=1
+        ))
+    net = registry.get('bitcoin')
+    with PayloadsFile(path) as payloads:
+        assert payloads.header.start == 0
+        assert len(payloads) == 3
+        assert [net.encode_address(p) for p in payloads] == ADDRESSES
+        assert net.encode_address(payloads[-1]) == ADDRESSES[-1]
+        with pytest.raises(IndexError):
+            payloads[3]
+
+
+def test_payloads_file_truncated(tmp_path):
+    path = tmp_path / 'payloads.bin'
+    path.write_bytes(pack_header('bitcoin', '0', 0, 3) + b'\0' * 40)
+    with pytest.raises(ValueError):
+        PayloadsFile(path)
+
+
+def test_command_line_text_format():
+    result = generate('0/0', '-n', '3', '--format', 'text')
+    assert result.exit_code == 0
+    assert result.output.split() == ADDRESSES
+
+
+@pytest.mark.parametrize('jobs', ['1', '2'])
+def test_command_line_ndjson(jobs):
+    result = generate('0/1', '-n', '2', '--format', 'ndjson', '-j', jobs)
+    assert result.exit_code == 0
+    assert [json.loads(line) for line in result.output.splitlines()] == [
+        {'index': 1, 'path': '0/1', 'address': ADDRESSES[1]},
+        {'index': 2, 'path': '0/2', 'address': ADDRESSES[2]},
+    ]
+
+
+def test_command_line_csv():
+    result = generate('0/0', '-n', '3', '--format', 'csv')
+    assert result.exit_code == 0
+    rows = list(csv.DictReader(io.StringIO(result.output)))
+    assert [row['address'] for row in rows] == ADDRESSES
+    assert rows[2] == {'index': '2', 'path': '0/2', 'address': ADDRESSES[2]}
+
+
+@pytest.mark.parametrize('jobs', ['1', '2'])
+def test_command_line_binary(tmp_path, jobs):
+    path = tmp_path / 'out.bin'
+    result = generate(
+        '0/0', '-n', '3', '--format', 'binary', '-j', jobs, '-o', str(path)
+    )
+    assert result.exit_code == 0
+    net = registry.get('bitcoin')
+    with PayloadsFile(path) as payloads:
+        assert payloads.header.network == 'bitcoin'
+        assert payloads.header.prefix == '0'
+        assert [net.encode_address(p) for p in payloads] == ADDRESSES
+
+
+def test_command_line_binary_stdout():
+    result = generate('0/1', '-n', '2', '--format', 'binary')
+    assert result.exit_code == 0
+    header = unpack_header(result.stdout_bytes)
+    assert header.start == 1
+    assert header.count == 2
+    assert len(result.stdout_bytes) == header.size + 40
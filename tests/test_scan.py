@@ -0,0 +1,92 @@
+"""Tests for `coinaddress.scan` module."""
+import threading
+
+import pytest
+
+from coinaddress import scan_xpub
+from coinaddress.networks import Bitcoin
+from coinaddress.scan import ChainScan, GapScanner
+
+from .test_coinaddress import SAMPLES
+
+XPUB = SAMPLES[0].xpub
+NET = Bitcoin()
+
+
+def used_at(chains):
+    """Addresses used at ``{prefix: [index, ...]}``."""
+    return {
+        NET.get_address(XPUB, '%s/%d' % (prefix, index)): (prefix, index)
+        for prefix, indices in chains.items() for index in indices
+    }
+
+
+@pytest.mark.parametrize("overlap", [True, False])
+def test_scan(overlap):
+    used = used_at({'0': [0, 3, 21, 50], '1': [1]})
+    calls = []
+
+    def is_used(addresses):
+        calls.append(len(addresses))
+        return [address in used for address in addresses]
+
+    scanner = GapScanner(NET, XPUB, is_used, gap_limit=18, chunk_size=10,
+                         overlap=overlap)
+    result = scanner.scan()
+    assert [index for index, _ in result['0'].used] == [0, 3, 21]
+    assert all(used[address] == ('0', index)
+               for index, address in result['0'].used)
+    assert result['0'].next_index == 22
+    assert result['0'].scanned == 40
+    assert result['1'] == ChainScan(
+        '1', [(1, NET.get_address(XPUB, '1/1'))], 2, 20
+    )
+    assert calls == [10] * 4 + [10] * 2
+
+
+def test_scan_unused():
+    result = GapScanner(NET, XPUB, lambda a: [False] * len(a),
+                        gap_limit=5, chunk_size=3).scan_chain('0', start=7)
+    assert result == ChainScan('0', [], 7, 5)
+
+
+def test_scan_xpub():
+    used = used_at({'0': [1]})
+    result = scan_xpub('bitcoin', XPUB, lambda a: [x in used for x in a],
+                       chains=['0'], gap_limit=3, chunk_size=2)
+    assert list(result) == ['0']
+    assert result['0'].next_index == 2
+
+
+def test_overlap():
+    """Next chunk is derived while the predicate checks the current one."""
+    derived = []
+    next_chunk = threading.Event()
+
+    class Network(Bitcoin):
+        def get_addresses(self, *args, **kwargs):
+            derived.append(args)
+            if len(derived) == 2:
+                next_chunk.set()
+            return super().get_addresses(*args, **kwargs)
+
+    def is_used(addresses):
+        if len(derived) == 1:
+            assert next_chunk.wait(5)
+        return [False] * len(addresses)
+
+    GapScanner(Network(), XPUB, is_used, gap_limit=2,
+               chunk_size=2).scan_chain('0')
+    assert [args[2] for args in derived] == [0, 2]
+
+
+def test_invalid_predicate():
+    scanner = GapScanner(NET, XPUB, lambda a: [True], chunk_size=2)
+    with pytest.raises(ValueError):
+        scanner.scan_chain('0')
+
+
+@pytest.mark.parametrize("kwargs", [{'gap_limit': 0}, {'chunk_size': 0}])
+def test_invalid_arguments(kwargs):
+    with pytest.raises(ValueError):
+        GapScanner(NET, XPUB, lambda a: a, **kwargs)
@@ -0,0 +1,130 @@
+"""Tests for `coinaddress.secp256k1` module."""
+import random
+
+import pytest
+
+from ecdsa.curves import SECP256k1
+
+from coinaddress import keys, secp256k1
+from coinaddress.backends import load_backend, set_backend
+from coinaddress.networks import Bitcoin
+
+from .test_coinaddress import SAMPLES
+
+XPUB = SAMPLES[0].xpub
+
+
+@pytest.mark.parametrize("k", [
+    1, 2, 255, 256, 2 ** 128 + 1, secp256k1.N - 1,
+] + [random.Random(n).getrandbits(256) % secp256k1.N for n in range(5)])
+def test_multiply_generator(k):
+    point = SECP256k1.generator * k
+    expected = (point.x(), point.y())
+    assert secp256k1.to_affine(secp256k1.multiply_generator(k)) == expected
+
+
+def test_batch_to_affine():
+    points = [secp256k1.multiply_generator(k) for k in range(1, 20)]
+    assert secp256k1.batch_to_affine(points) == [
+        secp256k1.to_affine(p) for p in points
+    ]
+
+
+@pytest.fixture
+def python_backend():
+    yield set_backend('python')
+    set_backend()
+
+
+def test_child_nodes_are_plain_integers(python_backend):
+    node = Bitcoin().deserialize_xpub(XPUB).get_child_from_path('0/1')
+    assert node._point[2] != 1
+    compressed = node.hex()
+    assert node._verifying_key is None
+    x, y = node.affine
+    assert secp256k1.is_on_curve(x, y)
+    assert compressed[2:] == b'%064x' % x
+    assert (node.point.x(), node.point.y()) == (x, y)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 7, 1024])
+def test_iter_children_chunks(python_backend, chunk_size):
+    node = Bitcoin().deserialize_xpub(XPUB).get_child(0)
+    expected = [node.get_child(i).hex() for i in range(3, 13)]
+    children = node.iter_children(3, 13, chunk_size=chunk_size)
+    assert [child.hex() for child in children] == expected
+
+
+def test_normalize(python_backend):
+    node = Bitcoin().deserialize_xpub(XPUB)
+    children = [node.get_child(i) for i in range(5)]
+    expected = [secp256k1.to_affine(child._point) for child in children]
+    keys.normalize(children)
+    assert [child._point for child in children] == [
+        (x, y, 1) for x, y in expected
+    ]
+
+
+def test_trusted_derived_keys():
+    root = Bitcoin().deserialize_xpub(XPUB)
+    child = root.get_child(3)
+    assert not root.trusted
+    assert child.trusted
+    keys.trust_derived_keys(False)
+    try:
+        checked = root.get_child(3)
+    finally:
+        keys.trust_derived_keys(True)
+    assert not checked.trusted
+    assert checked.verifying_key.to_string() == child.verifying_key.to_string()
+
+
+def test_validate_rejects_point_off_curve():
+    node = keys.PublicKey(
+        chain_code=b'\x00' * 32, point=(1, 1, 1),
+        backend=load_backend('python')
+    )
+    with pytest.raises(ValueError):
+        node.validate()
+
+
+def test_public_key_is_bytes_native():
+    node = Bitcoin().deserialize_xpub(XPUB).get_child(0)
+    assert not hasattr(node, '__dict__')
+    assert isinstance(node.chain_code, bytes) and len(node.chain_code) == 32
+    assert node.compressed is node.compressed
+    assert len(node.compressed) == 33
+    assert bytes(node) is node.uncompressed
+    assert node.uncompressed[1:33] == node.compressed[1:]
+    assert node.hex() == node.compressed.hex().encode()
+
+
+@pytest.mark.parametrize("k", [1, 2, 3, 2 ** 200 + 7])
+def test_decode_point(k):
+    point = SECP256k1.generator * k
+    x, y = point.x(), point.y()
+    compressed = bytes((2 + (y & 1),)) + x.to_bytes(32, 'big')
+    uncompressed = b'\x04' + x.to_bytes(32, 'big') + y.to_bytes(32, 'big')
+    assert secp256k1.decode_point(compressed) == (x, y)
+    assert secp256k1.decode_point(uncompressed) == (x, y)
+
+
+@pytest.mark.parametrize("key", [
+    b'',
+    b'\x05' + b'\x01' * 32,
+    b'\x02' + b'\x01' * 31,
+    # x = 5 has no square root of x^3 + 7
+    b'\x02' + (5).to_bytes(32, 'big'),
+    b'\x04' + (1).to_bytes(32, 'big') + (1).to_bytes(32, 'big'),
+])
+def test_decode_point_invalid(key):
+    with pytest.raises(ValueError):
+        secp256k1.decode_point(key)
+
+
+def test_load_xpubs():
+    bad_checksum = XPUB[:-1] + ('9' if XPUB[-1] != '9' else '8')
+    result = Bitcoin().load_xpubs([XPUB, bad_checksum, 'xpub'])
+    assert list(result.loaded) == [XPUB]
+    assert result.loaded[XPUB].hex() == Bitcoin().get_root(XPUB).hex()
+    assert set(result.invalid) == {bad_checksum, 'xpub'}
@@ -0,0 +1,247 @@
+"""Tests for `coinaddress.server` module."""
+import http.client
+import json
+import os
+import socket
+import threading
+
+import pytest
+
+from coinaddress.cache import node_cache
+from coinaddress.keys import PublicKey
+from coinaddress.server import MAX_BODY_SIZE, make_server
+
+from .test_coinaddress import SAMPLES
+
+XPUB = SAMPLES[0].xpub
+ADDRESSES = SAMPLES[0].addresses
+
+
+class UnixHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, path):
+        super().__init__('localhost')
+        self.unix_path = path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.connect(self.unix_path)
+
+
+def serve(server):
+    thread = threading.Thread(
+        target=server.serve_forever, args=(0.01,), daemon=True
+    )
+    thread.start()
+    return thread
+
+
+@pytest.fixture
+def server():
+    server = make_server(port=0)
+    thread = serve(server)
+    yield server
+    server.shutdown()
+    server.server_close()
+    thread.join()
+
+
+@pytest.fixture
+def client(server):
+    connection = http.client.HTTPConnection(*server.server_address[:2])
+    yield connection
+    connection.close()
+
+
+def request(connection, method, url, body=None):
+    if body is not None:
+        body = json.dumps(body)
+    connection.request(method, url, body)
+    response = connection.getresponse()
+    return response.status, json.loads(response.read())
+
+
+def test_address(client):
+    status, payload = request(
+        client, 'GET', '/address?network=BTC&xpub=%s&path=0/1' % XPUB
+    )
+    assert status == 200
+    assert payload == {'path': '0/1', 'address': ADDRESSES[1]}
+    # same keep-alive connection
+    status, payload = request(
+        client, 'GET', '/address?network=bitcoin&xpub=%s&path=0/2' % XPUB
+    )
+    assert payload['address'] == ADDRESSES[2]
+
+
+def test_addresses(client):
+    status, payload = request(
+        client, 'GET',
+        '/addresses?network=BTC&xpub=%s&prefix=0&start=0&count=3' % XPUB
+    )
+    assert status == 200
+    assert payload == {'start': 0, 'addresses': ADDRESSES}
+
+
+@pytest.mark.parametrize("url", [
+    '/address?network=unknown&xpub=%s' % XPUB,
+    '/address?network=BTC',
+    '/address?network=BTC&xpub=%s' % XPUB[:-1],
+    "/address?network=BTC&xpub=%s&path=0'" % XPUB,
+    '/addresses?network=BTC&xpub=%s&count=x' % XPUB,
+    '/addresses?network=BTC&xpub=%s&count=0' % XPUB,
+    '/addresses?network=BTC&xpub=%s&count=1000000' % XPUB,
+    '/address?network=BTC&xpub=%s&path=0/2147483648' % XPUB,
+    '/address?network=BTC&xpub=%s&path=0/4294967296' % XPUB,
+    '/addresses?network=BTC&xpub=%s&start=2147483647&count=2' % XPUB,
+    '/addresses?network=BTC&xpub=%s&prefix=4294967296' % XPUB,
+])
+def test_bad_request(client, url):
+    status, payload = request(client, 'GET', url)
+    assert status == 400
+    assert payload['error']
+
+
+def test_not_found(client):
+    assert request(client, 'GET', '/nowhere')[0] == 404
+    assert request(client, 'POST', '/nowhere', {})[0] == 404
+
+
+@pytest.mark.parametrize("length, status", [
+    ('-1', 400),
+    (str(MAX_BODY_SIZE + 1), 413),
+])
+def test_bad_content_length(server, length, status):
+    connection = http.client.HTTPConnection(*server.server_address[:2],
+                                            timeout=5)
+    try:
+        connection.putrequest('POST', '/batch')
+        connection.putheader('Content-Length', length)
+        connection.endheaders()
+        response = connection.getresponse()
+        assert response.status == status
+        assert json.loads(response.read())['error']
+    finally:
+        connection.close()
+
+
+def test_batch(client):
+    status, payload = request(client, 'POST', '/batch', {'jobs': [
+        {'id': 'a', 'network': 'BTC', 'xpub': XPUB, 'path': '0/1',
+         'count': 2},
+        {'network': 'unknown', 'xpub': XPUB},
+        {'network': 'BTC', 'xpub': XPUB[:-1]},
+        {'network': 'BTC', 'xpub': XPUB, 'path': '0/4294967296'},
+        {'network': 'BTC', 'xpub': XPUB, 'path': '0/0'},
+    ]})
+    assert status == 200
+    results = payload['results']
+    assert results[:3] == [
+        {'job': 1, 'id': 'a', 'addresses': ADDRESSES[1:]},
+        {'job': 2, 'id': None, 'error': 'Unknown network unknown'},
+        {'job': 3, 'id': None, 'error': 'Invalid checksum'},
+    ]
+    assert results[3]['error'] == "Index can't be greater than 2147483647"
+    assert results[4] == {'job': 5, 'id': None, 'addresses': ADDRESSES[:1]}
+    assert request(client, 'POST', '/batch', {})[0] == 400
+    client.request('POST', '/batch', 'not json')
+    response = client.getresponse()
+    assert response.status == 400
+    response.read()
+
+
+def test_unexpected_error(client, monkeypatch):
+    def fail(self, child_number):
+        raise OverflowError("boom")
+
+    monkeypatch.setattr(PublicKey, 'get_child', fail)
+    node_cache.clear()
+    status, payload = request(
+        client, 'GET', '/address?network=BTC&xpub=%s&path=0/0' % XPUB
+    )
+    assert status == 500
+    assert payload == {'error': "Internal server error"}
+    status, payload = request(client, 'POST', '/batch', {'jobs': [
+        {'network': 'BTC', 'xpub': XPUB, 'path': '1/0'},
+    ]})
+    assert status == 200
+    assert payload['results'][0]['error'] == 'boom'
+    assert request(client, 'GET', '/metrics')[1]['errors'] == 1
+
+
+def test_metrics(client):
+    request(client, 'GET', '/address?network=BTC&xpub=%s&path=0/0' % XPUB)
+    request(client, 'GET', '/addresses?network=BTC&xpub=%s&count=2' % XPUB)
+    request(client, 'GET', '/address?network=unknown')
+    status, payload = request(client, 'GET', '/metrics')
+    assert status == 200
+    assert payload['requests'] == {'/address': 2, '/addresses': 1}
+    assert payload['errors'] == 1
+    assert payload['addresses'] == 3
+    assert payload['addresses_per_second'] > 0
+    assert set(payload['latency_ms']) == {'p50', 'p90', 'p99'}
+    assert payload['latency_ms']['p99'] >= payload['latency_ms']['p50'] > 0
+    assert 0 <= payload['cache']['hit_rate'] <= 1
+
+
+@pytest.mark.skipif(not hasattr(socket, 'AF_UNIX'),
+                    reason="Unix sockets are not supported")
+def test_unix_socket(tmp_path):
+    path = str(tmp_path / 'coinaddress.sock')
+    server = make_server(unix_socket=path)
+    thread = serve(server)
+    connection = UnixHTTPConnection(path)
+    try:
+        status, payload = request(
+            connection, 'GET', '/address?network=BTC&xpub=%s&path=0/0' % XPUB
+        )
+        assert status == 200
+        assert payload['address'] == ADDRESSES[0]
+    finally:
+        connection.close()
+        server.shutdown()
+        server.server_close()
+        thread.join()
+    assert not os.path.exists(path)
+
+
+@pytest.mark.skipif(not hasattr(socket, 'AF_UNIX'),
+                    reason="Unix sockets are not supported")
+def test_unix_socket_existing_files(tmp_path):
+    path = tmp_path / 'coinaddress.sock'
+    path.write_text('data')
+    with pytest.raises(ValueError):
+        make_server(unix_socket=str(path))
+    assert path.read_text() == 'data'
+
+    path.unlink()
+    server = make_server(unix_socket=str(path))
+    try:
+        with pytest.raises(ValueError):
+            make_server(unix_socket=str(path))
+    finally:
+        server.server_close()
+    assert not path.exists()
+
+    # Stale socket of a crashed server is replaced
+    stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    stale.bind(str(path))
+    stale.close()
+    server = make_server(unix_socket=str(path))
+    # Socket of another server isn't removed on close
+    path.unlink()
+    other = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    other.bind(str(path))
+    try:
+        server.server_close()
+        assert path.exists()
+    finally:
+        other.close()
+
+
+def test_command_line_serve_error(tmp_path):
+    from click.testing import CliRunner
+    from coinaddress import cli
+
+    path = str(tmp_path / 'missing' / 'coinaddress.sock')
+    result = CliRunner().invoke(cli.main, args=['serve', '--unix-socket', path])
+    assert result.exit_code == 2
@@ -0,0 +1,61 @@
+"""Tests for `coinaddress.stats` module."""
+from click.testing import CliRunner
+
+from coinaddress import cli, stats
+from coinaddress.keys import PublicKey
+from coinaddress.networks import BitcoinCash
+
+from .test_coinaddress import SAMPLES
+
+XPUB = SAMPLES[1].xpub
+
+
+def test_disabled_stats_leave_methods_untouched():
+    get_child = PublicKey.get_child
+    encode_address = BitcoinCash.encode_address
+    with stats.collect():
+        assert stats.is_enabled()
+        assert PublicKey.get_child is not get_child
+    assert not stats.is_enabled()
+    assert PublicKey.get_child is get_child
+    assert BitcoinCash.encode_address is encode_address
+
+
+def test_collect_counts_stages():
+    net = BitcoinCash()
+    net.get_node(XPUB, '0')
+    with stats.collect():
+        net.deserialize_xpub(XPUB).get_child(0)
+        for i in range(3):
+            net.get_address(XPUB, '0/%d' % i)
+        net.get_addresses(XPUB, prefix='0', count=3)
+    snapshot = stats.snapshot()
+    assert snapshot['deserialize_xpub']['calls'] == 1
+    assert snapshot['get_child']['calls'] >= 7
+    assert snapshot['public_key_to_address']['calls'] == 3
+    # super() call to the base58 encoder isn't counted twice
+    assert snapshot['encode_address.BitcoinCash']['calls'] == 3
+    assert snapshot['encode_address.BitcoinCash']['total_seconds'] > 0
+    # A single chunk is hashed and encoded at once
+    assert snapshot['hash_public_keys']['calls'] == 1
+    assert snapshot['encode_payloads.BitcoinCash']['calls'] == 1
+    net.get_addresses(XPUB, prefix='0', count=3)
+    assert stats.snapshot() == snapshot
+
+
+def test_command_line_stats():
+    result = CliRunner().invoke(
+        cli.main, args=['bitcoin_cash', '--xpub', XPUB, '0/0', '-n', '2',
+                        '--stats']
+    )
+    assert result.exit_code == 0
+    assert '2 addresses in' in result.output
+    assert 'encode_payloads.BitcoinCash' in result.output
+
+
+def test_command_line_stats_disabled_on_error():
+    result = CliRunner().invoke(
+        cli.main, args=['bitcoin_cash', '--xpub', 'invalid', '0/0', '--stats']
+    )
+    assert result.exit_code != 0
+    assert not stats.is_enabled()
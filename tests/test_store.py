@@ -0,0 +1,187 @@
+"""Tests for `coinaddress.store` module."""
+import pickle
+
+import pytest
+
+from click.testing import CliRunner
+
+from coinaddress import cli
+from coinaddress.cache import node_cache
+from coinaddress.keys import PublicKey
+from coinaddress.networks import Bitcoin, BitcoinCash
+from coinaddress.parallel import generate_addresses
+from coinaddress.store import (
+    DerivationStore, get_store, open_store, set_store, xpub_fingerprint,
+)
+
+from .test_coinaddress import SAMPLES
+
+XPUB = SAMPLES[0].xpub
+ADDRESSES = SAMPLES[0].addresses
+
+
+@pytest.fixture
+def store_path(tmp_path):
+    return str(tmp_path / 'store.sqlite')
+
+
+@pytest.fixture
+def store(store_path):
+    node_cache.clear()
+    store = open_store(store_path)
+    yield store
+    for opened in (store, get_store()):
+        opened.close()
+    set_store(None)
+    node_cache.clear()
+
+
+def reopen(store, **kwargs):
+    """Simulate process restart."""
+    store.close()
+    node_cache.clear()
+    return open_store(store.path, **kwargs)
+
+
+def no_derivation(self, child_number):
+    raise AssertionError("Unexpected derivation")
+
+
+def test_get_address(store, monkeypatch):
+    net = Bitcoin()
+    assert net.get_address(XPUB, '0/1') == ADDRESSES[1]
+    assert store.stats()['misses'] == 2
+    assert store.stats()['addresses'] == 1
+    assert store.stats()['nodes'] == 1
+
+    store = reopen(store)
+    monkeypatch.setattr(PublicKey, 'get_child', no_derivation)
+    assert net.get_address(XPUB, '0/1') == ADDRESSES[1]
+    assert store.stats()['hits'] == 1
+
+
+def test_get_addresses(store, monkeypatch):
+    net = Bitcoin()
+    assert net.get_addresses(XPUB, '0', 0, 3, chunk_size=2) == ADDRESSES
+    store = reopen(store)
+    monkeypatch.setattr(PublicKey, 'get_child', no_derivation)
+    assert net.get_addresses(XPUB, '0', 0, 3, chunk_size=2) == ADDRESSES
+    assert net.get_address(XPUB, '0/2') == ADDRESSES[2]
+    assert store.stats()['misses'] == 0
+
+
+def test_partial_chunk(store):
+    net = Bitcoin()
+    assert net.get_address(XPUB, '0/1') == ADDRESSES[1]
+    assert net.get_addresses(XPUB, '0', 0, 3) == ADDRESSES
+    assert store.stats()['addresses'] == 3
+
+
+def test_network_key(store):
+    """Addresses of different networks and CashAddr prefixes don't mix."""
+    Bitcoin().get_address(XPUB, '0/0')
+    mainnet = BitcoinCash().get_address(XPUB, '0/0')
+    testnet = BitcoinCash('bchtest').get_address(XPUB, '0/0')
+    assert mainnet.startswith('bitcoincash:')
+    assert testnet.startswith('bchtest:')
+    assert BitcoinCash().get_address(XPUB, '0/0') == mainnet
+    assert store.stats()['addresses'] == 3
+
+
+def test_hardened_path(store):
+    with pytest.raises(RuntimeError):
+        Bitcoin().get_address(XPUB, "0/1'")
+
+
+def test_max_entries(store):
+    store = reopen(store, max_entries=5)
+    Bitcoin().get_addresses(XPUB, '0', 0, 8, chunk_size=3)
+    assert store.stats()['addresses'] == 5
+    rows = store.connection.execute(
+        'SELECT idx FROM addresses ORDER BY idx'
+    ).fetchall()
+    assert [idx for idx, in rows] == [3, 4, 5, 6, 7]
+
+
+def corrupt(store, index):
+    store.connection.execute(
+        'UPDATE addresses SET address = ? WHERE idx = ?', ('bad', index)
+    )
+
+
+def test_verify(store):
+    net = Bitcoin()
+    net.get_addresses(XPUB, '0', 0, 3)
+    corrupt(store, 1)
+    assert store.verify(net, XPUB, '0') == ['0/1']
+    assert store.verify(net, XPUB, '0') == []
+    assert store.stats()['mismatches'] == 1
+    assert net.get_address(XPUB, '0/1') == ADDRESSES[1]
+
+
+def test_verify_rate(store):
+    net = Bitcoin()
+    net.get_addresses(XPUB, '0', 0, 3)
+    corrupt(store, 2)
+    store = reopen(store, verify_rate=1)
+    assert net.get_address(XPUB, '0/2') == ADDRESSES[2]
+    corrupt(store, 0)
+    assert net.get_addresses(XPUB, '0', 0, 3) == ADDRESSES
+    assert store.stats()['mismatches'] == 2
+    assert reopen(store).verify(net, XPUB, '0') == []
+
+
+@pytest.mark.parametrize("value", [-0.1, 1.5])
+def test_invalid_verify_rate(store_path, value):
+    with pytest.raises(ValueError):
+        DerivationStore(store_path, verify_rate=value)
+
+
+def test_without_nodes(store):
+    store = reopen(store, persist_nodes=False)
+    assert Bitcoin().get_address(XPUB, '0/1') == ADDRESSES[1]
+    assert store.stats()['addresses'] == 1
+    assert store.stats()['nodes'] == 0
+
+
+def test_pickle(store):
+    copy = pickle.loads(pickle.dumps(store))
+    assert copy.path == store.path
+    assert copy.stats()['max_entries'] == store.max_entries
+    assert copy.persist_nodes
+    copy.close()
+
+
+def test_fingerprint():
+    assert len(xpub_fingerprint(XPUB)) == 16
+    assert xpub_fingerprint(XPUB) != xpub_fingerprint(XPUB[:-1])
+
+
+def test_generate_addresses(store):
+    assert list(generate_addresses(
+        'bitcoin', XPUB, prefix='0', count=3, jobs=2, batch_size=1
+    )) == ADDRESSES
+    assert store.stats()['addresses'] == 3
+
+
+def test_command_line_store(store_path):
+    runner = CliRunner()
+    args = ['bitcoin', '--xpub', XPUB, '0/0', '-n', '3', '--store', store_path]
+    for _ in range(2):
+        result = runner.invoke(cli.main, args=args)
+        assert result.exit_code == 0
+        assert result.output == '\n'.join(ADDRESSES) + '\n'
+    assert get_store() is None
+    with DerivationStore(store_path) as store:
+        assert store.stats()['addresses'] == 3
+
+
+def test_command_line_no_store_nodes(store_path):
+    result = CliRunner().invoke(cli.main, args=[
+        'bitcoin', '--xpub', XPUB, '0/0', '-n', '3', '--store', store_path,
+        '--no-store-nodes',
+    ])
+    assert result.exit_code == 0
+    with DerivationStore(store_path) as store:
+        assert store.stats()['addresses'] == 3
+        assert store.stats()['nodes'] == 0